@@ -0,0 +1,4 @@
+"""
+Dashboard benchmarks.
+Each module can be run with `python -m benchmarks.<module>`.
+"""
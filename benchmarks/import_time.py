@@ -0,0 +1,247 @@
+"""
+Import-time and cold-start benchmark of the dashboard.
+
+Runs a fresh interpreter with `python -X importtime` and reports the cost of
+every imported module: either the first run of the app entry point (cold
+start after a server restart, up to the first paint of the page) or plain
+imports of the given modules.
+
+Usage:
+    python -m benchmarks.import_time                      # first run of steamlit_app.py
+    python -m benchmarks.import_time --modules charts data.mock_data
+    python -m benchmarks.import_time --repeat 5 --top 30 --output results/imports.json
+    python -m benchmarks.import_time --compare results/old.json results/new.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+
+ROOT_DIR = Path(__file__).parent.parent
+APP = ROOT_DIR / "steamlit_app.py"
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# Top-level packages of the project (reported apart from the libraries)
+PROJECT_PACKAGES = ('cache', 'charts', 'config', 'data', 'monitoring', 'pages')
+
+# Script of the first-run target: prints the wall time of the first app run as JSON
+_FIRST_RUN = """
+import json, time
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+harness = time.perf_counter()
+at = AppTest.from_file({app!r}, default_timeout={timeout})
+at.run()
+done = time.perf_counter()
+if at.exception:
+    raise SystemExit(at.exception[0].value)
+print(json.dumps({{'run_seconds': done - harness, 'harness_seconds': harness - started}}))
+"""
+
+_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+# ============================================================
+# MEASUREMENT
+# ============================================================
+
+def parse_importtime(stderr: str) -> list:
+    """
+    Parse the -X importtime report.
+
+    Args:
+        stderr: Standard error of the interpreter
+
+    Returns:
+        List of dicts (module, self_us, cumulative_us, depth), in import order
+    """
+    modules = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            modules.append({
+                'module': module,
+                'self_us': int(self_us),
+                'cumulative_us': int(cumulative_us),
+                'depth': len(indent) // 2,
+            })
+    return modules
+
+
+def measure_once(modules: list = None, timeout: float = 120) -> dict:
+    """
+    Measure one fresh interpreter.
+
+    Args:
+        modules: Modules to import (None: first run of the app entry point)
+        timeout: Timeout of the app run in seconds
+
+    Returns:
+        dict with wall_seconds, the first-run timings (app target) and the modules
+    """
+    if modules:
+        code = "; ".join(f"import {name}" for name in modules)
+    else:
+        code = _FIRST_RUN.format(app=str(APP), timeout=timeout)
+
+    started = datetime.now()
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT_DIR, env=dict(os.environ), capture_output=True, text=True
+    )
+    wall = (datetime.now() - started).total_seconds()
+    if completed.returncode:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else 'failed')
+
+    result = {'wall_seconds': wall, 'modules': parse_importtime(completed.stderr)}
+    if not modules:
+        result.update(json.loads(completed.stdout.strip().splitlines()[-1]))
+    return result
+
+
+def summarize(modules: list) -> dict:
+    """
+    Aggregate the modules of one measurement.
+
+    Returns:
+        dict with total_import_seconds, seconds per top-level package (self
+        time, largest first) and the number of modules
+    """
+    packages = {}
+    for entry in modules:
+        package = entry['module'].split('.')[0]
+        packages[package] = packages.get(package, 0) + entry['self_us'] / 1e6
+    return {
+        'total_import_seconds': sum(entry['self_us'] for entry in modules) / 1e6,
+        'modules': len(modules),
+        'packages': dict(sorted(packages.items(), key=lambda item: -item[1])),
+    }
+
+
+def run_benchmark(modules: list = None, repeat: int = 3, timeout: float = 120) -> dict:
+    """
+    Measure repeat fresh interpreters and keep the median one.
+
+    Args:
+        modules: Modules to import (None: first run of the app entry point)
+        repeat: Number of interpreters
+        timeout: Timeout of the app run in seconds
+
+    Returns:
+        Results dict (metadata, per-run wall times and the median run)
+    """
+    runs = []
+    for index in range(repeat):
+        run = measure_once(modules, timeout)
+        print(f"run {index + 1}/{repeat}: {run['wall_seconds']:.2f}s")
+        runs.append(run)
+
+    median = sorted(runs, key=lambda run: run['wall_seconds'])[len(runs) // 2]
+    return {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'git_revision': _git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'target': ' '.join(modules) if modules else APP.name,
+            'repeat': repeat,
+        },
+        'wall_seconds': [run['wall_seconds'] for run in runs],
+        'median': {**{key: value for key, value in median.items() if key != 'modules'}, **summarize(median['modules'])},
+        'modules': median['modules'],
+    }
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+# ============================================================
+# REPORTING
+# ============================================================
+
+def print_summary(results: dict, top: int = 20):
+    """Print the wall times, the cost per package and the most expensive modules."""
+    median = results['median']
+    print(f"\n== {results['meta']['target']} ==")
+    print(f"wall (median of {len(results['wall_seconds'])}): {statistics.median(results['wall_seconds']):.2f}s")
+    if 'run_seconds' in median:
+        print(f"first app run: {median['run_seconds']:.2f}s (test harness import {median['harness_seconds']:.2f}s)")
+    print(f"imports: {median['total_import_seconds']:.2f}s in {median['modules']} modules")
+
+    print("\nSelf time per package:")
+    for package, seconds in list(median['packages'].items())[:top]:
+        marker = ' *' if package in PROJECT_PACKAGES else ''
+        print(f"  {package:<28} {seconds * 1000:8.1f}ms{marker}")
+
+    print(f"\nTop {top} modules by cumulative time:")
+    for entry in sorted(results['modules'], key=lambda entry: -entry['cumulative_us'])[:top]:
+        print(f"  {entry['module']:<48} {entry['cumulative_us'] / 1000:8.1f}ms (self {entry['self_us'] / 1000:.1f}ms)")
+
+
+def compare(baseline_path: str, candidate_path: str, top: int = 20):
+    """
+    Print the import-time delta per package of two result files.
+
+    Args:
+        baseline_path: Results JSON of the reference version
+        candidate_path: Results JSON of the version under test
+        top: Number of packages to show
+    """
+    baseline = json.loads(Path(baseline_path).read_text())['median']
+    candidate = json.loads(Path(candidate_path).read_text())['median']
+    for key in ('wall_seconds', 'run_seconds', 'total_import_seconds'):
+        if key in baseline and key in candidate:
+            old, new = baseline[key], candidate[key]
+            print(f"{key:<28} {old * 1000:8.1f}ms {new * 1000:8.1f}ms {(new - old) / old * 100:+7.1f}%")
+
+    print(f"\n{'package':<28} {'baseline':>10} {'candidate':>10}")
+    packages = sorted(
+        set(baseline['packages']) | set(candidate['packages']),
+        key=lambda name: -max(baseline['packages'].get(name, 0), candidate['packages'].get(name, 0))
+    )
+    for package in packages[:top]:
+        old = baseline['packages'].get(package, 0)
+        new = candidate['packages'].get(package, 0)
+        print(f"{package:<28} {old * 1000:8.1f}ms {new * 1000:8.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import times and the cold first run of the app.")
+    parser.add_argument("--modules", nargs='+', default=None, help="Modules to import (default: first app run)")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters to measure")
+    parser.add_argument("--top", type=int, default=20, help="Packages / modules to show")
+    parser.add_argument("--timeout", type=float, default=120, help="Timeout of the app run (seconds)")
+    parser.add_argument("--output", default=None, help="Results JSON path")
+    parser.add_argument("--compare", nargs=2, metavar=('BASELINE', 'CANDIDATE'), help="Compare two result files")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare, top=args.top)
+        return
+
+    results = run_benchmark(args.modules, repeat=args.repeat, timeout=args.timeout)
+    output = Path(args.output or RESULTS_DIR / f"import_time_{datetime.now():%Y%m%d_%H%M%S}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2, ensure_ascii=False))
+    print_summary(results, args.top)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
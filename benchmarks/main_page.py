@@ -0,0 +1,345 @@
+"""
+Headless benchmark of pages/main_page.py.
+
+Runs the page with Streamlit's AppTest harness over a matrix of filter
+combinations and data sizes, and stores per-rerun wall time, per-section
+timings and memory as JSON so versions can be compared.
+
+Usage:
+    python -m benchmarks.main_page --sizes 0 100000 1000000 --repeat 3
+    python -m benchmarks.main_page --compare results/old.json results/new.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+
+ROOT_DIR = Path(__file__).parent.parent
+MAIN_PAGE = ROOT_DIR / "pages" / "main_page.py"
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+# ============================================================
+# FILTER MATRIX
+# ============================================================
+
+# Each scenario sets the sidebar widgets by label; missing labels keep their defaults
+SCENARIOS = {
+    'default': {},
+    'all_countries': {
+        'País': ["Argentina", "México", "España", "Colombia"],
+    },
+    'one_country_mobile': {
+        'País': ["México"],
+        'Dispositivo': ['Mobile'],
+    },
+    'week': {
+        'Selecciona un periodo': (date(2026, 1, 8), date(2026, 1, 14)),
+    },
+    'month_all_filters': {
+        'Selecciona un periodo': (date(2026, 1, 1), date(2026, 1, 31)),
+        'País': ["Argentina", "España"],
+        'Dispositivo': ['Mobile', 'Desktop'],
+    },
+}
+
+# Session counts; 0 runs the page on the mock data
+DEFAULT_SIZES = [0, 100_000, 1_000_000]
+
+
+# ============================================================
+# MEMORY
+# ============================================================
+
+def _memory_mb() -> dict:
+    """Return current and peak resident set size of this process in MB."""
+    status = Path("/proc/self/status")
+    if status.exists():
+        values = {}
+        for line in status.read_text().splitlines():
+            key, _, value = line.partition(':')
+            if key in ('VmRSS', 'VmHWM'):
+                values[key] = int(value.split()[0]) / 1024
+        return {'rss_mb': values.get('VmRSS'), 'peak_rss_mb': values.get('VmHWM')}
+
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KB elsewhere
+    peak_mb = peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+    return {'rss_mb': None, 'peak_rss_mb': peak_mb}
+
+
+# ============================================================
+# WORKER (one process per data size)
+# ============================================================
+
+def _set_widgets(at, values: dict):
+    """Set sidebar widgets by label."""
+    widgets = list(at.sidebar.multiselect) + list(at.sidebar.date_input)
+    for label, value in values.items():
+        for widget in widgets:
+            if widget.label == label:
+                widget.set_value(value)
+                break
+        else:
+            raise KeyError(f"No sidebar widget labeled {label!r}")
+
+
+def _prepare_stores():
+    """
+    Build the cube and the rollups of the configured source synchronously.
+
+    Otherwise the page starts their builds in background threads and the
+    reruns are timed against whichever backend happens to be ready.
+    """
+    from config.settings import DATA_CONFIG
+    from data.event_store import EventStore
+    from data.source import get_data_source
+
+    source = get_data_source()
+    if not source.available:
+        return
+    if DATA_CONFIG["cube"]:
+        from data.cube import get_cube_store
+        cube = get_cube_store()
+        if not cube.is_current():
+            print(f"Building the cube in {cube.path} ...")
+            cube.build()
+    if isinstance(source, EventStore):
+        from data.rollups import get_rollup_store
+        get_rollup_store().refresh(force=True)
+
+
+def run_worker(scenarios: list, repeat: int, timeout: float) -> dict:
+    """
+    Benchmark the page in this process (data source configured by the environment).
+
+    The cube and the rollups are built before timing. Each scenario starts
+    from a fresh AppTest session. The first rerun after setting the filters
+    is reported as cold, the median of the rest as warm.
+
+    Args:
+        scenarios: Scenario names from SCENARIOS
+        repeat: Reruns per scenario
+        timeout: Timeout per rerun in seconds
+
+    Returns:
+        dict with one entry per scenario
+    """
+    from streamlit.testing.v1 import AppTest
+    from monitoring.timing import get_last_run
+
+    os.chdir(ROOT_DIR)
+    _prepare_stores()
+    results = {}
+
+    for name in scenarios:
+        at = AppTest.from_file(str(MAIN_PAGE), default_timeout=timeout)
+        at.run()
+        _set_widgets(at, SCENARIOS[name])
+
+        reruns = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            at.run()
+            wall = time.perf_counter() - started
+            if at.exception:
+                raise RuntimeError(f"Scenario {name!r} failed: {at.exception[0].value}")
+            run = get_last_run() or {}
+            reruns.append({
+                'wall_seconds': wall,
+                'script_seconds': run.get('total'),
+                'sections': run.get('sections', {}),
+                **_memory_mb(),
+            })
+
+        warm = [r['wall_seconds'] for r in reruns[1:]] or [reruns[0]['wall_seconds']]
+        results[name] = {
+            'filters': {k: [str(x) for x in v] for k, v in SCENARIOS[name].items()},
+            'cold_seconds': reruns[0]['wall_seconds'],
+            'warm_median_seconds': statistics.median(warm),
+            'reruns': reruns,
+        }
+
+    return results
+
+
+# ============================================================
+# RUNNER
+# ============================================================
+
+def _prepare_dataset(size: int, data_dir: Path, seed: int) -> Path:
+    """Generate (or reuse) the synthetic dataset for a size."""
+    from data.synthetic import write_dataset
+
+    path = data_dir / f"sessions_{size}_seed{seed}"
+    if not path.exists():
+        print(f"Generating {size:,} sessions in {path} ...")
+        write_dataset(str(path), n_sessions=size, seed=seed)
+    return path
+
+
+def run_benchmark(
+    sizes: list,
+    scenarios: list,
+    repeat: int = 3,
+    seed: int = 42,
+    data_dir: Path = None,
+    use_cache: bool = True,
+    timeout: float = 300
+) -> dict:
+    """
+    Run the benchmark matrix, one subprocess per data size.
+
+    Args:
+        sizes: Session counts (0: mock data)
+        scenarios: Scenario names
+        repeat: Reruns per scenario
+        seed: Seed for the synthetic datasets
+        data_dir: Where datasets, their cubes and rollups are generated (reused between runs)
+        use_cache: If False, disables the data cache (DASHBOARD_CACHE=0)
+        timeout: Timeout per rerun in seconds
+
+    Returns:
+        Results dict (metadata + per size, per scenario measurements)
+    """
+    data_dir = Path(data_dir or Path(tempfile.gettempdir()) / "dashboard_bench")
+    results = {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'git_revision': _git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'seed': seed,
+            'cache': use_cache,
+        },
+        'sizes': {},
+    }
+
+    for size in sizes:
+        env = dict(os.environ)
+        env['DASHBOARD_CACHE'] = '1' if use_cache else '0'
+        events_path = _prepare_dataset(size, data_dir, seed) if size else data_dir / 'empty'
+        env['DASHBOARD_EVENTS_PATH'] = str(events_path)
+        # Derived stores of every size live next to its dataset, never in the repo tree
+        env['DASHBOARD_CUBE_PATH'] = str(events_path / '_cube')
+        env['DASHBOARD_ROLLUPS_PATH'] = str(events_path / '_rollups')
+
+        with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as handle:
+            output = handle.name
+        command = [
+            sys.executable, '-m', 'benchmarks.main_page', '--worker', output,
+            '--repeat', str(repeat), '--timeout', str(timeout), '--scenarios', *scenarios
+        ]
+        print(f"Running {len(scenarios)} scenarios on {'mock data' if not size else f'{size:,} sessions'} ...")
+        subprocess.run(command, cwd=ROOT_DIR, env=env, check=True)
+        results['sizes'][str(size)] = json.loads(Path(output).read_text())
+        os.unlink(output)
+
+    return results
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+# ============================================================
+# REPORTING
+# ============================================================
+
+def print_summary(results: dict):
+    """Print warm/cold times and the slowest sections per size and scenario."""
+    for size, scenarios in results['sizes'].items():
+        print(f"\n== {'mock data' if size == '0' else f'{int(size):,} sessions'} ==")
+        for name, result in scenarios.items():
+            last = result['reruns'][-1]
+            slowest = sorted(last['sections'].items(), key=lambda item: -item[1])[:3]
+            sections = ", ".join(f"{section} {seconds * 1000:.0f}ms" for section, seconds in slowest)
+            print(
+                f"{name:<20} cold {result['cold_seconds'] * 1000:8.1f}ms  "
+                f"warm {result['warm_median_seconds'] * 1000:8.1f}ms  "
+                f"peak {last['peak_rss_mb'] or 0:7.1f}MB  [{sections}]"
+            )
+
+
+def compare(baseline_path: str, candidate_path: str):
+    """
+    Print the warm-time delta of every (size, scenario) present in both result files.
+
+    Args:
+        baseline_path: Results JSON of the reference version
+        candidate_path: Results JSON of the version under test
+    """
+    baseline = json.loads(Path(baseline_path).read_text())
+    candidate = json.loads(Path(candidate_path).read_text())
+    print(f"{'size':>10} {'scenario':<20} {'baseline':>10} {'candidate':>10} {'delta':>8}")
+    for size, scenarios in candidate['sizes'].items():
+        for name, result in scenarios.items():
+            reference = baseline['sizes'].get(size, {}).get(name)
+            if reference is None:
+                continue
+            old = reference['warm_median_seconds']
+            new = result['warm_median_seconds']
+            print(
+                f"{size:>10} {name:<20} {old * 1000:8.1f}ms {new * 1000:8.1f}ms "
+                f"{(new - old) / old * 100:+7.1f}%"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pages/main_page.py reruns.")
+    parser.add_argument("--sizes", type=int, nargs='+', default=DEFAULT_SIZES, help="Session counts (0: mock data)")
+    parser.add_argument("--scenarios", nargs='+', default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--repeat", type=int, default=3, help="Reruns per scenario")
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the synthetic datasets")
+    parser.add_argument("--data-dir", default=None, help="Directory for the generated datasets")
+    parser.add_argument("--no-cache", action='store_true', help="Disable the data cache")
+    parser.add_argument("--timeout", type=float, default=300, help="Timeout per rerun (seconds)")
+    parser.add_argument("--output", default=None, help="Results JSON path")
+    parser.add_argument("--compare", nargs=2, metavar=('BASELINE', 'CANDIDATE'), help="Compare two result files")
+    parser.add_argument("--worker", metavar='OUTPUT', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    if args.worker:
+        results = run_worker(args.scenarios, args.repeat, args.timeout)
+        Path(args.worker).write_text(json.dumps(results))
+        return
+
+    results = run_benchmark(
+        args.sizes,
+        args.scenarios,
+        repeat=args.repeat,
+        seed=args.seed,
+        data_dir=args.data_dir,
+        use_cache=not args.no_cache,
+        timeout=args.timeout
+    )
+    output = Path(args.output or RESULTS_DIR / f"main_page_{datetime.now():%Y%m%d_%H%M%S}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2, ensure_ascii=False))
+    print_summary(results)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""
+Dashboard cache module.
+Contains the bounded TTL/LRU cache used by the data getters and the chart figures.
+"""
+
+from .ttl import TTLCache, estimate_size
@@ -0,0 +1,146 @@
+"""
+Thread-safe TTL/LRU cache bounded by entries and bytes.
+Shared by the data getter cache (data/cache.py) and the chart figure cache
+(charts/cache.py); it depends on neither package.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Hashable
+
+import pandas as pd
+
+
+# ============================================================
+# SIZE ESTIMATION
+# ============================================================
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimate the memory held by a cached value.
+
+    Args:
+        value: DataFrame, dict, list or scalar
+
+    Returns:
+        Size in bytes
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+# ============================================================
+# CACHE
+# ============================================================
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with time-to-live, entry and byte limits.
+
+    Entries are evicted least-recently-used first whenever max_entries or
+    max_bytes is exceeded, and expire ttl_seconds after being stored.
+    """
+
+    def __init__(self, ttl_seconds: float = 300, max_entries: int = 256, max_bytes: int = 256 * 1024 ** 2):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # key -> (expires_at, nbytes, value)
+        self._key_locks = {}            # key -> [lock, holders and waiters] while being computed
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None, record_stats: bool = True) -> Any:
+        """Return the cached value for key (refreshing its LRU position) or default."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += record_stats
+                return default
+            self._entries.move_to_end(key)
+            self.hits += record_stats
+            return entry[2]
+
+    def set(self, key: Hashable, value: Any, nbytes: int = None):
+        """Store a value, evicting least-recently-used entries to honor the limits."""
+        if nbytes is None:
+            nbytes = estimate_size(value)
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, nbytes, value)
+            self.current_bytes += nbytes
+            while len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    @contextmanager
+    def key_lock(self, key: Hashable):
+        """
+        Hold the per-key lock so concurrent misses on the same key compute the value only once.
+
+        The lock is dropped when its last holder or waiter leaves, so only the
+        keys being computed have one (whether or not the value gets stored).
+        """
+        with self._lock:
+            entry = self._key_locks.get(key)
+            if entry is None:
+                entry = self._key_locks[key] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._key_locks[key]
+
+    def clear(self):
+        """Remove every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def items(self) -> list:
+        """Snapshot of (key, nbytes, value) for every live entry."""
+        with self._lock:
+            return [(key, entry[1], entry[2]) for key, entry in self._entries.items()]
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current occupancy."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+    def _remove(self, key: Hashable):
+        _, nbytes, _ = self._entries.pop(key)
+        self.current_bytes -= nbytes
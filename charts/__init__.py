@@ -1,12 +1,42 @@
 """
 Dashboard charts module.
-Contains functions that return Plotly figures.
+Contains functions that return Plotly figures (cached by content, see cache.py).
+
+The chart modules are imported on first use of one of their names
+(module __getattr__), so importing the package is cheap.
 """
 
-from .funnel import create_funnel_chart
-from .maps import create_map, get_map_config
-from .bar_charts import create_bar_chart, create_stacked_bar_chart
-from .line_charts import create_line_chart
-from .heatmaps import create_heatmap_table, style_dataframe_heatmap
-from .kpi_cards import render_kpi_row
+import importlib
+
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'create_funnel_chart': 'funnel',
+    'create_map': 'maps',
+    'get_map_config': 'maps',
+    'create_bar_chart': 'bar_charts',
+    'create_stacked_bar_chart': 'bar_charts',
+    'create_line_chart': 'line_charts',
+    'create_heatmap_table': 'heatmaps',
+    'style_dataframe_heatmap': 'heatmaps',
+    'heatmap_table': 'heatmaps',
+    'heatmap_column_config': 'heatmaps',
+    'render_kpi_row': 'kpi_cards',
+    'cached_figure': 'cache',
+    'get_figure_cache': 'cache',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
 
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
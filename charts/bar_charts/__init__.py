@@ -1 +1,2 @@
-from .bar_charts import create_bar_chart, create_stacked_bar_chart
\ No newline at end of file
+from .bar_charts import create_bar_chart, create_stacked_bar_chart
+from .ranking import top_k_columns, top_k_positions
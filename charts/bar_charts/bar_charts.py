@@ -4,9 +4,14 @@ Bar charts.
 
 import pandas as pd
 import plotly.graph_objects as go
+from monitoring.instrumentation import instrumented
+from ..cache import cached_figure
 from .css import DEFAULT_COLORS, COLORS, BAR_LAYOUT, get_legend_horizontal
+from .ranking import top_k_columns
 
 
+@instrumented('chart')
+@cached_figure()
 def create_bar_chart(
     df: pd.DataFrame,
     dimension_x_axis: str,
@@ -15,20 +20,28 @@ def create_bar_chart(
     title: str = '',
     height: int = 400,
     colors: list = None,
-    barmode: str = 'group'
+    barmode: str = 'group',
+    top_n: int = None,
+    other_label: str = 'Otros'
 ) -> go.Figure:
     """
-    Create a bar chart.
+    Create a bar chart of two metrics by category.
+    
+    One trace per metric, built from whole columns, so the figure size does
+    not grow with one trace per category.
     
     Args:
         df: DataFrame with the data
-        dimension_x_axis: Column for x-axis dimension
+        dimension_x_axis: Category column (x-axis)
         dimension_col: First metric column
         breakdown_col: Second metric column
         title: Chart title
         height: Height in pixels
-        colors: List of colors for bars
+        colors: List of colors for the metrics
         barmode: Bar mode ('group' or 'stack')
+        top_n: Keep the top_n categories by the sum of both metrics and
+               collapse the rest into other_label (None: every category)
+        other_label: Label of the collapsed categories
         
     Returns:
         Plotly Figure
@@ -36,14 +49,21 @@ def create_bar_chart(
     if colors is None:
         colors = DEFAULT_COLORS
     
+    metrics = [dimension_col, breakdown_col]
+    if top_n is not None:
+        categories, values = top_k_columns(df, dimension_x_axis, metrics, top_n, tail_label=other_label)
+    else:
+        categories = df[dimension_x_axis].to_numpy()
+        values = {col: df[col].to_numpy() for col in metrics}
+    
     fig = go.Figure()
     
-    for i, row in df.iterrows():
+    for i, col in enumerate(metrics):
         fig.add_trace(go.Bar(
-            name=row[dimension_x_axis],
-            x=[dimension_col, breakdown_col],
-            y=[row[dimension_col], row[breakdown_col]],
-            marker_color=colors[i % len(colors)] if colors else None
+            name=col,
+            x=categories,
+            y=values[col],
+            marker_color=colors[i % len(colors)]
         ))
     
     fig.update_layout(
@@ -57,6 +77,8 @@ def create_bar_chart(
     return fig
 
 
+@instrumented('chart')
+@cached_figure()
 def create_stacked_bar_chart(
     df: pd.DataFrame,
     x_col: str,
@@ -67,7 +89,8 @@ def create_stacked_bar_chart(
     y_title: str = 'Users',
     height: int = 450,
     rotate_labels: bool = False,
-    barmode: str = 'group'
+    barmode: str = 'group',
+    ranking: dict = None
 ) -> go.Figure:
     """
     Create a generic grouped/stacked bar chart.
@@ -83,6 +106,10 @@ def create_stacked_bar_chart(
         height: Height in pixels
         rotate_labels: If True, rotates x-axis labels 45 degrees
         barmode: Bar mode ('group' or 'stack')
+        ranking: Order the categories by score, highest first. Keys:
+                 'by' (columns summed into the score, default y_cols),
+                 'k' (categories kept, default all) and
+                 'tail' (label of the sum of the dropped categories, default none)
         
     Returns:
         Plotly Figure
@@ -90,13 +117,27 @@ def create_stacked_bar_chart(
     if colors is None:
         colors = [COLORS["secondary"], COLORS["primary"]]
     
+    if ranking is not None:
+        k = ranking.get('k')
+        categories, values = top_k_columns(
+            df,
+            x_col,
+            y_cols,
+            len(df) if k is None else k,
+            rank_by=ranking.get('by'),
+            tail_label=ranking.get('tail')
+        )
+    else:
+        categories = df[x_col]
+        values = df
+    
     fig = go.Figure()
     
     for i, col in enumerate(y_cols):
         fig.add_trace(go.Bar(
             name=col,
-            x=df[x_col],
-            y=df[col],
+            x=categories,
+            y=values[col],
             marker_color=colors[i % len(colors)]
         ))
     
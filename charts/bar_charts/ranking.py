@@ -0,0 +1,76 @@
+"""
+Top-k selection of bar chart categories.
+
+Works on NumPy arrays with partial selection (argpartition): only the k
+selected categories are sorted, and the rest are summed into a tail bucket.
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def top_k_positions(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Positions of the k highest scores, highest first.
+
+    Ties keep the original row order; missing scores rank last.
+
+    Args:
+        scores: 1-D numeric array
+        k: Number of positions to return
+
+    Returns:
+        int array of at most k positions
+    """
+    scores = np.nan_to_num(np.asarray(scores, dtype=float), nan=-np.inf)
+    n = len(scores)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < n:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(n)
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order]
+
+
+def top_k_columns(
+    df: pd.DataFrame,
+    label_col: str,
+    value_cols: List[str],
+    k: int,
+    rank_by: List[str] = None,
+    tail_label: str = 'Otros'
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Keep the k categories with the highest score and collapse the rest.
+
+    Args:
+        df: DataFrame with one row per category
+        label_col: Category column
+        value_cols: Additive metric columns to return
+        k: Number of categories to keep
+        rank_by: Columns whose row sum is the score (default: value_cols)
+        tail_label: Label of the row summing the other categories (None: drop them)
+
+    Returns:
+        Tuple (labels, {column: values}) of NumPy arrays, highest score first
+        and the tail row last
+    """
+    columns = {col: df[col].to_numpy() for col in value_cols}
+    scores = np.zeros(len(df))
+    for col in rank_by or value_cols:
+        scores = scores + (columns[col] if col in columns else df[col].to_numpy())
+
+    top = top_k_positions(scores, k)
+    labels = df[label_col].to_numpy()[top]
+    selected = {col: values[top] for col, values in columns.items()}
+
+    if tail_label is not None and len(top) < len(df):
+        rest = np.ones(len(df), dtype=bool)
+        rest[top] = False
+        labels = np.append(labels.astype(object), tail_label)
+        selected = {col: np.append(selected[col], columns[col][rest].sum()) for col in selected}
+    return labels, selected
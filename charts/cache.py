@@ -0,0 +1,123 @@
+"""
+Content-addressed cache of chart figures.
+A chart factory called again with identical data and arguments rebuilds its
+go.Figure from the stored figure dict instead of running the factory again.
+"""
+
+import functools
+import hashlib
+import inspect
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from cache import TTLCache
+from config.settings import FIGURE_CACHE_CONFIG
+
+
+_MISSING = object()
+
+
+# ============================================================
+# CONTENT HASH
+# ============================================================
+
+def _update_digest(digest, value: Any):
+    """Feed a factory argument into the digest (frames and arrays by content)."""
+    if isinstance(value, pd.DataFrame):
+        digest.update(repr(('frame', list(value.columns), [str(t) for t in value.dtypes])).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, pd.Series):
+        digest.update(repr(('series', value.name, str(value.dtype))).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray) and value.dtype != object:
+        digest.update(repr(('array', str(value.dtype), value.shape)).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}:{len(value)}".encode())
+        for item in value:
+            _update_digest(digest, item)
+    elif isinstance(value, dict):
+        digest.update(f"dict:{len(value)}".encode())
+        for key in sorted(value, key=repr):
+            _update_digest(digest, key)
+            _update_digest(digest, value[key])
+    else:
+        digest.update(repr(value).encode())
+    digest.update(b'\x00')
+
+
+def figure_key(func: Callable, args: tuple, kwargs: dict, signature: inspect.Signature = None) -> tuple:
+    """
+    Build the cache key of a chart factory call.
+
+    Args:
+        func: Chart factory
+        args: Positional arguments
+        kwargs: Keyword arguments
+        signature: Precomputed signature of func (optional)
+
+    Returns:
+        Tuple (module, qualified name, hex digest of the bound arguments)
+    """
+    bound = (signature or inspect.signature(func)).bind(*args, **kwargs)
+    bound.apply_defaults()
+    digest = hashlib.blake2b(digest_size=16)
+    for name, value in bound.arguments.items():
+        digest.update(name.encode())
+        _update_digest(digest, value)
+    return (func.__module__, func.__qualname__, digest.hexdigest())
+
+
+# ============================================================
+# DECORATOR
+# ============================================================
+
+_figure_cache = TTLCache(
+    ttl_seconds=FIGURE_CACHE_CONFIG["ttl_seconds"],
+    max_entries=FIGURE_CACHE_CONFIG["max_entries"],
+    max_bytes=FIGURE_CACHE_CONFIG["max_bytes"]
+)
+
+
+def get_figure_cache() -> TTLCache:
+    """Return the process-wide figure cache."""
+    return _figure_cache
+
+
+def cached_figure(cache: TTLCache = None) -> Callable:
+    """
+    Memoize a chart factory as a figure dict, keyed by the content of its inputs.
+
+    The decorated factory still returns a new go.Figure on every call, so
+    callers may modify it (update_layout, add_trace...) without touching the
+    cached figure.
+
+    Args:
+        cache: Cache to use (default: process-wide figure cache)
+
+    Returns:
+        Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not FIGURE_CACHE_CONFIG["enabled"]:
+                return func(*args, **kwargs)
+
+            target = cache or _figure_cache
+            key = figure_key(func, args, kwargs, signature)
+            value = target.get(key, _MISSING)
+            if value is _MISSING:
+                fig = func(*args, **kwargs)
+                target.set(key, fig.to_dict())
+                return fig
+            return go.Figure(value)
+
+        return wrapper
+
+    return decorator
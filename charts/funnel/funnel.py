@@ -4,9 +4,13 @@ Conversion funnel charts.
 
 import numpy as np
 import plotly.graph_objects as go
+from monitoring.instrumentation import instrumented
+from ..cache import cached_figure
 from .css import FUNNEL_COLORS, FUNNEL_LAYOUT, FUNNEL_MARKER, FUNNEL_CONNECTOR, FUNNEL_TEXT
 
 
+@instrumented('chart')
+@cached_figure()
 def create_funnel_chart(
     etapas: list,
     valores: list,
@@ -1 +1,3 @@
-from .heatmaps import create_heatmap_table, style_dataframe_heatmap
\ No newline at end of file
+from .heatmaps import create_heatmap_table, style_dataframe_heatmap, heatmap_table, heatmap_column_config
+from .binning import bin_matrix
+from .colormaps import ColormapRegistry, get_colormap_registry
@@ -0,0 +1,81 @@
+"""
+Block aggregation of large heatmap matrices.
+
+Rows and columns are grouped into contiguous bins so that the matrix sent to
+the browser never exceeds a target resolution. Missing cells are ignored by
+the aggregation.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+
+AGGREGATIONS = ('sum', 'mean')
+
+
+def _bin_edges(size: int, bins: int) -> np.ndarray:
+    """Start positions of `bins` contiguous, near-equal bins over `size` items."""
+    return np.unique(np.linspace(0, size, bins + 1).astype(np.intp)[:-1])
+
+
+def _bin_labels(labels: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Label of each bin: the item label, or 'first – last' for several items."""
+    ends = np.append(starts[1:], len(labels)) - 1
+    return np.array([
+        str(labels[start]) if start == end else f"{labels[start]} – {labels[end]}"
+        for start, end in zip(starts, ends)
+    ], dtype=object)
+
+
+def bin_matrix(
+    values: np.ndarray,
+    row_labels,
+    col_labels,
+    max_rows: int,
+    max_cols: int,
+    agg: str = 'sum'
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Aggregate a matrix to at most max_rows x max_cols cells.
+
+    Args:
+        values: 2-D numeric array
+        row_labels: Label of each row
+        col_labels: Label of each column
+        max_rows: Maximum rows after binning
+        max_cols: Maximum columns after binning
+        agg: 'sum' or 'mean' of the cells of a bin
+
+    Returns:
+        Tuple (values, row labels, column labels); the input labels are kept
+        when no binning is needed along an axis
+    """
+    if agg not in AGGREGATIONS:
+        raise ValueError(f"Unknown aggregation {agg!r}, expected one of {AGGREGATIONS}")
+
+    values = np.asarray(values, dtype=float)
+    row_labels = np.asarray(row_labels, dtype=object)
+    col_labels = np.asarray(col_labels, dtype=object)
+    n_rows, n_cols = values.shape
+    if n_rows <= max_rows and n_cols <= max_cols:
+        return values, row_labels, col_labels
+
+    valid = ~np.isnan(values)
+    sums = np.where(valid, values, 0.0)
+    counts = valid.astype(np.int64)
+
+    if n_rows > max_rows:
+        row_starts = _bin_edges(n_rows, max_rows)
+        sums = np.add.reduceat(sums, row_starts, axis=0)
+        counts = np.add.reduceat(counts, row_starts, axis=0)
+        row_labels = _bin_labels(row_labels, row_starts)
+    if n_cols > max_cols:
+        col_starts = _bin_edges(n_cols, max_cols)
+        sums = np.add.reduceat(sums, col_starts, axis=1)
+        counts = np.add.reduceat(counts, col_starts, axis=1)
+        col_labels = _bin_labels(col_labels, col_starts)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        binned = sums / counts if agg == 'mean' else np.where(counts > 0, sums, np.nan)
+    return binned, row_labels, col_labels
@@ -0,0 +1,217 @@
+"""
+Precomputed colormaps for gradient tables.
+
+Every colormap is sampled once into a 256-entry RGBA lookup table (LUT) of
+floats in [0, 1], like matplotlib's; mapping values to colors is then a
+single indexing operation. The LUTs can
+be written to / read from a .npz file (see COLORMAP_CONFIG["lut_path"]).
+"""
+
+import threading
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from .css import COLORMAP_STOPS, COLORMAP_CONFIG, DEFAULT_COLORMAP
+
+
+# Text colors over light / dark backgrounds (same as pandas background_gradient)
+TEXT_COLOR_THRESHOLD = 0.408
+TEXT_COLOR_LIGHT = '#f1f1f1'
+TEXT_COLOR_DARK = '#000000'
+
+
+def _hex_to_rgb(hex_color: str) -> tuple:
+    hex_color = hex_color.lstrip('#')
+    return tuple(int(hex_color[i:i + 2], 16) / 255 for i in (0, 2, 4))
+
+
+def build_lut(colors: List[str], size: int = 256) -> np.ndarray:
+    """
+    Sample a colormap of evenly spaced color stops.
+
+    Args:
+        colors: HEX colors, from the lowest to the highest value
+        size: Number of LUT entries
+
+    Returns:
+        float array of shape (size, 4) with RGBA colors in [0, 1] (opaque)
+    """
+    stops = np.linspace(0.0, 1.0, len(colors))
+    rgb = np.array([_hex_to_rgb(color) for color in colors])
+    x = np.linspace(0.0, 1.0, size)
+    lut = np.ones((size, 4))
+    for channel in range(3):
+        lut[:, channel] = np.interp(x, stops, rgb[:, channel])
+    return lut
+
+
+def rgba_to_hex(rgba) -> str:
+    """HEX color of a float RGBA entry (rounded like matplotlib's to_hex)."""
+    r, g, b = (int(round(channel * 255)) for channel in rgba[:3])
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def _relative_luminance(rgb: np.ndarray) -> np.ndarray:
+    """W3C relative luminance of float RGB rows in [0, 1]."""
+    linear = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    return linear @ np.array([0.2126, 0.7152, 0.0722])
+
+
+def _css_table(lut: np.ndarray) -> np.ndarray:
+    """
+    Cell CSS (background and readable text color) of every LUT entry.
+
+    The text color is chosen from the unrounded LUT color, as
+    background_gradient does; only the background is rounded to HEX.
+    """
+    dark = _relative_luminance(lut[:, :3]) < TEXT_COLOR_THRESHOLD
+    return np.array([
+        f"background-color: {rgba_to_hex(rgba)};color: {TEXT_COLOR_LIGHT if is_dark else TEXT_COLOR_DARK};"
+        for rgba, is_dark in zip(lut, dark)
+    ], dtype=object)
+
+
+# ============================================================
+# REGISTRY
+# ============================================================
+
+class ColormapRegistry:
+    """
+    Named colormap LUTs, built once.
+
+    The CSS of every LUT entry is derived once as well, so styling a column
+    costs a normalization and an index lookup.
+    """
+
+    def __init__(self, luts: Dict[str, np.ndarray] = None):
+        self._luts = dict(luts or {})
+        self._css = {}
+
+    @classmethod
+    def from_stops(cls, stops: Dict[str, List[str]], size: int = 256) -> 'ColormapRegistry':
+        """Build the LUTs of {name: HEX color stops}."""
+        return cls({name: build_lut(colors, size) for name, colors in stops.items()})
+
+    @classmethod
+    def load(cls, path: str) -> 'ColormapRegistry':
+        """Read LUTs written by save() (8-bit LUTs are scaled to [0, 1])."""
+        with np.load(path) as data:
+            luts = {name: data[name] for name in data.files}
+        return cls({
+            name: lut / 255 if np.issubdtype(lut.dtype, np.integer) else lut
+            for name, lut in luts.items()
+        })
+
+    def save(self, path: str):
+        """Write the LUTs to a .npz file."""
+        np.savez(path, **self._luts)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._luts)
+
+    def lut(self, name: str) -> np.ndarray:
+        """
+        Return the LUT of a colormap.
+
+        Args:
+            name: Colormap name (unknown names use DEFAULT_COLORMAP)
+
+        Returns:
+            float array of shape (N, 4) with RGBA colors in [0, 1]
+        """
+        return self._luts.get(name, self._luts[DEFAULT_COLORMAP])
+
+    def indices(self, values, name: str, vmin: float = None, vmax: float = None) -> np.ndarray:
+        """
+        Normalize values to LUT indices.
+
+        Args:
+            values: Numeric array-like
+            name: Colormap name
+            vmin: Value of the first color (default: minimum of values)
+            vmax: Value of the last color (default: maximum of values)
+
+        Returns:
+            int array of LUT indices; -1 for missing values
+        """
+        values = np.asarray(values, dtype=float)
+        size = len(self.lut(name))
+        missing = np.isnan(values)
+        if missing.all():
+            return np.full(values.shape, -1)
+        vmin = np.nanmin(values) if vmin is None else vmin
+        vmax = np.nanmax(values) if vmax is None else vmax
+        span = vmax - vmin
+        scaled = (values - vmin) / span * size if span > 0 else np.zeros_like(values)
+        index = np.clip(np.nan_to_num(scaled), 0, size - 1).astype(np.intp)
+        index[missing] = -1
+        return index
+
+    def colors(self, values, name: str, vmin: float = None, vmax: float = None) -> np.ndarray:
+        """
+        Map values to RGBA colors.
+
+        Returns:
+            float array of shape values.shape + (4,); missing values are transparent
+        """
+        index = self.indices(values, name, vmin, vmax)
+        colors = self.lut(name)[index]
+        colors[index < 0] = 0
+        return colors
+
+    def css(self, values, name: str, vmin: float = None, vmax: float = None) -> np.ndarray:
+        """
+        Map values to cell CSS (background and text color).
+
+        Returns:
+            object array of CSS strings; empty for missing values
+        """
+        table = self._css.get(name)
+        if table is None:
+            table = self._css[name] = np.append(_css_table(self.lut(name)), '')
+        # -1 selects the trailing empty style
+        return table[self.indices(values, name, vmin, vmax)]
+
+
+# ============================================================
+# PROCESS-WIDE REGISTRY
+# ============================================================
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_colormap_registry() -> ColormapRegistry:
+    """
+    Return the process-wide colormap registry.
+
+    Built from COLORMAP_STOPS, or read from COLORMAP_CONFIG["lut_path"] when
+    that file exists.
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                path = COLORMAP_CONFIG["lut_path"]
+                if path and Path(path).is_file():
+                    _registry = ColormapRegistry.load(path)
+                else:
+                    _registry = ColormapRegistry.from_stops(COLORMAP_STOPS, COLORMAP_CONFIG["lut_size"])
+    return _registry
+
+
+def gradient_css(column, cmap_name: str) -> np.ndarray:
+    """
+    Styler.apply function: gradient background of a column.
+
+    Args:
+        column: Column values (Series passed by Styler.apply)
+        cmap_name: Colormap name
+
+    Returns:
+        CSS string per cell
+    """
+    return get_colormap_registry().css(column.to_numpy(dtype=float, na_value=np.nan), cmap_name)
@@ -2,7 +2,8 @@
 CSS styles and visual configuration for heatmaps and gradient tables.
 """
 
-from matplotlib.colors import LinearSegmentedColormap
+import os
+
 from config.styles.colors import hex_to_rgba
 
 # === OPACITY FOR HEATMAP CHARTS ===
@@ -26,29 +27,43 @@ TEXT_CONFIG = {
     "textfont": {"size": 12}
 }
 
+# === LARGE MATRICES ===
+# Matrices larger than max_rows x max_cols are aggregated into contiguous bins
+# before plotting (see binning.py); per-cell text is dropped above text_max_cells.
+HEATMAP_BINNING_CONFIG = {
+    "max_rows": 60,
+    "max_cols": 120,
+    "text_max_cells": 400,
+    "agg": "sum"
+}
+
 # === HOVER TEMPLATE ===
 HOVER_CONFIG = {
     "hovertemplate": "%{y}<br>%{x}: %{z:,.0f}<extra></extra>"
 }
 
 
-# === COLORMAPS FOR PANDAS STYLE (Source/Medium Table) ===
+# === COLORMAPS FOR GRADIENT TABLES (Source/Medium Table) ===
+# Evenly spaced color stops, sampled into lookup tables (see colormaps.py)
 # Colors:
-# - Usuarios: #2450A6 (Azul Infobae)
-# - Intención de Registro: #FB8C00 (Naranja Medio)
-# - Registrados: #E65100 (Naranja Fuerte - Sin transparencia)
-
-def get_cmap_azul():
-    """Blue colormap for 'Usuarios' column - Azul Infobae."""
-    return LinearSegmentedColormap.from_list('azul', ['#EAF0FA', '#2E64D1', '#2450A6'])
+# - azul: Usuarios - #2450A6 (Azul Infobae)
+# - naranja: Intención de Registro - #087BC7
+# - exito: Registrados - #F1780E (SUCCESS, no transparency)
+COLORMAP_STOPS = {
+    'azul': ['#EAF0FA', '#2E64D1', '#2450A6'],
+    'naranja': ['#EAF4FB', '#51A7DB', '#087BC7'],
+    'exito': ['#FEF1E7', '#F6A965', '#F1780E']
+}
 
-def get_cmap_naranja():
-    """Medium orange colormap for 'Intención de Registro' column."""
-    return LinearSegmentedColormap.from_list('naranja', ['#EAF4FB', '#51A7DB', '#087BC7'])
+# Colormap used for unknown names
+DEFAULT_COLORMAP = 'naranja'
 
-def get_cmap_exito():
-    """Strong orange colormap for 'Registrados' column - SUCCESS (no transparency)."""
-    return LinearSegmentedColormap.from_list('exito', ['#FEF1E7', '#F6A965', '#F1780E'])
+# lut_path: optional .npz with prebuilt LUTs (ColormapRegistry.save); built from
+# COLORMAP_STOPS when the file does not exist
+COLORMAP_CONFIG = {
+    "lut_size": 256,
+    "lut_path": os.environ.get("DASHBOARD_COLORMAP_LUTS") or None
+}
 
 
 # === DEFAULT COLUMN CONFIGURATION ===
@@ -58,3 +73,11 @@ DEFAULT_COLUMN_CMAPS = {
     'Registrados': 'exito'
 }
 
+# === LARGE TABLES ===
+# Above this many rows gradient tables skip pandas Styler (per-cell CSS) and
+# render the gradient columns as bars configured per column (see heatmap_table)
+HEATMAP_TABLE_CONFIG = {
+    "max_styled_rows": 5000,
+    "number_format": "localized"
+}
+
@@ -2,31 +2,47 @@
 Heatmap charts and gradient tables.
 """
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
+import streamlit as st
+from monitoring.instrumentation import instrumented
+from ..cache import cached_figure
 from .css import (
     HEATMAP_COLORSCALE, 
     HEATMAP_LAYOUT, 
     TEXT_CONFIG, 
     HOVER_CONFIG,
-    get_cmap_naranja, 
-    get_cmap_azul, 
-    get_cmap_exito,
-    DEFAULT_COLUMN_CMAPS
+    HEATMAP_BINNING_CONFIG,
+    DEFAULT_COLUMN_CMAPS,
+    HEATMAP_TABLE_CONFIG
 )
+from .binning import bin_matrix
+from .colormaps import get_colormap_registry, gradient_css, rgba_to_hex
 
 
+@instrumented('chart')
+@cached_figure()
 def create_heatmap_table(
     df: pd.DataFrame,
     index_col: str,
     title: str = 'Heatmap',
     height: int = 400,
     colorscale: list = None,
-    show_colorbar: bool = False
+    show_colorbar: bool = False,
+    row_range: tuple = None,
+    col_range: tuple = None,
+    max_rows: int = None,
+    max_cols: int = None,
+    agg: str = None
 ) -> go.Figure:
     """
     Create an interactive heatmap with Plotly.
     
+    Large matrices are aggregated into contiguous row/column bins of at most
+    max_rows x max_cols cells. Zooming is done server side: pass a row_range /
+    col_range window and only that window is binned, at full resolution.
+    
     Args:
         df: DataFrame with the data
         index_col: Column to use as index/row labels
@@ -34,26 +50,59 @@ def create_heatmap_table(
         height: Height in pixels
         colorscale: Custom color scale
         show_colorbar: If True, shows the color bar
+        row_range: (first, last) row labels to show, both inclusive
+        col_range: (first, last) column labels to show, both inclusive
+        max_rows: Maximum rows plotted (default: HEATMAP_BINNING_CONFIG)
+        max_cols: Maximum columns plotted (default: HEATMAP_BINNING_CONFIG)
+        agg: Aggregation of binned cells, 'sum' or 'mean' (default: HEATMAP_BINNING_CONFIG)
         
     Returns:
         Plotly Figure
     """
     if colorscale is None:
         colorscale = HEATMAP_COLORSCALE
+    if max_rows is None:
+        max_rows = HEATMAP_BINNING_CONFIG["max_rows"]
+    if max_cols is None:
+        max_cols = HEATMAP_BINNING_CONFIG["max_cols"]
+    if agg is None:
+        agg = HEATMAP_BINNING_CONFIG["agg"]
     
     # Set index
     df_indexed = df.set_index(index_col)
     
+    # Zoom window
+    if row_range is not None:
+        df_indexed = df_indexed.loc[row_range[0]:row_range[1]]
+    if col_range is not None:
+        df_indexed = df_indexed.loc[:, col_range[0]:col_range[1]]
+    
+    z, y, x = bin_matrix(
+        df_indexed.to_numpy(dtype=float, na_value=np.nan),
+        df_indexed.index,
+        df_indexed.columns,
+        max_rows,
+        max_cols,
+        agg
+    )
+    
+    # Per-cell labels only while they stay readable
+    text_config = {}
+    if z.size <= HEATMAP_BINNING_CONFIG["text_max_cells"]:
+        text_config = {
+            "text": z,
+            "texttemplate": TEXT_CONFIG["texttemplate"],
+            "textfont": TEXT_CONFIG["textfont"]
+        }
+    
     fig = go.Figure(data=go.Heatmap(
         showscale=show_colorbar,
-        z=df_indexed.values,
-        x=df_indexed.columns,
-        y=df_indexed.index,
+        z=z,
+        x=x,
+        y=y,
         colorscale=colorscale,
-        text=df_indexed.values,
-        texttemplate=TEXT_CONFIG["texttemplate"],
-        textfont=TEXT_CONFIG["textfont"],
-        hovertemplate=HOVER_CONFIG["hovertemplate"]
+        hovertemplate=HOVER_CONFIG["hovertemplate"],
+        **text_config
     ))
     
     fig.update_layout(
@@ -65,6 +114,7 @@ def create_heatmap_table(
     return fig
 
 
+@instrumented('chart')
 def style_dataframe_heatmap(
     df: pd.DataFrame,
     columns_config: dict = None
@@ -80,47 +130,90 @@ def style_dataframe_heatmap(
     Returns:
         Styled DataFrame
     """
-    # Map names to colormaps
-    # - azul: #2450A6 (Usuarios)
-    # - naranja: #FB8C00 (Intención de Registro)
-    # - exito: #E65100 (Registrados - Sin transparencia)
-    cmap_map = {
-        'azul': get_cmap_azul(),
-        'naranja': get_cmap_naranja(),
-        'exito': get_cmap_exito()
-    }
-    
     # Default configuration
     if columns_config is None:
         columns_config = DEFAULT_COLUMN_CMAPS
     
-    # Apply gradients
+    # Apply gradients (one LUT lookup per column)
     styled = df.style
     
     for col, cmap_name in columns_config.items():
         if col in df.columns:
-            styled = styled.background_gradient(
-                subset=[col],
-                cmap=cmap_map.get(cmap_name, get_cmap_naranja())
-            )
+            styled = styled.apply(gradient_css, subset=[col], cmap_name=cmap_name)
     
     # Format numbers
-    format_dict = {col: '{:,.0f}' for col in df.columns if df[col].dtype in ['int64', 'float64']}
+    format_dict = {
+        col: '{:,.0f}' for col in df.columns
+        if pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col])
+    }
     styled = styled.format(format_dict)
     
     return styled
 
 
-def filter_top_n(df: pd.DataFrame, n: int, column: str) -> pd.DataFrame:
+@instrumented('chart')
+def heatmap_column_config(df: pd.DataFrame, columns_config: dict = None) -> dict:
+    """
+    Build an st.dataframe column configuration that shows gradient columns as bars.
+    
+    Works on any number of rows: the cost is per column, not per cell. The
+    visual encoding differs from style_dataframe_heatmap: each value is a bar
+    whose length spans the column's min..max, drawn in one color (the
+    strongest color of the column's colormap), not a per-cell background
+    gradient. heatmap_table switches to it above
+    HEATMAP_TABLE_CONFIG["max_styled_rows"] rows.
+    
+    Args:
+        df: DataFrame to display
+        columns_config: Dict mapping column names to colormap names
+                       ('azul', 'naranja', 'exito')
+        
+    Returns:
+        Dict usable as st.dataframe(column_config=...)
+    """
+    if columns_config is None:
+        columns_config = DEFAULT_COLUMN_CMAPS
+    
+    number_format = HEATMAP_TABLE_CONFIG["number_format"]
+    config = {}
+    for col in df.columns:
+        if not pd.api.types.is_numeric_dtype(df[col].dtype):
+            continue
+        if col in columns_config and len(df):
+            # Bar color: the strongest color of the column's colormap
+            strongest = get_colormap_registry().lut(columns_config[col])[-1]
+            config[col] = st.column_config.ProgressColumn(
+                col,
+                format=number_format,
+                min_value=float(df[col].min()),
+                max_value=float(df[col].max()),
+                color=rgba_to_hex(strongest)
+            )
+        else:
+            config[col] = st.column_config.NumberColumn(col, format=number_format)
+    return config
+
+
+def heatmap_table(df: pd.DataFrame, columns_config: dict = None, max_styled_rows: int = None) -> tuple:
     """
-    Filter top N records from a DataFrame.
+    Choose the rendering of a gradient table by size.
+    
+    Tables of up to max_styled_rows rows get per-cell gradient backgrounds
+    (style_dataframe_heatmap); larger ones are returned unstyled with a bar
+    column configuration (heatmap_column_config), so their gradient columns
+    are shown as single-color bars instead. Callers should tell users about
+    the switch (column_config is not None).
     
     Args:
-        df: DataFrame to filter
-        n: Number of top records
-        column: Column to sort by
+        df: DataFrame to display
+        columns_config: Dict mapping column names to colormap names
+        max_styled_rows: Largest table styled per cell (default: HEATMAP_TABLE_CONFIG)
         
     Returns:
-        Filtered DataFrame
+        Tuple (data, column_config) for render_table_container
     """
-    return df.nlargest(n, column)
+    if max_styled_rows is None:
+        max_styled_rows = HEATMAP_TABLE_CONFIG["max_styled_rows"]
+    if len(df) <= max_styled_rows:
+        return style_dataframe_heatmap(df, columns_config), None
+    return df, heatmap_column_config(df, columns_config)
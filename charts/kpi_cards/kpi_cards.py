@@ -3,6 +3,7 @@ KPI Cards components for Streamlit.
 """
 
 import streamlit as st
+from monitoring.instrumentation import instrumented
 from .css import BASIC_CARD_CSS, CONTAINER_CSS
 
 
@@ -23,6 +24,7 @@ def render_kpi_cards(kpis: dict):
     st.markdown(html, unsafe_allow_html=True)
 
 
+@instrumented('render')
 def render_kpi_row(kpi_data: dict) -> None:
     """
     Render a row of KPIs using data from the data module.
@@ -1 +1,2 @@
-from .line_charts import create_line_chart
\ No newline at end of file
+from .line_charts import create_line_chart
+from .downsampling import downsample_indices, lttb_indices, minmax_indices
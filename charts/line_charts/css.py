@@ -53,3 +53,13 @@ MARKER_STYLE = {
     "size": 5
 }
 
+
+# === LONG SERIES ===
+# Series longer than max_points are decimated to about one point per pixel of
+# the viewport ('lttb' keeps the shape, 'minmax' keeps every bucket extreme).
+# Above webgl_threshold rendered points traces use Scattergl instead of SVG.
+DOWNSAMPLING_CONFIG = {
+    "method": "lttb",
+    "max_points": 1400,
+    "webgl_threshold": 1000
+}
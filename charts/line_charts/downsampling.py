@@ -0,0 +1,112 @@
+"""
+Point decimation of long time series.
+
+Both methods return the indices of the points to keep (sorted, always
+including the first and the last point), so every column of a row stays
+aligned with its x value.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _numeric(values) -> np.ndarray:
+    """Float view of x/y values (datetimes as nanoseconds, missing as 0)."""
+    series = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        series = series.astype('int64')
+    return np.nan_to_num(series.to_numpy(dtype=float, na_value=np.nan))
+
+
+def lttb_indices(x, y, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets selection.
+
+    Keeps the point of each bucket that forms the largest triangle with the
+    previously kept point and the average of the next bucket, which preserves
+    the visual shape (peaks and dips) of the series.
+
+    Args:
+        x: X values, sorted (numbers or datetimes)
+        y: Y values
+        threshold: Number of points to keep
+
+    Returns:
+        int array of kept row positions
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = _numeric(x)
+    y = _numeric(y)
+
+    # threshold - 2 buckets between the first and the last point
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[:-1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(y[:-1], edges[:-1]) / counts
+    # The bucket after the last one is the last point
+    mean_x = np.append(mean_x[1:], x[-1])
+    mean_y = np.append(mean_y[1:], y[-1])
+
+    kept = np.empty(threshold, dtype=np.intp)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[a] - mean_x[i]) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (mean_y[i] - y[a])
+        )
+        a = start + int(np.argmax(area))
+        kept[i + 1] = a
+    return kept
+
+
+def minmax_indices(y, buckets: int) -> np.ndarray:
+    """
+    Min/max bucket selection.
+
+    Keeps the minimum and the maximum of each of `buckets` equal-width
+    position buckets (at most 2 * buckets + 2 points), so no extreme is lost.
+
+    Args:
+        y: Y values, in x order
+        buckets: Number of buckets
+
+    Returns:
+        int array of kept row positions
+    """
+    n = len(y)
+    if 2 * buckets >= n or buckets < 1:
+        return np.arange(n)
+
+    y = _numeric(y)
+    edges = np.linspace(0, n, buckets + 1).astype(np.intp)
+    bucket = np.repeat(np.arange(buckets), np.diff(edges))
+    # Sorted by bucket, then by value: bucket b occupies positions edges[b]:edges[b + 1]
+    order = np.lexsort((y, bucket))
+    kept = np.concatenate(([0, n - 1], order[edges[:-1]], order[edges[1:] - 1]))
+    return np.unique(kept)
+
+
+def downsample_indices(x, y, max_points: int, method: str = 'lttb') -> np.ndarray:
+    """
+    Select at most max_points rows of a series.
+
+    Args:
+        x: X values, sorted
+        y: Y values
+        max_points: Point budget (e.g. the viewport width in pixels)
+        method: 'lttb' or 'minmax'
+
+    Returns:
+        int array of kept row positions (all rows if the series fits)
+    """
+    if method == 'lttb':
+        return lttb_indices(x, y, max_points)
+    if method == 'minmax':
+        # Two points per bucket plus both ends
+        return minmax_indices(y, max(1, (max_points - 2) // 2))
+    raise ValueError(f"Unknown downsampling method {method!r}, expected 'lttb' or 'minmax'")
@@ -4,9 +4,14 @@ Time series line charts.
 
 import pandas as pd
 import plotly.graph_objects as go
-from .css import COLORS, LINE_LAYOUT, LINE_STYLE, MARKER_STYLE, get_legend_right
+from monitoring.instrumentation import instrumented
+from ..cache import cached_figure
+from .css import COLORS, LINE_LAYOUT, LINE_STYLE, MARKER_STYLE, DOWNSAMPLING_CONFIG, get_legend_right
+from .downsampling import downsample_indices
 
 
+@instrumented('chart')
+@cached_figure()
 def create_line_chart(
     df: pd.DataFrame,
     x_col: str,
@@ -19,7 +24,10 @@ def create_line_chart(
     show_markers: bool = True,
     date_format: str = None,
     dtick: str = None,
-    show_legend: bool = True
+    show_legend: bool = True,
+    downsample: str = 'auto',
+    max_points: int = None,
+    webgl: bool = None
 ) -> go.Figure:
     """
     Create a generic line chart.
@@ -37,6 +45,10 @@ def create_line_chart(
         date_format: Date format for X axis (e.g.: '%d/%m')
         dtick: Tick interval (e.g.: 'D2' for every 2 days)
         show_legend: If True, shows the legend
+        downsample: Decimation of series longer than max_points: 'lttb',
+                    'minmax', 'auto' (DOWNSAMPLING_CONFIG) or None (every point)
+        max_points: Points kept per line (default: DOWNSAMPLING_CONFIG)
+        webgl: Use Scattergl traces; None switches above the configured point count
         
     Returns:
         Plotly Figure
@@ -46,21 +58,50 @@ def create_line_chart(
     
     fig = go.Figure()
     
+    if downsample == 'auto':
+        downsample = DOWNSAMPLING_CONFIG["method"]
+    if max_points is None:
+        max_points = DOWNSAMPLING_CONFIG["max_points"]
+    total_points = len(df)
+    decimated = bool(downsample) and total_points > max_points
+    
+    # Rows kept per line (decimation keeps each line's own peaks)
+    line_rows = {}
+    for col in y_cols:
+        if decimated:
+            line_rows[col] = df.iloc[downsample_indices(df[x_col], df[col], max_points, downsample)]
+        else:
+            line_rows[col] = df
+    
+    if webgl is None:
+        rendered_points = max((len(rows) for rows in line_rows.values()), default=0)
+        webgl = rendered_points > DOWNSAMPLING_CONFIG["webgl_threshold"]
+    trace_class = go.Scattergl if webgl else go.Scatter
+    
+    # Markers only when every point is drawn
+    show_markers = show_markers and not decimated
     mode = 'lines+markers' if show_markers else 'lines'
     
     for i, col in enumerate(y_cols):
+        rows = line_rows[col]
         trace_config = {
-            "x": df[x_col],
-            "y": df[col],
+            "x": rows[x_col],
+            "y": rows[col],
             "mode": mode,
             "name": col,
             "line": dict(color=colors[i % len(colors)], **LINE_STYLE)
         }
         
+        if decimated:
+            # Original point count in the legend and the hover label
+            shown = f"{len(rows):,}".replace(',', '.')
+            total = f"{total_points:,}".replace(',', '.')
+            trace_config["name"] = f"{col} ({shown} de {total} puntos)"
+        
         if show_markers:
             trace_config["marker"] = MARKER_STYLE
         
-        fig.add_trace(go.Scatter(**trace_config))
+        fig.add_trace(trace_class(**trace_config))
     
     # Configure base layout
     layout_config = LINE_LAYOUT.copy()
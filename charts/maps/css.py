@@ -59,3 +59,14 @@ MAP_INTERACTION_CONFIG = {
     'displayModeBar': False
 }
 
+
+# === SERVED REGION (geometry='served' mode) ===
+# Countries the dashboard reports on; the map view is cropped to their bounds
+SERVED_COUNTRIES = ['ARG', 'MEX', 'ESP', 'COL', 'CHL', 'PER']
+
+SERVED_GEO_LAYOUT = {
+    **GEO_LAYOUT,
+    "resolution": 110,
+    "lonaxis": {"showgrid": False, "range": [-120, 5]},
+    "lataxis": {"showgrid": False, "range": [-57, 45]}
+}
@@ -2,12 +2,25 @@
 Geographic map charts.
 """
 
+import functools
+
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
-from .css import MAP_COLORSCALE, COLORS, GEO_LAYOUT, COLORBAR_CONFIG, MAP_INTERACTION_CONFIG
+from monitoring.instrumentation import instrumented
+from ..cache import cached_figure
+from .css import (
+    MAP_COLORSCALE,
+    COLORS,
+    GEO_LAYOUT,
+    COLORBAR_CONFIG,
+    MAP_INTERACTION_CONFIG,
+    SERVED_COUNTRIES,
+    SERVED_GEO_LAYOUT
+)
 
 
+@instrumented('chart')
+@cached_figure()
 def create_map(
     df: pd.DataFrame,
     locations_col: str,
@@ -19,11 +32,16 @@ def create_map(
     colorscale: list = None,
     projection: str = 'natural earth',
     show_colorbar: bool = True,
-    colorbar_title: str = None
+    colorbar_title: str = None,
+    geometry: str = 'world'
 ) -> go.Figure:
     """
     Create a generic choropleth map.
     
+    With geometry='served' the view is cropped to SERVED_COUNTRIES on the
+    coarsest (110m) built-in geometry, and the base figure is built once per
+    style: each call only swaps the locations, values and hover data.
+    
     Args:
         df: DataFrame with the data
         locations_col: Column with ISO country codes
@@ -36,6 +54,7 @@ def create_map(
         projection: Projection type ('natural earth', 'equirectangular', etc.)
         show_colorbar: If True, shows the color bar
         colorbar_title: Color bar title
+        geometry: 'world' (full world map) or 'served' (pre-built served region)
         
     Returns:
         Plotly Figure
@@ -43,6 +62,17 @@ def create_map(
     if colorscale is None:
         colorscale = MAP_COLORSCALE
     
+    if geometry == 'served':
+        return _create_served_map(
+            df, locations_col, color_col, hover_name_col, hover_data_cols,
+            title, height, colorscale, projection, show_colorbar, colorbar_title
+        )
+    if geometry != 'world':
+        raise ValueError(f"Unknown geometry {geometry!r}, expected 'world' or 'served'")
+    
+    # plotly.express (and narwhals) only load for the full world map
+    import plotly.express as px
+
     fig = px.choropleth(
         df,
         locations=locations_col,
@@ -76,6 +106,83 @@ def create_map(
     return fig
 
 
+@functools.lru_cache(maxsize=16)
+def _served_base_figure(
+    title: str,
+    height: int,
+    colorscale: tuple,
+    projection: str,
+    show_colorbar: bool,
+    colorbar_title: str
+) -> dict:
+    """
+    Build (once per style) the validated base figure of the served-region map.
+    
+    Returns:
+        Figure dict; read-only, callers copy the trace before filling it
+    """
+    colorbar_config = COLORBAR_CONFIG.copy()
+    if colorbar_title:
+        colorbar_config["title"] = colorbar_title
+    
+    fig = go.Figure(go.Choropleth(
+        locations=SERVED_COUNTRIES,
+        z=[0] * len(SERVED_COUNTRIES),
+        locationmode='ISO-3',
+        colorscale=[list(stop) for stop in colorscale],
+        showscale=show_colorbar,
+        colorbar=colorbar_config,
+        marker_line_color=COLORS["border"],
+        marker_line_width=0.5
+    ))
+    fig.update_layout(
+        title=title,
+        geo={**SERVED_GEO_LAYOUT, "projection": {"type": projection}},
+        height=height,
+        margin=dict(l=0, r=0, t=50, b=0)
+    )
+    return fig.to_dict()
+
+
+def _create_served_map(
+    df: pd.DataFrame,
+    locations_col: str,
+    color_col: str,
+    hover_name_col: str,
+    hover_data_cols: list,
+    title: str,
+    height: int,
+    colorscale: list,
+    projection: str,
+    show_colorbar: bool,
+    colorbar_title: str
+) -> go.Figure:
+    """Fill the cached served-region base figure with this frame's values."""
+    base = _served_base_figure(
+        title, height, tuple(tuple(stop) for stop in colorscale),
+        projection, show_colorbar, colorbar_title
+    )
+    
+    hover_lines = [f"{locations_col}=%{{location}}", f"{color_col}=%{{z}}"]
+    trace = dict(
+        base['data'][0],
+        locations=df[locations_col].tolist(),
+        z=df[color_col].tolist()
+    )
+    if hover_data_cols:
+        extra_cols = [col for col in hover_data_cols if col != color_col]
+        if extra_cols:
+            trace['customdata'] = df[extra_cols].to_numpy().tolist()
+            hover_lines[1:1] = [f"{col}=%{{customdata[{i}]}}" for i, col in enumerate(extra_cols)]
+    if hover_name_col:
+        trace['hovertext'] = df[hover_name_col].tolist()
+        hover_lines.insert(0, "<b>%{hovertext}</b><br>")
+    trace['hovertemplate'] = "<br>".join(hover_lines) + "<extra></extra>"
+    
+    # The base layout was validated when it was built; skip re-validating it per call
+    return go.Figure({'data': [trace], 'layout': base['layout']}, _validate=False)
+
+
 def get_map_config() -> dict:
     """
     Returns configuration to disable map interactivity.
@@ -2,6 +2,7 @@
 Reusable UI components module for Streamlit.
 """
 
-from .filters import render_sidebar_filters
-from .layout import render_header, render_section_divider, render_section_title, render_info_box, render_chart_container
-
+from .filters import render_sidebar_filters, render_period_filter, render_country_filter, render_device_filter
+from .layout import render_header, render_section_divider, render_section_title, render_info_box, render_chart_container, render_table_container
+from .sections import render_sections
+from .timing_panel import start_page_run, render_timing_panel
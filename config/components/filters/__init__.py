@@ -1 +1,6 @@
-from .filters import render_sidebar_filters
+from .filters import (
+    render_sidebar_filters,
+    render_period_filter,
+    render_country_filter,
+    render_device_filter
+)
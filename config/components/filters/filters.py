@@ -63,14 +63,53 @@ def render_sidebar_filters(
     return filters
 
 
-def render_period_filter() -> list:
+def render_period_filter(container=None) -> list:
     """
     Render only the period filter.
     
+    Args:
+        container: Container to render into (default: sidebar)
+    
     Returns:
         List of selected dates
     """
-    return st.sidebar.date_input("Selecciona un periodo", [])
+    container = container or st.sidebar
+    return container.date_input("Selecciona un periodo", [], key="filtro_periodo")
+
+
+def render_country_filter(countries: list, container=None) -> list:
+    """
+    Render only the country filter (first country selected by default).
+    
+    Args:
+        countries: List of available countries
+        container: Container to render into (default: sidebar)
+    
+    Returns:
+        List of selected countries
+    """
+    container = container or st.sidebar
+    return container.multiselect(
+        "País",
+        countries,
+        default=countries[0] if countries else None,
+        key="filtro_pais"
+    )
+
+
+def render_device_filter(devices: list, container=None) -> list:
+    """
+    Render only the device filter (all devices selected by default).
+    
+    Args:
+        devices: List of available devices
+        container: Container to render into (default: sidebar)
+    
+    Returns:
+        List of selected devices
+    """
+    container = container or st.sidebar
+    return container.multiselect("Dispositivo", devices, default=devices, key="filtro_dispositivo")
 
 
 def render_multiselect_filter(
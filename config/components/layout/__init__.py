@@ -1 +1 @@
-from .layout import render_header, render_section_divider, render_section_title, render_info_box, render_chart_container
\ No newline at end of file
+from .layout import render_header, render_section_divider, render_section_title, render_info_box, render_chart_container, render_table_container
\ No newline at end of file
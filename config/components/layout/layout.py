@@ -3,6 +3,7 @@ Layout components for Streamlit.
 """
 
 import streamlit as st
+from monitoring.instrumentation import instrumented
 
 
 def render_header(
@@ -86,6 +87,7 @@ def render_info_box(text: str, italic: bool = True):
         st.info(text)
 
 
+@instrumented('render')
 def render_chart_container(fig, use_container_width: bool = True, config: dict = None):
     """
     Render a Plotly chart with standard configuration.
@@ -100,3 +102,26 @@ def render_chart_container(fig, use_container_width: bool = True, config: dict =
     else:
         st.plotly_chart(fig, use_container_width=use_container_width, config=config)
 
+
+@instrumented('render')
+def render_table_container(
+    data,
+    use_container_width: bool = True,
+    hide_index: bool = True,
+    column_config: dict = None
+):
+    """
+    Render a DataFrame (or pandas Styler) with standard configuration.
+    
+    Args:
+        data: DataFrame or Styler
+        use_container_width: If True, uses full container width
+        hide_index: If True, hides the index column
+        column_config: st.dataframe column configuration (optional)
+    """
+    st.dataframe(
+        data,
+        use_container_width=use_container_width,
+        hide_index=hide_index,
+        column_config=column_config
+    )
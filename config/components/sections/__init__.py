@@ -0,0 +1 @@
+from .sections import render_sections, resolve_filter_scopes
@@ -0,0 +1,144 @@
+"""
+Dashboard sections rendered as isolated fragments.
+
+Each section declares the filters it depends on. A filter used by a single
+section is rendered inside that section's fragment, so changing it reruns only
+that section; filters shared by several sections are rendered globally and
+trigger a full rerun.
+
+Sections may also declare their data sources. On a full rerun the sources of
+every section that only depends on shared filters are dispatched together
+before any section renders (see data/loader.py); the others load their
+sources concurrently when they render.
+"""
+
+import streamlit as st
+from monitoring import section as timing_section, finish_run, get_current_run
+from ..timing_panel import start_page_run
+
+
+def resolve_filter_scopes(sections: list) -> dict:
+    """
+    Decide where each filter is rendered.
+    
+    Args:
+        sections: List of section dicts (name, depends_on, render)
+        
+    Returns:
+        Dict mapping filter key to the name of the only section that depends on
+        it, or None if it is shared by several sections
+    """
+    dependents = {}
+    for section in sections:
+        for key in section['depends_on']:
+            dependents.setdefault(key, []).append(section['name'])
+    return {key: names[0] if len(names) == 1 else None for key, names in dependents.items()}
+
+
+def _render_loaded(section: dict, filters: dict, pending=None):
+    """
+    Call the section renderer, loading its sources first if it declares any.
+    
+    Args:
+        section: Section dict
+        filters: Filter values passed to the section
+        pending: PendingLoad already dispatched for this section (optional)
+    """
+    if 'sources' not in section:
+        section['render'](filters)
+        return
+
+    # Imported here: the data package is only loaded once a page renders (chart modules import config)
+    from data.loader import start_load
+
+    data = (pending or start_load(section['sources'](filters))).result()
+    if not data.ok:
+        st.warning(f"Datos no disponibles: {', '.join(data.errors)}. Intenta recargar la página.")
+        return
+    section['render'](filters, data)
+
+
+def _render_fragment(section: dict, shared_filters: dict, owned_filters: dict, slots: dict, pending=None):
+    """
+    Render one section as a fragment.
+    
+    Args:
+        section: Section dict (name, depends_on, render, optional sources)
+        shared_filters: Values of the globally rendered filters
+        owned_filters: Dict filter key -> renderer for the filters owned by this section
+        slots: Sidebar containers reserved for each filter
+        pending: Sources prefetched by the full rerun (ignored on fragment reruns)
+    """
+    @st.fragment
+    def fragment():
+        # Fragment-only reruns do not go through the page script: time them on their own
+        own_run = get_current_run() is None
+        if own_run:
+            start_page_run(f"fragment:{section['name']}")
+        timing_section(section['name'])
+
+        filters = dict(shared_filters)
+        for key, render_filter in owned_filters.items():
+            filters[key] = render_filter(slots[key])
+        _render_loaded(section, filters, None if own_run else pending)
+
+        if own_run:
+            finish_run()
+
+    # A dedicated container gives each fragment its own delta path (and id)
+    with st.container():
+        fragment()
+
+
+def render_sections(sections: list, filter_renderers: dict, container=None) -> dict:
+    """
+    Render the filters and the sections of a page.
+    
+    Args:
+        sections: Ordered list of dicts with:
+                  - name: Unique section name
+                  - depends_on: Filter keys the section reads
+                  - render: Function receiving the dict of filter values
+                            (and the LoadResult when sources is given)
+                  - sources (optional): Function receiving the filter values and
+                            returning {name: (getter, kwargs)} (see data/loader.py)
+        filter_renderers: Ordered dict mapping filter key to a function that
+                          renders the widget into a container and returns its value
+        container: Container for the filters (default: sidebar)
+        
+    Returns:
+        Dict with the values of the globally rendered filters
+    """
+    from data.loader import start_load
+
+    container = container or st.sidebar
+    scopes = resolve_filter_scopes(sections)
+
+    # Reserve one slot per filter so they keep their order wherever they are rendered
+    slots = {key: container.container() for key in filter_renderers}
+    shared_filters = {
+        key: render_filter(slots[key])
+        for key, render_filter in filter_renderers.items()
+        if scopes.get(key) is None
+    }
+
+    owned = {
+        section['name']: {
+            key: filter_renderers[key]
+            for key in section['depends_on']
+            if key in filter_renderers and scopes.get(key) == section['name']
+        }
+        for section in sections
+    }
+
+    # Dispatch the sources known from the shared filters of every section at once
+    pending = {
+        section['name']: start_load(section['sources'](shared_filters))
+        for section in sections
+        if 'sources' in section and not owned[section['name']]
+    }
+
+    for section in sections:
+        _render_fragment(section, shared_filters, owned[section['name']], slots, pending.get(section['name']))
+
+    return shared_filters
@@ -0,0 +1 @@
+from .timing_panel import is_profiling_enabled, session_tags, start_page_run, render_timing_panel
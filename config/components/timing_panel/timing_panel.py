@@ -0,0 +1,96 @@
+"""
+In-app timing panel for Streamlit.
+"""
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from config.settings import CACHE_CONFIG, INSTRUMENTATION_CONFIG
+from monitoring import start_run, summarize_calls
+
+
+def is_profiling_enabled() -> bool:
+    """
+    Return True if the current session should be profiled.
+    
+    Profiling is on when enabled in INSTRUMENTATION_CONFIG (DASHBOARD_PROFILE=1)
+    or when the page is opened with the ?profile=1 query parameter.
+    """
+    if INSTRUMENTATION_CONFIG["enabled"]:
+        return True
+    return st.query_params.get(INSTRUMENTATION_CONFIG["query_param"]) == "1"
+
+
+def session_tags() -> dict:
+    """Return identifying fields of the current Streamlit session for the JSON log."""
+    ctx = get_script_run_ctx()
+    return {'session_id': ctx.session_id} if ctx is not None else {}
+
+
+def start_page_run(page: str) -> dict:
+    """
+    Start recording a page (or fragment) rerun with the session's profiling settings.
+    
+    Args:
+        page: Page name
+        
+    Returns:
+        Run record
+    """
+    return start_run(
+        page,
+        profile=is_profiling_enabled(),
+        tags=session_tags(),
+        json_log=INSTRUMENTATION_CONFIG["json_log"]
+    )
+
+
+def render_timing_panel(run: dict):
+    """
+    Render the timing breakdown of a run in a collapsible sidebar panel.
+    
+    Args:
+        run: Run record returned by finish_run (nothing is shown if not profiled)
+    """
+    if not run or not run.get('profile'):
+        return
+    # Imported here: the data package is only loaded once a page renders (chart modules import config)
+    from data.memory import cache_report, store_tables, table_report
+    from data.source import get_data_source
+
+    with st.sidebar.expander(f"⏱️ Tiempos del rerun: {run['total'] * 1000:,.0f} ms", expanded=False):
+        st.caption("Por sección")
+        st.dataframe(
+            {
+                'Sección': list(run['sections']),
+                'ms': [round(seconds * 1000, 1) for seconds in run['sections'].values()],
+            },
+            hide_index=True,
+            use_container_width=True
+        )
+
+        summary = summarize_calls(run)
+        if not summary.empty:
+            st.caption("Por llamada (datos, gráficos y render)")
+            st.dataframe(summary.round(1), hide_index=True, use_container_width=True)
+
+        source = get_data_source()
+        source_stats = source.stats()
+        if source_stats:
+            st.caption(f"Fuente de datos ({source.name}, acumulado del proceso)")
+            st.dataframe(
+                {'Métrica': list(source_stats), 'Valor': list(source_stats.values())},
+                hide_index=True,
+                use_container_width=True
+            )
+
+        tables = table_report(store_tables())
+        entries = cache_report()
+        st.caption(
+            f"Memoria: tablas {tables['Bytes'].sum() / 1024 ** 2:,.1f} MB, "
+            f"caché {entries['Bytes'].sum() / 1024 ** 2:,.1f} MB / {CACHE_CONFIG['max_bytes'] / 1024 ** 2:,.0f} MB"
+        )
+        if not tables.empty:
+            st.dataframe(tables, hide_index=True, use_container_width=True)
+        if not entries.empty:
+            st.dataframe(entries, hide_index=True, use_container_width=True)
@@ -2,6 +2,9 @@
 Global dashboard configurations.
 """
 
+import os
+from pathlib import Path
+
 # === PAGE CONFIGURATION ===
 PAGE_CONFIG = {
     "page_title": "Infobae - Comportamiento & Conversión a Registro",
@@ -15,5 +18,100 @@ CHART_CONFIG = {
     "funnel_height": 500,
     "map_height": 500,
     "bar_height": 400,
-    "heatmap_height": 400
-}
\ No newline at end of file
+    "heatmap_height": 400,
+    # Categories shown by the ranked bar charts before grouping the rest into "Otros"
+    "ranking_top_k": 30
+}
+
+# === DATA CONFIGURATION ===
+# Root of the Parquet session store (hive partitioned by day: fecha=YYYY-MM-DD).
+# When the directory does not exist the getters fall back to the mock data.
+# Day/hour rollups (see data/rollups.py) default to <events_path>/_rollups and
+# are ingested with python -m data.rollups or, when new partitions are found
+# (checked every rollup_refresh_seconds), in the background; until then the
+# getters answer from the event store.
+# source selects the backend of the getters: 'parquet' (event store) or
+# 'sqlite' (database built with python -m data.sql_source, pool_size connections).
+# The breakdowns and KPIs are answered from the OLAP cube (see data/cube.py) in
+# cube_path, rebuilt when the source data changed (checked every cube_refresh_seconds).
+DATA_CONFIG = {
+    "events_path": os.environ.get(
+        "DASHBOARD_EVENTS_PATH",
+        str(Path(__file__).parent.parent / "data" / "store" / "events")
+    ),
+    "batch_size": 1_000_000,
+    # The day partitions are listed again (new, changed or removed files) at most this often
+    "events_refresh_seconds": 30,
+    "rollups_path": os.environ.get("DASHBOARD_ROLLUPS_PATH") or None,
+    "rollup_refresh_seconds": 60,
+    # Raw hit logs sessionized into the event store (python -m data.sessionize)
+    "hits_path": os.environ.get(
+        "DASHBOARD_HITS_PATH",
+        str(Path(__file__).parent.parent / "data" / "store" / "hits")
+    ),
+    # A hit more than this after the previous hit of the user starts a new session
+    "session_timeout_seconds": 1800,
+    # HyperLogLog precision of the daily distinct-user sketches (data/sketches.py):
+    # 2^p bytes per day x Pais x Dispositivo cell, relative standard error 1.04 / sqrt(2^p)
+    # (12: 4 KB per sketch, ~1.6%)
+    "sketch_precision": 12,
+    "source": os.environ.get("DASHBOARD_SOURCE", "parquet"),
+    "sqlite_path": os.environ.get(
+        "DASHBOARD_SQLITE_PATH",
+        str(Path(__file__).parent.parent / "data" / "store" / "sessions.db")
+    ),
+    "pool_size": 4,
+    "cube": os.environ.get("DASHBOARD_CUBE", "1") != "0",
+    # None: derived from the source (<events_path>/_cube, or <database>_cube next to the SQLite file)
+    "cube_path": os.environ.get("DASHBOARD_CUBE_PATH") or None,
+    "cube_refresh_seconds": 60
+}
+
+# === FUNNEL CONFIGURATION ===
+# Steps of the registration funnel, computed from per-user session sequences
+# (see data/funnel.py). flag: session flag column of the step (None: any
+# session, first step only); window_hours: maximum time after the previous
+# step (None: any time in the selected period).
+FUNNEL_CONFIG = {
+    "steps": [
+        {"name": "Usuarios Totales", "flag": None, "window_hours": None},
+        {"name": "Intención de Registro", "flag": "intencion", "window_hours": None},
+        {"name": "Registro Finalizado", "flag": "registro", "window_hours": None}
+    ]
+}
+
+# === CACHE CONFIGURATION ===
+# Process-wide memoization of the data getters (see data/cache.py)
+CACHE_CONFIG = {
+    "enabled": os.environ.get("DASHBOARD_CACHE", "1") != "0",
+    "ttl_seconds": 300,
+    "max_entries": 256,
+    "max_bytes": 256 * 1024 ** 2
+}
+
+# === FIGURE CACHE CONFIGURATION ===
+# Serialized figures of the chart factories, keyed by a hash of their inputs
+# (see charts/cache.py). Entries never go stale, so the TTL only frees memory.
+FIGURE_CACHE_CONFIG = {
+    "enabled": os.environ.get("DASHBOARD_FIGURE_CACHE", "1") != "0",
+    "ttl_seconds": 3600,
+    "max_entries": 128,
+    "max_bytes": 64 * 1024 ** 2
+}
+
+# === LOADER CONFIGURATION ===
+# Concurrent data loading of the page sections (see data/loader.py).
+# A source slower than timeout_seconds is reported as unavailable.
+LOADER_CONFIG = {
+    "max_workers": 8,
+    "timeout_seconds": 15
+}
+
+# === INSTRUMENTATION CONFIGURATION ===
+# Opt-in timing of data getters, chart factories and render calls (see monitoring/).
+# Can also be enabled per session with the ?profile=1 query parameter.
+INSTRUMENTATION_CONFIG = {
+    "enabled": os.environ.get("DASHBOARD_PROFILE", "0") == "1",
+    "json_log": os.environ.get("DASHBOARD_PROFILE_LOG", "0") == "1",
+    "query_param": "profile"
+}
@@ -4,4 +4,11 @@ Contains functions to extract/generate DataFrames.
 """
 
 from .mock_data import *
-
+from .event_store import EventStore, get_event_store
+from .cache import TTLCache, cached_getter, get_data_cache
+from .filters import FilterPlan, index_by_date, slice_date_range
+from .rollups import RollupStore, get_rollup_store
+from .loader import LoadResult, load_sources, start_load
+from .source import DataSource, get_data_source
+from .funnel import FunnelStep, compute_funnel
+from .memory import cache_report, column_report, compact_frame, store_tables, table_report
@@ -0,0 +1,138 @@
+"""
+Bounded, TTL-aware memoization for the data getters.
+One process-wide cache is shared by every Streamlit session.
+"""
+
+import copy
+import functools
+import inspect
+from datetime import date, datetime
+from typing import Any, Callable, Hashable, Iterable, Tuple
+
+import pandas as pd
+
+from cache import TTLCache
+from config.settings import CACHE_CONFIG
+
+
+_MISSING = object()
+
+
+# ============================================================
+# CANONICAL FILTER SIGNATURE
+# ============================================================
+
+def canonicalize(value: Any, unordered: bool = False) -> Hashable:
+    """
+    Convert a filter argument to a hashable canonical form.
+
+    Empty selections become None (every getter treats them as "no filter"),
+    dates become ISO strings and unordered selections are sorted.
+
+    Args:
+        value: Argument value
+        unordered: If True, the order of a sequence is irrelevant (e.g. countries)
+
+    Returns:
+        Hashable canonical value
+    """
+    if value is None:
+        return None
+    if isinstance(value, (datetime, date, pd.Timestamp)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple, set, frozenset)):
+        if not value:
+            return None
+        items = [canonicalize(v) for v in value]
+        return tuple(sorted(items)) if unordered or isinstance(value, (set, frozenset)) else tuple(items)
+    if isinstance(value, dict):
+        return tuple(sorted((k, canonicalize(v)) for k, v in value.items()))
+    return value
+
+
+def filter_signature(
+    func: Callable,
+    args: tuple,
+    kwargs: dict,
+    unordered: Iterable[str] = (),
+    signature: inspect.Signature = None
+) -> Tuple:
+    """
+    Build the cache key of a getter call from its bound arguments.
+
+    Args:
+        func: Getter function
+        args: Positional arguments
+        kwargs: Keyword arguments
+        unordered: Names of the arguments whose order is irrelevant
+        signature: Precomputed signature of func (optional)
+
+    Returns:
+        Tuple (qualified name, (argument, canonical value)...)
+    """
+    bound = (signature or inspect.signature(func)).bind(*args, **kwargs)
+    bound.apply_defaults()
+    return (func.__module__, func.__qualname__) + tuple(
+        (name, canonicalize(value, name in unordered)) for name, value in bound.arguments.items()
+    )
+
+
+# ============================================================
+# DECORATOR
+# ============================================================
+
+_data_cache = TTLCache(
+    ttl_seconds=CACHE_CONFIG["ttl_seconds"],
+    max_entries=CACHE_CONFIG["max_entries"],
+    max_bytes=CACHE_CONFIG["max_bytes"]
+)
+
+
+def get_data_cache() -> TTLCache:
+    """Return the process-wide data cache."""
+    return _data_cache
+
+
+def _copy_result(value: Any) -> Any:
+    """Copy a cached value so callers can mutate what they receive."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    return copy.deepcopy(value)
+
+
+def cached_getter(unordered: Iterable[str] = ('countries', 'devices'), cache: TTLCache = None) -> Callable:
+    """
+    Memoize a data getter keyed by its canonical filter signature.
+
+    Args:
+        unordered: Names of the arguments whose order is irrelevant
+        cache: Cache to use (default: process-wide data cache)
+
+    Returns:
+        Decorator
+    """
+    unordered = frozenset(unordered)
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            target = cache or _data_cache
+            if not CACHE_CONFIG["enabled"]:
+                return func(*args, **kwargs)
+
+            key = filter_signature(func, args, kwargs, unordered, signature)
+            value = target.get(key, _MISSING)
+            if value is _MISSING:
+                with target.key_lock(key):
+                    # Another session may have computed it while we waited
+                    value = target.get(key, _MISSING, record_stats=False)
+                    if value is _MISSING:
+                        value = func(*args, **kwargs)
+                        target.set(key, value)
+            return _copy_result(value)
+
+        return wrapper
+
+    return decorator
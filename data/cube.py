@@ -0,0 +1,472 @@
+"""
+Materialized OLAP cube of the session measures.
+
+One cuboid per breakdown dimension (and one for the totals), keyed by day,
+Pais and Dispositivo. Every key also has ALL rows that aggregate every value
+of that key, so distinct users stay exact for slices that do not filter it.
+A slice sums the matching cube cells; no raw events are read.
+
+The cube is rebuilt from the data source when the source data changes
+(see DataSource.signature).
+
+Usage:
+    python -m data.cube            # build the cube if the data changed
+    python -m data.cube --rebuild  # build it unconditionally
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from config.settings import DATA_CONFIG
+from .memory import compact_frame
+from .rollups import ALL
+from .schema import (
+    DATE_COL,
+    USER_COL,
+    COUNTRY_COL,
+    DEVICE_COL,
+    USER_TYPE_COL,
+    SEGMENT_COL,
+    SOURCE_COL,
+    CONCEPT_COL,
+    CATEGORY_COL,
+    INTENT_COL,
+    REGISTER_COL,
+    BOUNCE_COL,
+    DURATION_COL,
+    ENGAGEMENT_COL
+)
+from .source import DataSource, get_data_source
+
+
+# Breakdown dimensions served by the cube
+DIMENSIONS = [COUNTRY_COL, DEVICE_COL, USER_TYPE_COL, SEGMENT_COL, SOURCE_COL, CONCEPT_COL, CATEGORY_COL]
+
+# Cube columns: breakdown dimension name ('' for the totals cuboid) and its value
+DIMENSION_COL = 'dimension'
+VALUE_COL = 'valor'
+
+# Additive measures: (column, aggregation) of the sessions
+SESSION_MEASURES = {
+    'sesiones': (USER_COL, 'count'),
+    'sesiones_intencion': (INTENT_COL, 'sum'),
+    'sesiones_registro': (REGISTER_COL, 'sum'),
+    'rebotes': (BOUNCE_COL, 'sum'),
+    'duracion': (DURATION_COL, 'sum'),
+    'interaccion': (ENGAGEMENT_COL, 'sum'),
+}
+
+# Distinct users: all, with intention, registered
+USER_MEASURES = ['usuarios', 'usuarios_intencion', 'usuarios_registro']
+
+MEASURES = list(SESSION_MEASURES) + USER_MEASURES
+
+# Filter keys of every cell; ALL means "every value"
+KEYS = [DATE_COL, COUNTRY_COL, DEVICE_COL]
+
+# Columns held as categoricals in memory (the ISO dates are compared as strings)
+_CATEGORICAL = [DIMENSION_COL, VALUE_COL, COUNTRY_COL, DEVICE_COL]
+
+_FILE = 'cube.parquet'
+_MANIFEST = '_manifest.json'
+
+# Partial tables accumulated before they are merged
+_COMPACT_EVERY = 64
+
+
+# ============================================================
+# BUILD
+# ============================================================
+
+class _Vocabulary:
+    """Integer codes of the string values of a column, shared by every batch."""
+
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def encode(self, array) -> np.ndarray:
+        """Return the codes of a (dictionary or string) Arrow array."""
+        if isinstance(array, pa.ChunkedArray):
+            array = array.combine_chunks()
+        if not pa.types.is_dictionary(array.type):
+            array = pc.dictionary_encode(array)
+        lookup = np.array([self._code(value) for value in array.dictionary.to_pylist()], dtype=np.int32)
+        return lookup[array.indices.to_numpy(zero_copy_only=False)] if len(lookup) else np.zeros(len(array), np.int32)
+
+    def _code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        return np.asarray(self.values, dtype=object)[codes]
+
+
+def _prepare(batch: pa.RecordBatch, dimension: Optional[str], vocabularies: Dict[str, _Vocabulary]) -> pa.Table:
+    """Encode the keys of a batch as integers (days since epoch, vocabulary codes) and the flags as 0/1."""
+    table = pa.Table.from_batches([batch])
+    columns = {
+        DATE_COL: pc.cast(pc.cast(table[DATE_COL], pa.date32()), pa.int32()),
+        COUNTRY_COL: vocabularies[COUNTRY_COL].encode(table[COUNTRY_COL]),
+        DEVICE_COL: vocabularies[DEVICE_COL].encode(table[DEVICE_COL]),
+        VALUE_COL: vocabularies[VALUE_COL].encode(table[dimension]) if dimension else np.zeros(len(table), np.int32),
+        USER_COL: table[USER_COL],
+    }
+    for column in (INTENT_COL, REGISTER_COL, BOUNCE_COL, DURATION_COL, ENGAGEMENT_COL):
+        columns[column] = pc.cast(table[column], pa.int64())
+    return pa.table(columns)
+
+
+def _sums(table: pa.Table, keys: List[str]) -> pa.Table:
+    """Additive measures of table grouped by keys."""
+    aggregations = [(column, 'count' if agg == 'count' else 'sum') for column, agg in SESSION_MEASURES.values()]
+    result = table.group_by(keys).aggregate(aggregations)
+    return result.select(keys + [f"{column}_{agg}" for column, agg in aggregations]).rename_columns(
+        keys + list(SESSION_MEASURES)
+    )
+
+
+def _merge_sums(partials: List[pa.Table], keys: List[str]) -> pa.Table:
+    """Merge partial additive measures."""
+    merged = pa.concat_tables(partials).group_by(keys).aggregate([(name, 'sum') for name in SESSION_MEASURES])
+    return merged.select(keys + [f"{name}_sum" for name in SESSION_MEASURES]).rename_columns(
+        keys + list(SESSION_MEASURES)
+    )
+
+
+def _users(table: pa.Table, keys: List[str]) -> pa.Table:
+    """Distinct (keys, user) pairs with the user's intention / registration flags."""
+    result = table.group_by(keys + [USER_COL]).aggregate([(INTENT_COL, 'max'), (REGISTER_COL, 'max')])
+    return result.select(keys + [USER_COL, f"{INTENT_COL}_max", f"{REGISTER_COL}_max"]).rename_columns(
+        keys + [USER_COL, INTENT_COL, REGISTER_COL]
+    )
+
+
+def _grouping_sets(dimension: Optional[str]) -> List[List[str]]:
+    """Keys kept by each grouping set of a cuboid (the others are stored as ALL), finest first."""
+    optional = [key for key in KEYS if key != dimension]
+    sets = [[]]
+    for key in optional:
+        sets = [s + [key] for s in sets] + sets
+    fixed = [dimension] if dimension in KEYS else []
+    return [sorted(s + fixed, key=KEYS.index) for s in sets]
+
+
+def _cuboid(source: DataSource, dimension: Optional[str]) -> pd.DataFrame:
+    """
+    Build the cells of one breakdown dimension (None: totals).
+
+    One streaming pass over the source; the finest cells (day, Pais,
+    Dispositivo, value) are merged across batches and every grouping set is
+    derived from the smallest finer set already computed.
+    """
+    finest = KEYS + [VALUE_COL]
+    columns = [DATE_COL, USER_COL, COUNTRY_COL, DEVICE_COL, INTENT_COL, REGISTER_COL, BOUNCE_COL,
+               DURATION_COL, ENGAGEMENT_COL]
+    if dimension and dimension not in columns:
+        columns.append(dimension)
+    vocabularies = {COUNTRY_COL: _Vocabulary(), DEVICE_COL: _Vocabulary(), VALUE_COL: _Vocabulary()}
+
+    sums, users = [], []
+    for batch in source.batches(columns):
+        table = _prepare(batch, dimension, vocabularies)
+        sums.append(_sums(table, finest))
+        users.append(_users(table, finest))
+        if len(sums) >= _COMPACT_EVERY:
+            sums = [_merge_sums(sums, finest)]
+            users = [_users(pa.concat_tables(users), finest)]
+    if not sums:
+        return pd.DataFrame(columns=[DIMENSION_COL, VALUE_COL] + KEYS + MEASURES)
+
+    sums = _merge_sums(sums, finest)
+    pairs = {tuple(finest): _users(pa.concat_tables(users), finest)}
+
+    frames = []
+    for keys in _grouping_sets(dimension):
+        group = keys + [VALUE_COL]
+        cells = _merge_sums([sums], group).to_pandas()
+        # A user counts once per cell, with the flags of any of their sessions in it
+        per_user = pairs.get(tuple(group))
+        if per_user is None:
+            parent = min((table for kept, table in pairs.items() if set(group) <= set(kept)), key=len)
+            per_user = pairs[tuple(group)] = _users(parent, group)
+        counts = per_user.group_by(group).aggregate(
+            [(USER_COL, 'count'), (INTENT_COL, 'sum'), (REGISTER_COL, 'sum')]
+        )
+        counts = counts.select(group + [f"{USER_COL}_count", f"{INTENT_COL}_sum", f"{REGISTER_COL}_sum"])
+        counts = counts.rename_columns(group + USER_MEASURES).to_pandas()
+        cells = cells.merge(counts, on=group, how='left')
+        frames.append(_decode(cells, keys, vocabularies))
+
+    result = pd.concat(frames, ignore_index=True)
+    result[DIMENSION_COL] = dimension or ''
+    return result[[DIMENSION_COL, VALUE_COL] + KEYS + MEASURES]
+
+
+def _decode(cells: pd.DataFrame, keys: List[str], vocabularies: Dict[str, _Vocabulary]) -> pd.DataFrame:
+    """Replace the key codes with their values; keys not kept become ALL."""
+    if DATE_COL in keys:
+        days = cells[DATE_COL].to_numpy().astype('datetime64[D]')
+        cells[DATE_COL] = np.datetime_as_string(days, unit='D').astype(object)
+    else:
+        cells[DATE_COL] = ALL
+    for key in (COUNTRY_COL, DEVICE_COL):
+        cells[key] = vocabularies[key].decode(cells[key].to_numpy()) if key in keys else ALL
+    values = vocabularies[VALUE_COL]
+    cells[VALUE_COL] = values.decode(cells[VALUE_COL].to_numpy()) if values.values else ''
+    return cells
+
+
+def build_cube(source: DataSource) -> pd.DataFrame:
+    """
+    Compute every cuboid of the cube.
+
+    Args:
+        source: Data source to read the sessions from
+
+    Returns:
+        DataFrame with DIMENSION_COL, VALUE_COL, the KEYS and the MEASURES
+    """
+    frames = [_cuboid(source, dimension) for dimension in [None] + DIMENSIONS]
+    cube = pd.concat(frames, ignore_index=True)
+    cube[MEASURES] = cube[MEASURES].fillna(0).astype('int64')
+    return cube
+
+
+# ============================================================
+# CUBE STORE
+# ============================================================
+
+class CubeStore:
+    """
+    Cube file built from a data source and rebuilt when the source changes.
+
+    The manifest records the source signature the cube was built from. ready()
+    compares it with the source at most every refresh_seconds and, when the
+    data changed, rebuilds the cube in a background thread; callers answer
+    from the source meanwhile.
+    """
+
+    def __init__(self, source: DataSource, path: str, refresh_seconds: float = 60):
+        self.source = source
+        self.path = Path(path)
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._cube = None
+        self._current = False
+        self._last_check = None
+        self._builder = None
+
+    def manifest(self) -> dict:
+        """Return the manifest ({'source', 'signature', 'built', 'cells', 'seconds'}), empty if never built."""
+        path = self.path / _MANIFEST
+        return json.loads(path.read_text()) if path.exists() else {}
+
+    def is_current(self) -> bool:
+        """True if the cube file was built from the current source data."""
+        manifest = self.manifest()
+        signature = self.source.signature()
+        return (
+            signature is not None
+            and (self.path / _FILE).exists()
+            and manifest.get('source') == self.source.name
+            and manifest.get('signature') == signature
+        )
+
+    def build(self) -> dict:
+        """
+        Build the cube from the source and write it (one build at a time).
+
+        Returns:
+            The new manifest
+        """
+        with self._build_lock:
+            started = time.perf_counter()
+            signature = self.source.signature()
+            cube = build_cube(self.source)
+            self.path.mkdir(parents=True, exist_ok=True)
+            target = self.path / _FILE
+            tmp = target.with_suffix('.tmp')
+            pq.write_table(pa.Table.from_pandas(cube, preserve_index=False), tmp)
+            os.replace(tmp, target)
+
+            manifest = {
+                'source': self.source.name,
+                'signature': signature,
+                'built': datetime.now().isoformat(timespec='seconds'),
+                'cells': len(cube),
+                'seconds': round(time.perf_counter() - started, 3),
+            }
+            path = self.path / _MANIFEST
+            path.with_suffix('.tmp').write_text(json.dumps(manifest, indent=1, sort_keys=True))
+            os.replace(path.with_suffix('.tmp'), path)
+
+            with self._lock:
+                self._cube = compact_frame(cube, _CATEGORICAL)
+                self._current = True
+                self._last_check = time.monotonic()
+            return manifest
+
+    def _build_in_background(self):
+        try:
+            self.build()
+        finally:
+            with self._lock:
+                self._builder = None
+
+    def ready(self) -> bool:
+        """
+        Return True if the cube can answer for the current source data.
+
+        When the data changed (checked at most every refresh_seconds), a
+        background rebuild is started and False is returned until it finishes.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._last_check is not None and now - self._last_check < self.refresh_seconds:
+                return self._current
+            self._last_check = now
+        current = self.is_current()
+        with self._lock:
+            if not current and self._cube is not None and self._current:
+                # The loaded cube is stale
+                self._cube = None
+            self._current = current
+            if not current and self._builder is None and self.source.available:
+                self._builder = threading.Thread(target=self._build_in_background, name="cube-build", daemon=True)
+                self._builder.start()
+            return current
+
+    def _frame(self) -> pd.DataFrame:
+        """All cube cells (read once per build)."""
+        with self._lock:
+            if self._cube is None:
+                self._cube = compact_frame(pq.read_table(self.path / _FILE).to_pandas(), _CATEGORICAL)
+            return self._cube
+
+    def slice(
+        self,
+        dimension: str = None,
+        measures: List[str] = None,
+        countries: List[str] = None,
+        devices: List[str] = None,
+        date_range: tuple = None
+    ) -> pd.DataFrame:
+        """
+        Answer a breakdown by summing cube cells.
+
+        An unfiltered key reads its ALL cells, so distinct users stay exact;
+        for a filtered key the per-value cells are added up, which counts a
+        user once per selected value (or day) they appear in.
+
+        Args:
+            dimension: Breakdown dimension (one of DIMENSIONS), or None for totals
+            measures: Measures to return (default: MEASURES)
+            countries: Countries to include (None/empty: all)
+            devices: Devices to include (None/empty: all)
+            date_range: Tuple of (start_date, end_date), both inclusive
+
+        Returns:
+            DataFrame with the dimension column (if any) and the measures
+        """
+        if dimension is not None and dimension not in DIMENSIONS:
+            raise ValueError(f"Unknown cube dimension {dimension!r}, expected one of {DIMENSIONS}")
+        measures = list(measures or MEASURES)
+        cube = self._frame()
+
+        mask = (cube[DIMENSION_COL] == (dimension or '')).to_numpy()
+        for key, selected in ((COUNTRY_COL, countries), (DEVICE_COL, devices)):
+            if selected:
+                mask = mask & cube[key].isin(selected).to_numpy()
+            elif key != dimension:
+                mask = mask & (cube[key] == ALL).to_numpy()
+        if date_range and len(date_range) == 2:
+            start, end = (pd.Timestamp(d).date().isoformat() for d in date_range)
+            dates = cube[DATE_COL]
+            mask = mask & ((dates != ALL) & (dates >= start) & (dates <= end)).to_numpy()
+        else:
+            mask = mask & (cube[DATE_COL] == ALL).to_numpy()
+
+        cells = cube.loc[mask]
+        if dimension is None:
+            return cells[measures].sum().to_frame().T.reset_index(drop=True)
+        result = cells.groupby(VALUE_COL, as_index=False, sort=False)[measures].sum()
+        return result.rename(columns={VALUE_COL: dimension})
+
+    def stats(self) -> dict:
+        """Size of the loaded cube."""
+        cube = self._cube
+        return {
+            'cells': 0 if cube is None else len(cube),
+            'bytes': 0 if cube is None else int(cube.memory_usage(deep=True).sum()),
+        }
+
+
+# ============================================================
+# PROCESS-WIDE CUBE
+# ============================================================
+
+_cube = None
+_cube_lock = threading.Lock()
+
+
+def default_cube_path(source: DataSource) -> Path:
+    """
+    Cube directory of a data source when DATA_CONFIG["cube_path"] is not set.
+
+    Inside the event store directory ('_'-prefixed paths are ignored by dataset
+    discovery) or next to the SQLite database file, so every source has its own cube.
+    """
+    if source.name == 'parquet':
+        return source.path / '_cube'
+    return source.path.with_name(f'{source.path.stem}_cube')
+
+
+def get_cube_store() -> CubeStore:
+    """Return the process-wide cube of the configured data source."""
+    global _cube
+    if _cube is None:
+        with _cube_lock:
+            if _cube is None:
+                source = get_data_source()
+                _cube = CubeStore(
+                    source,
+                    DATA_CONFIG["cube_path"] or default_cube_path(source),
+                    refresh_seconds=DATA_CONFIG["cube_refresh_seconds"]
+                )
+    return _cube
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the OLAP cube from the configured data source.")
+    parser.add_argument("--out", default=DATA_CONFIG["cube_path"], help="Cube directory (default: from the source)")
+    parser.add_argument("--rebuild", action='store_true', help="Build even if the source did not change")
+    args = parser.parse_args()
+
+    source = get_data_source()
+    store = CubeStore(source, args.out or default_cube_path(source))
+    if args.rebuild or not store.is_current():
+        manifest = store.build()
+        print(f"Built {manifest['cells']:,} cells in {manifest['seconds']:.1f}s into {store.path}")
+    else:
+        print(f"Cube in {store.path} is current ({store.manifest()['built']})")
+
+
+if __name__ == "__main__":
+    main()
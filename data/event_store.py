@@ -0,0 +1,331 @@
+"""
+Parquet/Arrow-backed session store.
+Aggregations run batch by batch in Arrow; only the (small) aggregated result reaches pandas.
+"""
+
+import hashlib
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from config.settings import DATA_CONFIG
+from .filters import FilterPlan
+from .schema import PARTITION_SCHEMA, DATE_COL, COUNTRY_COL, DEVICE_COL
+from .source import DataSource, Measure
+
+# Number of partial tables accumulated before they are merged
+_COMPACT_EVERY = 64
+
+
+def _decode_dictionaries(table: pa.Table) -> pa.Table:
+    """Cast dictionary-encoded columns to plain strings so partial results can be merged."""
+    for i, field in enumerate(table.schema):
+        if pa.types.is_dictionary(field.type):
+            table = table.set_column(i, field.name, pc.cast(table.column(i), field.type.value_type))
+    return table
+
+
+def _additive_aggregations(measures: Dict[str, Measure]) -> List[tuple]:
+    """Return the (column, function) pairs needed to compute the additive measures."""
+    aggregations = []
+    for column, agg, _ in measures.values():
+        if agg in ('sum', 'mean') and (column, 'sum') not in aggregations:
+            aggregations.append((column, 'sum'))
+        if agg in ('count', 'mean') and (column, 'count') not in aggregations:
+            aggregations.append((column, 'count'))
+    return aggregations
+
+
+def _merge_additive(partials: List[pa.Table], group_by: List[str], aggregations: List[tuple]) -> pa.Table:
+    """Merge partial sums/counts (both are re-aggregated with a sum)."""
+    merged = pa.concat_tables(partials)
+    names = [f"{col}_{func}" for col, func in aggregations]
+    result = merged.group_by(group_by).aggregate([(name, 'sum') for name in names])
+    return result.rename_columns(list(group_by) + names) if group_by else result.rename_columns(names)
+
+
+def _merge_pairs(partials: List[pa.Table], keys: List[str]) -> pa.Table:
+    """Deduplicate accumulated (group keys + value) pairs."""
+    return pa.concat_tables(partials).group_by(keys).aggregate([])
+
+
+class EventStore(DataSource):
+    """
+    Session store backed by a hive-partitioned Parquet dataset.
+
+    The dataset is opened lazily and shared by every Streamlit session of the process.
+    The day partition directories are listed again at most every refresh_seconds, and
+    the dataset is re-discovered when files were added, changed or removed.
+    Filters on the partition key prune whole files; dimension filters are pushed down
+    to the Parquet reader, and only the columns a query needs are read.
+    """
+
+    name = 'parquet'
+
+    def __init__(self, path: str, batch_size: int = 1_000_000, refresh_seconds: float = 30):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.refresh_seconds = refresh_seconds
+        self._dataset = None
+        self._listing = None
+        self._last_check = None
+        self._lock = threading.Lock()
+
+    def _list_files(self) -> Tuple[List[str], str]:
+        """
+        List the data files of the day partitions.
+
+        Returns:
+            Tuple (sorted file paths, hash of their name, size and modification time);
+            files removed while listing are left out
+        """
+        files = []
+        digest = hashlib.blake2b(digest_size=16)
+        directories = sorted(self.path.glob(f'{DATE_COL}=*')) if self.path.is_dir() else []
+        for directory in directories:
+            try:
+                entries = sorted(directory.iterdir())
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            for file in entries:
+                if file.name.startswith(('.', '_')):
+                    continue
+                try:
+                    stat = file.stat()
+                except FileNotFoundError:
+                    continue
+                if file.is_file():
+                    files.append(str(file))
+                    digest.update(f"{file}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+        return files, digest.hexdigest()
+
+    @property
+    def dataset(self) -> Optional[ds.Dataset]:
+        """Arrow dataset of the current partition files, or None if the store has no data."""
+        now = time.monotonic()
+        if self._last_check is None or now - self._last_check >= self.refresh_seconds:
+            with self._lock:
+                if self._last_check is None or now - self._last_check >= self.refresh_seconds:
+                    files, signature = self._list_files()
+                    if signature != self._listing:
+                        self._dataset = ds.dataset(
+                            files,
+                            format='parquet',
+                            partitioning=ds.partitioning(PARTITION_SCHEMA, flavor='hive'),
+                            partition_base_dir=str(self.path)
+                        ) if files else None
+                        self._listing = signature
+                    self._last_check = now
+        return self._dataset
+
+    @property
+    def available(self) -> bool:
+        """True if the store has data to query."""
+        return self.dataset is not None
+
+    def refresh(self):
+        """List the partitions again on next query, so new or removed files are picked up."""
+        with self._lock:
+            self._last_check = None
+
+    def signature(self) -> Optional[str]:
+        """
+        Hash of the name, size and modification time of every data file, listed now.
+
+        When it differs from the listing of the current dataset (files added,
+        changed or removed), the next query re-discovers the dataset.
+        """
+        files, signature = self._list_files()
+        if not files:
+            return None
+        if signature != self._listing:
+            self.refresh()
+        return signature
+
+    def build_filter(
+        self,
+        countries: List[str] = None,
+        devices: List[str] = None,
+        date_range: tuple = None
+    ) -> Optional[ds.Expression]:
+        """
+        Build the Arrow filter expression for the dashboard filters.
+
+        Args:
+            countries: Countries to include (None/empty: all)
+            devices: Devices to include (None/empty: all)
+            date_range: Tuple of (start_date, end_date), both inclusive
+
+        Returns:
+            Arrow expression, or None if nothing is filtered
+        """
+        return FilterPlan(
+            countries=countries,
+            devices=devices,
+            date_range=date_range,
+            country_col=COUNTRY_COL,
+            device_col=DEVICE_COL,
+            date_col=DATE_COL
+        ).to_expression()
+
+    def scan(self, columns: List[str], filter_expr: ds.Expression = None):
+        """
+        Iterate the record batches of the given columns matching a filter.
+
+        Args:
+            columns: Columns to read
+            filter_expr: Arrow filter expression
+
+        Yields:
+            pyarrow.RecordBatch
+        """
+        scanner = self.dataset.scanner(columns=columns, filter=filter_expr, batch_size=self.batch_size)
+        for batch in scanner.to_batches():
+            if batch.num_rows:
+                yield batch
+
+    def batches(
+        self,
+        columns: List[str],
+        countries: List[str] = None,
+        devices: List[str] = None,
+        date_range: tuple = None
+    ):
+        return self.scan(columns, self.build_filter(countries, devices, date_range))
+
+    def aggregate(
+        self,
+        group_by: List[str],
+        measures: Dict[str, Measure],
+        countries: List[str] = None,
+        devices: List[str] = None,
+        date_range: tuple = None
+    ) -> pd.DataFrame:
+        """
+        Aggregate sessions by the given dimensions.
+
+        Args:
+            group_by: Dimension columns to group by (empty list: grand total)
+            measures: Dict mapping output column names to measure specs
+            countries: Countries to include
+            devices: Devices to include
+            date_range: Tuple of (start_date, end_date)
+
+        Returns:
+            DataFrame with the group_by columns followed by one column per measure
+        """
+        group_by = list(group_by)
+        additive = self._additive_groups(measures)
+        distinct = {name: m for name, m in measures.items() if m[1] == 'nunique'}
+
+        columns = set(group_by)
+        for column, _, flag in measures.values():
+            columns.add(column)
+            if flag:
+                columns.add(flag)
+
+        # Partial aggregates per batch, merged every _COMPACT_EVERY batches
+        additive_partials = {flag: [] for flag in additive}
+        pair_partials = {name: [] for name in distinct}
+
+        for batch in self.scan(sorted(columns), self.build_filter(countries, devices, date_range)):
+            table = pa.Table.from_batches([batch])
+
+            for flag, aggregations in additive.items():
+                source = table.filter(pc.field(flag)) if flag else table
+                partials = additive_partials[flag]
+                partials.append(_decode_dictionaries(source.group_by(group_by).aggregate(aggregations)))
+                if len(partials) >= _COMPACT_EVERY:
+                    partials[:] = [_merge_additive(partials, group_by, aggregations)]
+
+            for name, (column, _, flag) in distinct.items():
+                source = table.filter(pc.field(flag)) if flag else table
+                partials = pair_partials[name]
+                partials.append(_decode_dictionaries(source.group_by(group_by + [column]).aggregate([])))
+                if len(partials) >= _COMPACT_EVERY:
+                    partials[:] = [_merge_pairs(partials, group_by + [column])]
+
+        return self._finalize(group_by, measures, additive, additive_partials, pair_partials)
+
+    @staticmethod
+    def _additive_groups(measures: Dict[str, Measure]) -> Dict[Optional[str], List[tuple]]:
+        """Group the Arrow aggregations of the additive measures by flag column."""
+        groups = {}
+        for name, (column, agg, flag) in measures.items():
+            if agg != 'nunique':
+                groups.setdefault(flag, {})[name] = (column, agg, flag)
+        return {flag: _additive_aggregations(group) for flag, group in groups.items()}
+
+    def _finalize(self, group_by, measures, additive, additive_partials, pair_partials) -> pd.DataFrame:
+        """Merge the partial aggregates and compute the final measure columns."""
+        frames = []
+
+        for flag, partials in additive_partials.items():
+            if not partials:
+                continue
+            merged = _merge_additive(partials, group_by, additive[flag]).to_pandas()
+            names = []
+            for name, (column, agg, measure_flag) in measures.items():
+                if agg == 'nunique' or measure_flag != flag:
+                    continue
+                if agg == 'mean':
+                    counts = merged[f"{column}_count"]
+                    merged[name] = merged[f"{column}_sum"] / counts.where(counts > 0)
+                else:
+                    merged[name] = merged[f"{column}_{agg}"]
+                names.append(name)
+            frames.append(merged[group_by + names])
+
+        for name, partials in pair_partials.items():
+            if not partials:
+                continue
+            column = measures[name][0]
+            pairs = _merge_pairs(partials, group_by + [column])
+            counts = pairs.group_by(group_by).aggregate([(column, 'count')]).to_pandas()
+            frames.append(counts.rename(columns={f"{column}_count": name}))
+
+        result = None
+        for frame in frames:
+            if result is None:
+                result = frame
+            else:
+                result = result.merge(frame, on=group_by, how='outer') if group_by else result.join(frame)
+        if result is None:
+            result = pd.DataFrame(columns=group_by) if group_by else pd.DataFrame(index=[0])
+
+        # Missing groups/measures mean no matching rows
+        for name, (_, agg, _) in measures.items():
+            if name not in result.columns:
+                result[name] = 0
+            elif agg != 'mean':
+                result[name] = result[name].fillna(0).astype('int64')
+
+        return result[group_by + list(measures)].reset_index(drop=True)
+
+
+# ============================================================
+# PROCESS-WIDE STORE
+# ============================================================
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_event_store() -> EventStore:
+    """Return the process-wide event store configured in DATA_CONFIG."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = EventStore(
+                    DATA_CONFIG["events_path"],
+                    batch_size=DATA_CONFIG["batch_size"],
+                    refresh_seconds=DATA_CONFIG["events_refresh_seconds"]
+                )
+    return _store
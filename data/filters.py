@@ -0,0 +1,268 @@
+"""
+Compiled filter plan.
+Combines every active dashboard filter into a single vectorized mask per table.
+Date-indexed tables (see index_by_date) are range-sliced by binary search instead.
+"""
+
+import time
+from datetime import timedelta
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# ============================================================
+# SORTED DATE INDEX
+# ============================================================
+
+def index_by_date(df: pd.DataFrame, date_col: str = 'Fecha') -> pd.DataFrame:
+    """
+    Prepare a date-bearing table for O(log n) range selection.
+    
+    The date column is typed as datetime64 and the rows are sorted by it (both
+    only when needed), then a DatetimeIndex mirroring the column is attached.
+    The index travels with the rows, so filtered or sliced copies stay valid.
+    
+    Args:
+        df: Table with a date column
+        date_col: Date column name
+        
+    Returns:
+        Date-indexed DataFrame (the date column is kept for charts)
+    """
+    column = df[date_col]
+    if not pd.api.types.is_datetime64_any_dtype(column.dtype):
+        df = df.assign(**{date_col: pd.to_datetime(column)})
+    if not df[date_col].is_monotonic_increasing:
+        df = df.sort_values(date_col, kind='stable')
+    df = df.set_axis(pd.DatetimeIndex(df[date_col].to_numpy()), axis=0)
+    df.attrs['date_index'] = date_col
+    return df
+
+
+def is_date_indexed(df: pd.DataFrame, date_col: str = 'Fecha') -> bool:
+    """True if the table was prepared with index_by_date and is still sorted."""
+    return (
+        df.attrs.get('date_index') == date_col
+        and isinstance(df.index, pd.DatetimeIndex)
+        and df.index.is_monotonic_increasing
+    )
+
+
+def slice_date_range(df: pd.DataFrame, start_date, end_date) -> pd.DataFrame:
+    """
+    Select a date range of a date-indexed table with two binary searches.
+    
+    Args:
+        df: Table prepared with index_by_date
+        start_date: Start date (inclusive)
+        end_date: End date (inclusive, whole day)
+        
+    Returns:
+        Positional slice of df (no mask, no data copy)
+    """
+    start = pd.Timestamp(start_date).normalize()
+    end = pd.Timestamp(end_date).normalize() + pd.Timedelta(days=1)
+    lower = df.index.searchsorted(start, side='left')
+    upper = df.index.searchsorted(end, side='left')
+    return df.iloc[lower:upper]
+
+
+# ============================================================
+# FILTER PLAN
+# ============================================================
+
+class FilterPlan:
+    """
+    Country, device and date predicates evaluated together in one pass.
+
+    No-op predicates (empty selections, selections covering every option,
+    columns missing from the table) are skipped, so an unfiltered table is
+    returned as-is without materializing a copy.
+    """
+
+    def __init__(
+        self,
+        countries: List[str] = None,
+        devices: List[str] = None,
+        date_range: tuple = None,
+        country_col: str = 'Pais',
+        device_col: str = 'Dispositivo',
+        date_col: str = 'Fecha'
+    ):
+        self.countries = list(countries) if countries else None
+        self.devices = list(devices) if devices else None
+        self.date_range = self._normalize_date_range(date_range)
+        self.country_col = country_col
+        self.device_col = device_col
+        self.date_col = date_col
+        self.stats = []
+
+    @classmethod
+    def from_filters(cls, filters: dict, options: dict = None, **columns) -> 'FilterPlan':
+        """
+        Build a plan from the dict returned by render_sidebar_filters.
+
+        Args:
+            filters: Dict with 'pais', 'dispositivo' and 'periodo' values
+            options: Dict with all available values per filter key; a selection
+                     covering every option is dropped as a no-op
+            **columns: Column name overrides (country_col, device_col, date_col)
+
+        Returns:
+            FilterPlan
+        """
+        options = options or {}
+
+        def selection(key):
+            selected = filters.get(key)
+            if not selected:
+                return None
+            if key in options and set(options[key]) <= set(selected):
+                return None
+            return list(selected)
+
+        return cls(
+            countries=selection('pais'),
+            devices=selection('dispositivo'),
+            date_range=filters.get('periodo'),
+            **columns
+        )
+
+    @staticmethod
+    def _normalize_date_range(date_range) -> Optional[tuple]:
+        """Return (start, end) as dates, or None unless both ends are set."""
+        if not date_range or len(date_range) != 2:
+            return None
+        return tuple(pd.Timestamp(d).date() for d in date_range)
+
+    @property
+    def is_noop(self) -> bool:
+        """True if the plan filters nothing."""
+        return self.countries is None and self.devices is None and self.date_range is None
+
+    def _predicates(self, df: pd.DataFrame, include_date: bool = True) -> list:
+        """Return the (name, function) predicates that actually filter this table."""
+        predicates = []
+        for name, col, values in (
+            ('country', self.country_col, self.countries),
+            ('device', self.device_col, self.devices),
+        ):
+            if values is None or col not in df.columns:
+                continue
+            column = df[col]
+            if isinstance(column.dtype, pd.CategoricalDtype) and set(column.cat.categories) <= set(values):
+                continue
+            predicates.append((name, lambda d, c=col, v=values: d[c].isin(v).to_numpy()))
+
+        if include_date and self.date_range is not None and self.date_col in df.columns:
+            predicates.append(('date', self._date_mask))
+        return predicates
+
+    def _date_mask(self, df: pd.DataFrame) -> np.ndarray:
+        """Boolean mask of rows inside the date range (both ends inclusive)."""
+        start, end = self.date_range
+        column = df[self.date_col]
+        if not pd.api.types.is_datetime64_any_dtype(column.dtype):
+            column = pd.to_datetime(column)
+        values = column.to_numpy()
+        lower = np.datetime64(start, 'D').astype(values.dtype)
+        upper = np.datetime64(end + timedelta(days=1), 'D').astype(values.dtype)
+        return (values >= lower) & (values < upper)
+
+    def _evaluate(self, df: pd.DataFrame, include_date: bool = True) -> tuple:
+        """Return (combined mask or None, names of the applied predicates)."""
+        combined = None
+        names = []
+        for name, predicate in self._predicates(df, include_date):
+            current = predicate(df)
+            if combined is None:
+                combined = np.array(current, dtype=bool)
+            else:
+                combined &= current
+            names.append(name)
+        return combined, names
+
+    def mask(self, df: pd.DataFrame) -> Optional[np.ndarray]:
+        """
+        Evaluate every active predicate into one boolean mask.
+
+        Args:
+            df: Table to evaluate
+
+        Returns:
+            Boolean NumPy array, or None if no predicate applies
+        """
+        return self._evaluate(df)[0]
+
+    def apply(self, df: pd.DataFrame, table: str = None) -> pd.DataFrame:
+        """
+        Filter a table with a single mask and record rows scanned vs kept.
+
+        Args:
+            df: Table to filter
+            table: Table name for the stats (optional)
+
+        Returns:
+            Filtered DataFrame (the same object if nothing is filtered)
+        """
+        started = time.perf_counter()
+        if self.date_range is not None and is_date_indexed(df, self.date_col):
+            # Binary-search the date range first, mask only the remaining rows
+            result = slice_date_range(df, *self.date_range)
+            mask, names = self._evaluate(result, include_date=False)
+            names.insert(0, 'date_slice')
+        else:
+            result = df
+            mask, names = self._evaluate(df)
+        if mask is not None and not mask.all():
+            result = result[mask]
+        self.stats.append({
+            'table': table,
+            'rows_scanned': len(df),
+            'rows_kept': len(result),
+            'predicates': names,
+            'seconds': time.perf_counter() - started,
+        })
+        return result
+
+    def to_expression(self):
+        """
+        Translate the plan to a pyarrow.dataset filter expression.
+
+        Returns:
+            Arrow expression, or None if the plan filters nothing
+        """
+        import pyarrow.dataset as ds
+
+        predicates = []
+        if self.countries is not None:
+            predicates.append(ds.field(self.country_col).isin(self.countries))
+        if self.devices is not None:
+            predicates.append(ds.field(self.device_col).isin(self.devices))
+        if self.date_range is not None:
+            start, end = self.date_range
+            predicates.append((ds.field(self.date_col) >= start) & (ds.field(self.date_col) <= end))
+
+        expression = None
+        for predicate in predicates:
+            expression = predicate if expression is None else expression & predicate
+        return expression
+
+    def report(self) -> pd.DataFrame:
+        """
+        Return the recorded stats as a DataFrame (one row per applied table).
+
+        Returns:
+            DataFrame with table, rows_scanned, rows_kept, selectivity, predicates, seconds
+        """
+        df = pd.DataFrame(self.stats, columns=['table', 'rows_scanned', 'rows_kept', 'predicates', 'seconds'])
+        df.insert(3, 'selectivity', df['rows_kept'] / df['rows_scanned'].where(df['rows_scanned'] > 0))
+        return df
+
+    def __repr__(self) -> str:
+        return (
+            f"FilterPlan(countries={self.countries}, devices={self.devices}, "
+            f"date_range={self.date_range})"
+        )
@@ -0,0 +1,157 @@
+"""
+Conversion funnel from per-user session sequences.
+
+A user enters the funnel at their first session matching the first step;
+every next step is reached by the user's earliest matching session at or
+after the previous step and, when the step has a conversion window, no
+later than window seconds after it.
+
+The sessions are streamed from the data source: only the first entry time
+per user and the sessions flagged for a later step are kept, and the steps
+are resolved with sorted-array operations (no per-user Python loop).
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .schema import TIMESTAMP_COL, USER_COL
+from .source import DataSource
+
+
+# Step spec: (name, flag column or None for any session, window in seconds or None)
+# The window of the first step is ignored.
+FunnelStep = Tuple[str, Optional[str], Optional[float]]
+
+# Partial entry tables accumulated before they are merged
+_COMPACT_EVERY = 64
+
+
+def steps_from_config(steps: List[dict]) -> List[FunnelStep]:
+    """
+    Convert FUNNEL_CONFIG["steps"] entries ({name, flag, window_hours}) to step specs.
+    """
+    return [
+        (
+            step['name'],
+            step.get('flag'),
+            step['window_hours'] * 3600 if step.get('window_hours') is not None else None
+        )
+        for step in steps
+    ]
+
+
+def _first_times(table: pa.Table) -> pa.Table:
+    """Return the (user, first timestamp) table of USER_COL / TIMESTAMP_COL rows."""
+    first = table.group_by(USER_COL).aggregate([(TIMESTAMP_COL, 'min')])
+    return first.select([USER_COL, f"{TIMESTAMP_COL}_min"]).rename_columns([USER_COL, TIMESTAMP_COL])
+
+
+def _next_step(
+    users: np.ndarray,
+    reached_at: np.ndarray,
+    event_users: np.ndarray,
+    event_times: np.ndarray,
+    window: Optional[float]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Resolve one step.
+
+    Args:
+        users: Sorted users that reached the previous step
+        reached_at: Time each of them reached it
+        event_users: Users of the sessions flagged for this step
+        event_times: Start times of those sessions
+        window: Maximum seconds after the previous step (None: no limit)
+
+    Returns:
+        Tuple (sorted users that reached this step, time they reached it)
+    """
+    if not len(users) or not len(event_users):
+        return users[:0], reached_at[:0]
+
+    position = np.searchsorted(users, event_users)
+    position = np.minimum(position, len(users) - 1)
+    previous = reached_at[position]
+    valid = (users[position] == event_users) & (event_times >= previous)
+    if window is not None:
+        valid &= event_times - previous <= window
+
+    candidates_users = event_users[valid]
+    candidates_times = event_times[valid]
+    order = np.lexsort((candidates_times, candidates_users))
+    next_users, first = np.unique(candidates_users[order], return_index=True)
+    return next_users, candidates_times[order][first]
+
+
+def compute_funnel(
+    source: DataSource,
+    steps: List[FunnelStep],
+    countries: List[str] = None,
+    devices: List[str] = None,
+    date_range: tuple = None
+) -> List[int]:
+    """
+    Count the users reaching every step of a funnel.
+
+    Args:
+        source: Data source to stream the sessions from
+        steps: Step specs, in funnel order (only the first step may have no flag)
+        countries: Countries to include
+        devices: Devices to include
+        date_range: Tuple of (start_date, end_date), both inclusive
+
+    Returns:
+        Number of users per step
+    """
+    if not steps:
+        return []
+    entry_flag = steps[0][1]
+    later_flags = [flag for _, flag, _ in steps[1:]]
+    if any(flag is None for flag in later_flags):
+        raise ValueError("Only the first funnel step can match every session")
+
+    flags = list(dict.fromkeys(([entry_flag] if entry_flag else []) + later_flags))
+    columns = [USER_COL, TIMESTAMP_COL] + flags
+
+    entry_partials = []
+    flagged = []
+    for batch in source.batches(columns, countries, devices, date_range):
+        table = pa.Table.from_batches([batch])
+        table = table.set_column(
+            table.schema.get_field_index(TIMESTAMP_COL), TIMESTAMP_COL, pc.cast(table[TIMESTAMP_COL], pa.int64())
+        )
+
+        entries = table.filter(pc.field(entry_flag)) if entry_flag else table
+        entry_partials.append(_first_times(entries))
+        if len(entry_partials) >= _COMPACT_EVERY:
+            entry_partials = [_first_times(pa.concat_tables(entry_partials))]
+
+        if later_flags:
+            any_flag = pc.field(later_flags[0])
+            for flag in later_flags[1:]:
+                any_flag = any_flag | pc.field(flag)
+            flagged.append(table.filter(any_flag))
+
+    if not entry_partials:
+        return [0] * len(steps)
+
+    entry = _first_times(pa.concat_tables(entry_partials)).sort_by(USER_COL)
+    users = entry[USER_COL].to_numpy()
+    reached_at = entry[TIMESTAMP_COL].to_numpy()
+    counts = [len(users)]
+
+    events = pa.concat_tables(flagged) if flagged else None
+    for _, flag, window in steps[1:]:
+        step_events = events.filter(pc.field(flag))
+        users, reached_at = _next_step(
+            users,
+            reached_at,
+            step_events[USER_COL].to_numpy(),
+            step_events[TIMESTAMP_COL].to_numpy(),
+            window
+        )
+        counts.append(len(users))
+    return counts
@@ -0,0 +1,37 @@
+"""
+Vectorized integer hashing.
+"""
+
+import numpy as np
+
+
+def splitmix64(values) -> np.ndarray:
+    """
+    Hash integers with the SplitMix64 finalizer (vectorized, wraps on overflow).
+
+    Args:
+        values: Integer array-like
+
+    Returns:
+        uint64 NumPy array of well-mixed hashes
+    """
+    with np.errstate(over='ignore'):
+        z = np.asarray(values).astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+def hash_to_unit(values, salt: int = 0) -> np.ndarray:
+    """
+    Map integers to deterministic pseudo-uniform floats in [0, 1).
+
+    Args:
+        values: Integer array-like
+        salt: Salt to derive independent streams from the same values
+
+    Returns:
+        float64 NumPy array
+    """
+    hashed = splitmix64(np.asarray(values).astype(np.uint64) ^ splitmix64(salt))
+    return (hashed >> np.uint64(11)).astype(np.float64) / float(1 << 53)
@@ -0,0 +1,129 @@
+"""
+Concurrent loading of independent data getters.
+
+Getters are dispatched on a bounded, process-wide thread pool. Every source
+has its own deadline and failures are captured per source, so one slow or
+broken source does not stall or break the others.
+"""
+
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Tuple
+
+from config.settings import LOADER_CONFIG
+
+
+# Source spec: (getter, keyword arguments)
+Source = Tuple[Callable, dict]
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the process-wide loader pool (created on first use)."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=LOADER_CONFIG["max_workers"],
+                    thread_name_prefix="dashboard-loader"
+                )
+    return _executor
+
+
+class LoadResult:
+    """
+    Values of a concurrent load, with the sources that failed or timed out.
+
+    Index it by source name to get a value; failed sources are listed in
+    errors (name -> exception) instead.
+    """
+
+    def __init__(self, values: Dict[str, Any], errors: Dict[str, BaseException], seconds: float):
+        self.values = values
+        self.errors = errors
+        self.seconds = seconds
+
+    @property
+    def ok(self) -> bool:
+        """True if every source loaded."""
+        return not self.errors
+
+    def __getitem__(self, name: str) -> Any:
+        return self.values[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.values
+
+    def __repr__(self) -> str:
+        return f"LoadResult(values={list(self.values)}, errors={list(self.errors)}, seconds={self.seconds:.3f})"
+
+
+class PendingLoad:
+    """Sources already dispatched to the pool; result() waits for them."""
+
+    def __init__(self, sources: Dict[str, Source], timeout: float = None, timeouts: Dict[str, float] = None):
+        default_timeout = LOADER_CONFIG["timeout_seconds"] if timeout is None else timeout
+        timeouts = timeouts or {}
+        executor = get_executor()
+
+        self.started = time.perf_counter()
+        self.deadlines = {}
+        self.futures = {}
+        for name, (getter, kwargs) in sources.items():
+            # One context copy per task: instrumentation keeps recording into the page run
+            context = contextvars.copy_context()
+            self.futures[name] = executor.submit(context.run, getter, **kwargs)
+            self.deadlines[name] = self.started + timeouts.get(name, default_timeout)
+
+    def result(self) -> LoadResult:
+        """
+        Wait for every source until its own deadline.
+
+        Returns:
+            LoadResult; a source past its deadline is reported as a TimeoutError
+            (its thread finishes in the background and the value is discarded)
+        """
+        values, errors = {}, {}
+        for name, future in self.futures.items():
+            try:
+                values[name] = future.result(timeout=max(0.0, self.deadlines[name] - time.perf_counter()))
+            except FutureTimeoutError:
+                errors[name] = TimeoutError(f"{name} did not finish in time")
+            except Exception as exc:
+                errors[name] = exc
+        return LoadResult(values, errors, time.perf_counter() - self.started)
+
+
+def start_load(sources: Dict[str, Source], timeout: float = None, timeouts: Dict[str, float] = None) -> PendingLoad:
+    """
+    Dispatch independent getters concurrently without waiting for them.
+
+    Args:
+        sources: Dict mapping source name to (getter, keyword arguments)
+        timeout: Seconds each source may take (default: LOADER_CONFIG)
+        timeouts: Per-source overrides of timeout
+
+    Returns:
+        PendingLoad
+    """
+    return PendingLoad(sources, timeout=timeout, timeouts=timeouts)
+
+
+def load_sources(sources: Dict[str, Source], timeout: float = None, timeouts: Dict[str, float] = None) -> LoadResult:
+    """
+    Run independent getters concurrently and return all their results together.
+
+    Args:
+        sources: Dict mapping source name to (getter, keyword arguments)
+        timeout: Seconds each source may take (default: LOADER_CONFIG)
+        timeouts: Per-source overrides of timeout
+
+    Returns:
+        LoadResult
+    """
+    return start_load(sources, timeout=timeout, timeouts=timeouts).result()
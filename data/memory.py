@@ -0,0 +1,147 @@
+"""
+Compact dtypes and memory accounting of the in-process DataFrames.
+
+Dimension columns are held as categoricals and integer columns as the
+narrowest signed type that holds their values; the reports break the memory
+down per table, per column and per cached getter result, to size the
+process against a RAM budget (CACHE_CONFIG["max_bytes"] for the cache).
+"""
+
+import functools
+from typing import Callable, Dict, Iterable
+
+import numpy as np
+import pandas as pd
+
+from cache import TTLCache, estimate_size
+from .cache import get_data_cache
+from .schema import CATEGORICAL_COLUMNS
+
+
+# ============================================================
+# COMPACT DTYPES
+# ============================================================
+
+def compact_frame(df: pd.DataFrame, categorical: Iterable[str] = CATEGORICAL_COLUMNS) -> pd.DataFrame:
+    """
+    Return a DataFrame with compact dtypes.
+
+    Args:
+        df: DataFrame to compact (not modified)
+        categorical: Columns to hold as categoricals (unused categories are dropped)
+
+    Returns:
+        DataFrame with the same values, index and attrs
+    """
+    columns = {}
+    for name in df.columns:
+        column = df[name]
+        if name in categorical:
+            column = column.astype('category') if column.dtype != 'category' else column
+            column = column.cat.remove_unused_categories()
+        elif pd.api.types.is_integer_dtype(column.dtype) and not pd.api.types.is_extension_array_dtype(column.dtype):
+            column = pd.to_numeric(column, downcast='integer') if len(column) else column.astype(np.int8)
+        columns[name] = column
+    result = pd.DataFrame(columns, index=df.index)
+    # Keep the frame metadata (e.g. the date index marker of filters.index_by_date)
+    result.attrs = dict(df.attrs)
+    return result
+
+
+def compact_result(func: Callable) -> Callable:
+    """Decorate a getter so that the DataFrames it returns have compact dtypes."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        result = func(*args, **kwargs)
+        return compact_frame(result) if isinstance(result, pd.DataFrame) else result
+
+    return wrapper
+
+
+# ============================================================
+# MEMORY REPORTS
+# ============================================================
+
+def column_report(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Memory of every column of a DataFrame.
+
+    Returns:
+        DataFrame with Columna, Tipo and Bytes, largest first (the index as 'Index')
+    """
+    usage = df.memory_usage(index=True, deep=True)
+    dtypes = {'Index': str(df.index.dtype), **{name: str(dtype) for name, dtype in df.dtypes.items()}}
+    return pd.DataFrame({
+        'Columna': usage.index.astype(str),
+        'Tipo': [dtypes[name] for name in usage.index],
+        'Bytes': usage.to_numpy(),
+    }).sort_values('Bytes', ascending=False, ignore_index=True)
+
+
+def table_report(tables: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Memory of a set of DataFrames.
+
+    Args:
+        tables: {table name: DataFrame}
+
+    Returns:
+        DataFrame with Tabla, Filas, Columnas and Bytes, largest first
+    """
+    return pd.DataFrame({
+        'Tabla': list(tables),
+        'Filas': [len(df) for df in tables.values()],
+        'Columnas': [df.shape[1] for df in tables.values()],
+        'Bytes': [estimate_size(df) for df in tables.values()],
+    }).sort_values('Bytes', ascending=False, ignore_index=True)
+
+
+def cache_report(cache: TTLCache = None) -> pd.DataFrame:
+    """
+    Memory of every live entry of a getter cache.
+
+    Args:
+        cache: Cache to inspect (default: process-wide data cache)
+
+    Returns:
+        DataFrame with Entrada (getter and filters), Tipo, Filas and Bytes, largest first
+    """
+    rows = []
+    for key, nbytes, value in (cache or get_data_cache()).items():
+        filters = ', '.join(f"{name}={arg!r}" for name, arg in key[2:] if arg is not None)
+        rows.append({
+            'Entrada': f"{key[1]}({filters})",
+            'Tipo': type(value).__name__,
+            'Filas': len(value) if isinstance(value, (pd.DataFrame, pd.Series)) else None,
+            'Bytes': nbytes,
+        })
+    report = pd.DataFrame(rows, columns=['Entrada', 'Tipo', 'Filas', 'Bytes'])
+    return report.sort_values('Bytes', ascending=False, ignore_index=True)
+
+
+def store_tables() -> Dict[str, pd.DataFrame]:
+    """
+    DataFrames currently loaded by the rollup store and the cube.
+
+    Only already loaded tables are reported (nothing is read from disk).
+
+    Returns:
+        {table name: DataFrame}
+    """
+    # Imported here: the cube and rollup modules are only loaded with an event store / cube
+    from .cube import get_cube_store
+    from .rollups import SKETCHES, get_rollup_store
+
+    tables = {}
+    for name, frame in list(get_rollup_store()._frames.items()):
+        if name == SKETCHES:
+            keys, registers = frame
+            tables['rollups/sketches'] = keys
+            tables['rollups/sketches/registros'] = pd.DataFrame(registers, copy=False)
+        else:
+            tables[f'rollups/{name}'] = frame
+    cube = get_cube_store()._cube
+    if cube is not None:
+        tables['cube'] = cube
+    return tables
@@ -1,16 +1,52 @@
 """
 Mock data for the dashboard.
 In production, these functions would be replaced with database queries or APIs.
+
+When the configured data source (see source.py: Parquet event store or
+SQLite) has data, every getter computes its numbers from it; otherwise the
+hardcoded mock values are returned.
+Getter results are memoized per filter combination (see cache.py), with
+categorical dimensions and narrow integer counts (see memory.py).
 """
 
 import pandas as pd
 from typing import List, Optional
 from datetime import date
 
+from config.settings import DATA_CONFIG, FUNNEL_CONFIG
+from monitoring.instrumentation import instrumented
+
+from .cache import cached_getter
+from .event_store import EventStore
+from .source import get_data_source
+from .filters import FilterPlan, index_by_date
+from .funnel import compute_funnel, steps_from_config
+from .memory import compact_result
+from .rollups import BUCKET_COL, SESSION_MEASURES as ROLLUP_SESSION_MEASURES, get_rollup_store
+from .schema import (
+    DATE_COL,
+    USER_COL,
+    COUNTRY_COL,
+    DEVICE_COL,
+    USER_TYPE_COL,
+    SEGMENT_COL,
+    SOURCE_COL,
+    CONCEPT_COL,
+    CATEGORY_COL,
+    INTENT_COL,
+    REGISTER_COL,
+    BOUNCE_COL,
+    DURATION_COL,
+    ENGAGEMENT_COL,
+    COUNTRY_ISO
+)
+
 
 # ============================================================
 # FILTERING FUNCTIONS
 # ============================================================
+# Single-predicate shortcuts over FilterPlan (see filters.py), which
+# combines several filters into one mask.
 
 def filter_by_country(df: pd.DataFrame, countries: List[str], country_col: str = 'Pais') -> pd.DataFrame:
     """
@@ -24,9 +60,7 @@ def filter_by_country(df: pd.DataFrame, countries: List[str], country_col: str =
     Returns:
         Filtered DataFrame
     """
-    if not countries or country_col not in df.columns:
-        return df
-    return df[df[country_col].isin(countries)]
+    return FilterPlan(countries=countries, country_col=country_col).apply(df)
 
 
 def filter_by_device(df: pd.DataFrame, devices: List[str], device_col: str = 'Dispositivo') -> pd.DataFrame:
@@ -41,9 +75,7 @@ def filter_by_device(df: pd.DataFrame, devices: List[str], device_col: str = 'Di
     Returns:
         Filtered DataFrame
     """
-    if not devices or device_col not in df.columns:
-        return df
-    return df[df[device_col].isin(devices)]
+    return FilterPlan(devices=devices, device_col=device_col).apply(df)
 
 
 def filter_by_date_range(df: pd.DataFrame, start_date: date, end_date: date, date_col: str = 'Fecha') -> pd.DataFrame:
@@ -59,13 +91,7 @@ def filter_by_date_range(df: pd.DataFrame, start_date: date, end_date: date, dat
     Returns:
         Filtered DataFrame
     """
-    if date_col not in df.columns:
-        return df
-    
-    df_copy = df.copy()
-    df_copy[date_col] = pd.to_datetime(df_copy[date_col])
-    
-    return df_copy[(df_copy[date_col].dt.date >= start_date) & (df_copy[date_col].dt.date <= end_date)]
+    return FilterPlan(date_range=(start_date, end_date), date_col=date_col).apply(df)
 
 
 def filter_top_n(df: pd.DataFrame, n: int, column: str) -> pd.DataFrame:
@@ -85,20 +111,133 @@ def filter_top_n(df: pd.DataFrame, n: int, column: str) -> pd.DataFrame:
     return df.nlargest(n, column)
 
 
+# ============================================================
+# DATA SOURCE HELPERS
+# ============================================================
+
+# Distinct users, users with intention and registered users
+USER_MEASURES = {
+    'usuarios': (USER_COL, 'nunique', None),
+    'intencion': (USER_COL, 'nunique', INTENT_COL),
+    'registro': (USER_COL, 'nunique', REGISTER_COL),
+}
+
+
+# Cube measures of the USER_MEASURES keys
+CUBE_USER_MEASURES = {
+    'usuarios': 'usuarios',
+    'intencion': 'usuarios_intencion',
+    'registro': 'usuarios_registro',
+}
+
+# KPI cards derived from distinct-user counts (estimates when answered from the sketches)
+_ESTIMATED_KPIS = [
+    'Tasa de Registro',
+    'Usuarios con Intención',
+    'Usuarios Registrados',
+    'Usuarios Totales',
+    'Usuarios No Registrados',
+]
+
+
+def _ready_cube():
+    """Return the OLAP cube if it is enabled and built from the current data, else None."""
+    if not DATA_CONFIG["cube"]:
+        return None
+    from .cube import get_cube_store
+    cube = get_cube_store()
+    return cube if cube.ready() else None
+
+
+def _ready_rollups():
+    """Return the rollups of the event store if they are current, else None (a refresh runs meanwhile)."""
+    source = get_data_source()
+    if not (isinstance(source, EventStore) and source.available):
+        return None
+    rollups = get_rollup_store()
+    return rollups if rollups.ready() else None
+
+
+def _store_breakdown(
+    dimension: str,
+    columns: dict,
+    countries: List[str] = None,
+    devices: List[str] = None,
+    date_range: tuple = None
+) -> pd.DataFrame:
+    """
+    Aggregate distinct users by one dimension from the cube, or from the
+    data source while the cube is not ready.
+    
+    Args:
+        dimension: Dimension column to group by
+        columns: Dict mapping USER_MEASURES keys to output column names
+        countries: Countries to include
+        devices: Devices to include
+        date_range: Tuple of (start_date, end_date)
+        
+    Returns:
+        DataFrame with the dimension column and the requested measures,
+        sorted by the first measure (descending)
+    """
+    cube = _ready_cube()
+    if cube is not None:
+        df = cube.slice(
+            dimension,
+            [CUBE_USER_MEASURES[key] for key in columns],
+            countries=countries,
+            devices=devices,
+            date_range=date_range
+        )
+        df = df.rename(columns={CUBE_USER_MEASURES[key]: name for key, name in columns.items()})
+    else:
+        measures = {name: USER_MEASURES[key] for key, name in columns.items()}
+        df = get_data_source().aggregate(
+            [dimension], measures, countries=countries, devices=devices, date_range=date_range
+        )
+    return df.sort_values(list(columns.values())[0], ascending=False, ignore_index=True)
+
+
+def _format_seconds(seconds: float) -> str:
+    """Format a number of seconds as HH:MM:SS."""
+    seconds = int(round(seconds))
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
 # ============================================================
 # CONVERSION FUNNEL
 # ============================================================
 
-def get_funnel_data(countries: List[str] = None) -> dict:
+@instrumented('data')
+@cached_getter()
+def get_funnel_data(
+    countries: List[str] = None,
+    devices: List[str] = None,
+    date_range: tuple = None
+) -> dict:
     """
     Return conversion funnel data.
     
+    With a data source, the steps of FUNNEL_CONFIG are computed from the
+    per-user session sequences (see data/funnel.py).
+    
     Args:
         countries: List of countries to filter (mock: adjusts values proportionally)
+        devices: List of devices to filter
+        date_range: Tuple of (start_date, end_date)
     
     Returns:
         dict with 'Etapa' and 'Cantidad'
     """
+    source = get_data_source()
+    if source.available:
+        steps = steps_from_config(FUNNEL_CONFIG["steps"])
+        counts = compute_funnel(source, steps, countries=countries, devices=devices, date_range=date_range)
+        return {
+            'Etapa': [name for name, _, _ in steps],
+            'Cantidad': counts
+        }
+    
     # Base data
     base_data = {
         'Etapa': ['Usuarios Totales', 'Intención de Registro', 'Registro Finalizado'],
@@ -118,6 +257,9 @@ def get_funnel_data(countries: List[str] = None) -> dict:
 # TEMPORAL EVOLUTION
 # ============================================================
 
+@instrumented('data')
+@cached_getter()
+@compact_result
 def get_evolution_data(
     start_date: str = "2026-01-01", 
     end_date: str = "2026-01-31",
@@ -127,13 +269,34 @@ def get_evolution_data(
     Return temporal evolution data for users.
     
     Args:
-        start_date: Default start date
-        end_date: Default end date
+        start_date: Default start date (mock data only)
+        end_date: Default end date (mock data only)
         date_range: Tuple of (start_date, end_date) from filter
+            (event store: None means the whole history)
         
     Returns:
-        DataFrame with Fecha, Intención de Registro, Registro
+        Date-indexed DataFrame (see index_by_date) with Fecha,
+        Intención de Registro, Registro
     """
+    source = get_data_source()
+    rollups = _ready_rollups()
+    if rollups is not None:
+        # Answered from the daily rollups, which only ingest new partitions
+        df = rollups.query('day', date_range=date_range)
+        df = df.rename(columns={
+            BUCKET_COL: 'Fecha',
+            'usuarios_intencion': 'Intención de Registro',
+            'usuarios_registro': 'Registro'
+        })
+        return index_by_date(df[['Fecha', 'Intención de Registro', 'Registro']], 'Fecha')
+    if source.available:
+        df = source.aggregate(
+            [DATE_COL],
+            {'Intención de Registro': USER_MEASURES['intencion'], 'Registro': USER_MEASURES['registro']},
+            date_range=date_range if date_range and len(date_range) == 2 else None
+        )
+        return index_by_date(df.rename(columns={DATE_COL: 'Fecha'}), 'Fecha')
+    
     fechas = pd.date_range(start=start_date, end=end_date)
     
     # Mock data
@@ -145,11 +308,11 @@ def get_evolution_data(
                 410, 380, 290, 520, 580, 450, 390, 620, 710, 550,
                 480, 780, 890, 720, 610, 920, 1050, 880, 750, 1120, 1280]
     
-    df = pd.DataFrame({
+    df = index_by_date(pd.DataFrame({
         'Fecha': fechas[:len(intencion)],
         'Intención de Registro': intencion,
         'Registro': registro
-    })
+    }))
     
     # Apply date filter if exists
     if date_range and len(date_range) == 2:
@@ -162,6 +325,9 @@ def get_evolution_data(
 # DEVICE DATA
 # ============================================================
 
+@instrumented('data')
+@cached_getter()
+@compact_result
 def get_device_data(devices: List[str] = None) -> pd.DataFrame:
     """
     Return user data by device.
@@ -172,6 +338,11 @@ def get_device_data(devices: List[str] = None) -> pd.DataFrame:
     Returns:
         DataFrame with Dispositivo, Registrado, Con Intención
     """
+    if get_data_source().available:
+        return _store_breakdown(
+            DEVICE_COL, {'registro': 'Registrado', 'intencion': 'Con Intención'}, devices=devices
+        )
+    
     df = pd.DataFrame({
         'Dispositivo': ['Mobile', 'Desktop', 'Tablet', 'Smart TV'],
         'Registrado': [20, 12, 12, 8],
@@ -185,6 +356,9 @@ def get_device_data(devices: List[str] = None) -> pd.DataFrame:
 # SESSION HISTORY DATA
 # ============================================================
 
+@instrumented('data')
+@cached_getter()
+@compact_result
 def get_session_history_data() -> pd.DataFrame:
     """
     Return data by user type (new vs returning).
@@ -192,6 +366,9 @@ def get_session_history_data() -> pd.DataFrame:
     Returns:
         DataFrame with Tipo Usuario, Registrado, Con Intención
     """
+    if get_data_source().available:
+        return _store_breakdown(USER_TYPE_COL, {'registro': 'Registrado', 'intencion': 'Con Intención'})
+    
     return pd.DataFrame({
         'Tipo Usuario': ['Recurrente', 'Nuevo'],
         'Registrado': [20, 56],
@@ -203,6 +380,9 @@ def get_session_history_data() -> pd.DataFrame:
 # COUNTRY DATA
 # ============================================================
 
+@instrumented('data')
+@cached_getter()
+@compact_result
 def get_country_data(countries: List[str] = None) -> pd.DataFrame:
     """
     Return user data by country.
@@ -213,6 +393,13 @@ def get_country_data(countries: List[str] = None) -> pd.DataFrame:
     Returns:
         DataFrame with Pais, ISO, Intención, Registros
     """
+    if get_data_source().available:
+        df = _store_breakdown(
+            COUNTRY_COL, {'intencion': 'Intención', 'registro': 'Registros'}, countries=countries
+        )
+        df.insert(1, 'ISO', df[COUNTRY_COL].map(COUNTRY_ISO))
+        return df
+    
     df = pd.DataFrame({
         'Pais': ['Argentina', 'México', 'España', 'Colombia', 'Chile', 'Perú'],
         'ISO': ['ARG', 'MEX', 'ESP', 'COL', 'CHL', 'PER'],
@@ -227,6 +414,9 @@ def get_country_data(countries: List[str] = None) -> pd.DataFrame:
 # CONSUMPTION SEGMENT DATA
 # ============================================================
 
+@instrumented('data')
+@cached_getter()
+@compact_result
 def get_segment_data() -> pd.DataFrame:
     """
     Return data by consumption segment.
@@ -234,6 +424,9 @@ def get_segment_data() -> pd.DataFrame:
     Returns:
         DataFrame with Segmento Consumo, Intención, Registrados
     """
+    if get_data_source().available:
+        return _store_breakdown(SEGMENT_COL, {'intencion': 'Intención', 'registro': 'Registrados'})
+    
     return pd.DataFrame({
         'Segmento Consumo': ['0-5 Light', '6-10 Medium', '11-20 Heavy', '21+ Super Heavy'],
         'Intención': [1507, 1127, 263, 450],
@@ -245,6 +438,9 @@ def get_segment_data() -> pd.DataFrame:
 # SOURCE / MEDIUM DATA
 # ============================================================
 
+@instrumented('data')
+@cached_getter()
+@compact_result
 def get_source_medium_data() -> pd.DataFrame:
     """
     Return data by traffic source/medium.
@@ -252,6 +448,12 @@ def get_source_medium_data() -> pd.DataFrame:
     Returns:
         DataFrame with Fuente / Medio, Usuarios, Intención de Registro, Registrados
     """
+    if get_data_source().available:
+        return _store_breakdown(
+            SOURCE_COL,
+            {'usuarios': 'Usuarios', 'intencion': 'Intención de Registro', 'registro': 'Registrados'}
+        )
+    
     return pd.DataFrame({
         'Fuente / Medio': [
             '(direct) / (none)',
@@ -305,6 +507,9 @@ def get_source_medium_data() -> pd.DataFrame:
 # CONCEPT DATA (WATTSON)
 # ============================================================
 
+@instrumented('data')
+@cached_getter()
+@compact_result
 def get_concepts_data() -> pd.DataFrame:
     """
     Return data by Wattson model concept.
@@ -312,6 +517,11 @@ def get_concepts_data() -> pd.DataFrame:
     Returns:
         DataFrame with Concepto, Usuarios con Intención, Usuarios Registrados
     """
+    if get_data_source().available:
+        return _store_breakdown(
+            CONCEPT_COL, {'intencion': 'Usuarios con Intención', 'registro': 'Usuarios Registrados'}
+        )
+    
     return pd.DataFrame({
         'Concepto': [
             'Inflación', 'Dólar', 'Elecciones', 'COVID-19', 'Jubilaciones',
@@ -340,6 +550,9 @@ def get_concepts_data() -> pd.DataFrame:
 # WATTSON CATEGORY DATA
 # ============================================================
 
+@instrumented('data')
+@cached_getter()
+@compact_result
 def get_wattson_category_data() -> pd.DataFrame:
     """
     Return data by Wattson model category.
@@ -347,6 +560,11 @@ def get_wattson_category_data() -> pd.DataFrame:
     Returns:
         DataFrame with Categoría Wattson, Usuarios con Intención, Usuarios Registrados
     """
+    if get_data_source().available:
+        return _store_breakdown(
+            CATEGORY_COL, {'intencion': 'Usuarios con Intención', 'registro': 'Usuarios Registrados'}
+        )
+    
     return pd.DataFrame({
         'Categoría Wattson': [
             'Economía', 'Salud', 'Educación', 'Cultura', 'Deportes', 
@@ -373,6 +591,8 @@ def get_wattson_category_data() -> pd.DataFrame:
 # KPI DATA
 # ============================================================
 
+@instrumented('data')
+@cached_getter()
 def get_kpi_data(countries: List[str] = None) -> dict:
     """
     Return main KPI data.
@@ -381,9 +601,59 @@ def get_kpi_data(countries: List[str] = None) -> dict:
         countries: List of countries (mock: adjusts values)
     
     Returns:
-        dict with dashboard KPIs
+        dict with dashboard KPIs (exact from the cube for all countries or
+        one country; for several countries, sketch estimates shown with a
+        '≈' prefix, see RollupStore.distinct_users)
     """
 
+    source = get_data_source()
+    # Cube cells of several countries add up their users (a user counted once per
+    # country), so the cube only answers unions it holds exactly
+    exact_cube = not countries or len(countries) == 1
+    cube = _ready_cube() if source.available and exact_cube else None
+    rollups = _ready_rollups() if source.available and not exact_cube else None
+    if cube is not None:
+        cells = cube.slice(None, countries=countries).iloc[0]
+        totals = pd.Series({
+            'usuarios': cells['usuarios'],
+            'intencion': cells['usuarios_intencion'],
+            'registro': cells['usuarios_registro'],
+            **_session_kpis(cells),
+        })
+    elif rollups is not None:
+        # Session KPIs from the day rollups of the (sessionized) event store and the
+        # multi-country distinct users merged from the daily sketches (approximate)
+        cells = rollups.query('day', countries=countries)[ROLLUP_SESSION_MEASURES].sum()
+        users = rollups.distinct_users(countries=countries)
+        totals = pd.Series({
+            'usuarios': round(users['usuarios']),
+            'intencion': round(users['usuarios_intencion']),
+            'registro': round(users['usuarios_registro']),
+            **_session_kpis(cells),
+        })
+    elif source.available:
+        totals = source.aggregate([], {
+            **USER_MEASURES,
+            'sesiones_intencion': (INTENT_COL, 'sum', None),
+            'pct_rebote': (BOUNCE_COL, 'mean', None),
+            'duracion_media': (DURATION_COL, 'mean', None),
+            'interaccion_media': (ENGAGEMENT_COL, 'mean', None),
+        }, countries=countries).iloc[0].fillna(0)
+    
+    if source.available:
+        kpis = {
+            'sesiones_intencion': int(totals['sesiones_intencion']),
+            'pct_rebote': float(totals['pct_rebote']) * 100,
+            'duracion_media': _format_seconds(totals['duracion_media']),
+            'interaccion_media': _format_seconds(totals['interaccion_media']),
+            'tasa_registro': totals['registro'] / totals['intencion'] * 100 if totals['intencion'] else 0.0,
+            'usuarios_con_intencion': int(totals['intencion']),
+            'usuarios_registrados': int(totals['registro']),
+            'usuarios_totales': int(totals['usuarios']),
+            'usuarios_no_registrados': int(totals['usuarios'] - totals['registro']),
+        }
+        return _format_kpis(kpis, estimated=rollups is not None)
+    
     # Base values
     kpis = {
         'sesiones_intencion': 6650,
@@ -403,8 +673,42 @@ def get_kpi_data(countries: List[str] = None) -> dict:
         ratio = len(countries) / len(all_countries)
         kpis['sesiones_intencion'] = int(kpis['sesiones_intencion'] * ratio)
     
-    # Format for display
+    return _format_kpis(kpis)
+
+
+def _session_kpis(cells: pd.Series) -> dict:
+    """
+    Derive the session KPIs from additive sums (rollup or cube cells).
+
+    Args:
+        cells: Series with sesiones, sesiones_intencion, rebotes, duracion and interaccion
+
+    Returns:
+        dict with sesiones_intencion, pct_rebote (ratio), duracion_media and
+        interaccion_media (seconds)
+    """
+    sessions = cells['sesiones']
     return {
+        'sesiones_intencion': cells['sesiones_intencion'],
+        'pct_rebote': cells['rebotes'] / sessions if sessions else 0.0,
+        'duracion_media': cells['duracion'] / sessions if sessions else 0.0,
+        'interaccion_media': cells['interaccion'] / sessions if sessions else 0.0,
+    }
+
+
+def _format_kpis(kpis: dict, estimated: bool = False) -> dict:
+    """
+    Format raw KPI values for display.
+    
+    Args:
+        kpis: Dict with raw KPI values
+        estimated: The user counts are estimates (marked with '≈', so they
+            are not mistaken for the exact counts of the funnel)
+    
+    Returns:
+        dict with display labels and formatted values
+    """
+    formatted = {
         'Sesiones con Intención': f"{kpis['sesiones_intencion']:,}".replace(',', '.'),
         '% Rebote': f"{kpis['pct_rebote']:.1f}%".replace('.', ','),
         'Duración Media': kpis['duracion_media'],
@@ -415,3 +719,6 @@ def get_kpi_data(countries: List[str] = None) -> dict:
         'Usuarios Totales': f"{kpis['usuarios_totales']:,}".replace(',', '.'),
         'Usuarios No Registrados': f"{kpis['usuarios_no_registrados']:,}".replace(',', '.'),
     }
+    if estimated:
+        formatted.update({title: f"≈ {formatted[title]}" for title in _ESTIMATED_KPIS})
+    return formatted
@@ -0,0 +1,540 @@
+"""
+Append-only rollups of the event store.
+
+Daily and hourly session counts, session KPI sums (bounces, duration,
+engagement) and intention / registration counts per Pais and Dispositivo,
+plus daily HyperLogLog sketches of distinct users (see sketches.py),
+ingested one day partition at a time. A manifest (watermarks) records which
+partition files were rolled up, so a refresh only reads new or changed days.
+
+Usage:
+    python -m data.rollups            # ingest new partitions
+    python -m data.rollups --rebuild  # drop the rollups and ingest everything
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from config.settings import DATA_CONFIG
+from .memory import compact_frame
+from .sketches import DEFAULT_PRECISION, build_sketches, estimate, relative_error
+from .schema import (
+    DATE_COL,
+    TIMESTAMP_COL,
+    USER_COL,
+    COUNTRY_COL,
+    DEVICE_COL,
+    INTENT_COL,
+    REGISTER_COL,
+    BOUNCE_COL,
+    DURATION_COL,
+    ENGAGEMENT_COL
+)
+
+
+# Dimension value of the rows that aggregate every value of that dimension
+ALL = '*'
+
+# Bucket column of the rollup tables (start of the day / hour)
+BUCKET_COL = 'periodo'
+
+GRAINS = ('day', 'hour')
+
+# Additive measures: sessions, sessions with intention / registration, bounced
+# sessions and the sums of session duration and engagement (seconds)
+SESSION_MEASURES = ['sesiones', 'sesiones_intencion', 'sesiones_registro', 'rebotes', 'duracion', 'interaccion']
+
+# Session columns read from the event store
+_COLUMNS = [
+    TIMESTAMP_COL, USER_COL, COUNTRY_COL, DEVICE_COL, INTENT_COL, REGISTER_COL, BOUNCE_COL, DURATION_COL, ENGAGEMENT_COL
+]
+
+# Distinct users; exact per row, so they are only summed across rows of a filtered dimension
+USER_MEASURES = ['usuarios_intencion', 'usuarios_registro']
+
+ROLLUP_SCHEMA = pa.schema(
+    [(BUCKET_COL, pa.timestamp('s')), (COUNTRY_COL, pa.string()), (DEVICE_COL, pa.string())]
+    + [(name, pa.int64()) for name in SESSION_MEASURES + USER_MEASURES]
+)
+
+# Grouping sets rolled up per bucket; missing dimensions are stored as ALL
+_GROUPING_SETS = [[COUNTRY_COL, DEVICE_COL], [COUNTRY_COL], [DEVICE_COL], []]
+
+# Distinct-user sketches, one per day x Pais x Dispositivo cell and measure
+SKETCHES = 'sketches'
+SKETCH_MEASURES = ['usuarios', 'usuarios_intencion', 'usuarios_registro']
+MEASURE_COL = 'medida'
+REGISTERS_COL = 'registros'
+
+_MANIFEST = '_manifest.json'
+
+# Layout of the rollup files; a store written with another version is ingested again
+_FORMAT_VERSION = 2
+
+
+# ============================================================
+# ROLLUP OF ONE PARTITION
+# ============================================================
+
+def _partition_signature(directory: Path) -> Dict[str, list]:
+    """Return {file name: [size, mtime_ns]} of the data files of a partition."""
+    signature = {}
+    for file in sorted(directory.iterdir()):
+        if file.is_file() and not file.name.startswith(('.', '_')):
+            stat = file.stat()
+            signature[file.name] = [stat.st_size, stat.st_mtime_ns]
+    return signature
+
+
+def rollup_partition(table: pa.Table, grain: str) -> pa.Table:
+    """
+    Roll up the sessions of one day.
+
+    Args:
+        table: Sessions with the _COLUMNS columns
+        grain: 'day' or 'hour'
+
+    Returns:
+        Arrow table with ROLLUP_SCHEMA, one row per bucket and grouping set
+    """
+    unit = 'day' if grain == 'day' else 'hour'
+    table = table.select(_COLUMNS)
+    table = pa.table({
+        BUCKET_COL: pc.floor_temporal(table[TIMESTAMP_COL], unit=unit),
+        USER_COL: table[USER_COL],
+        COUNTRY_COL: pc.cast(table[COUNTRY_COL], pa.string()),
+        DEVICE_COL: pc.cast(table[DEVICE_COL], pa.string()),
+        INTENT_COL: pc.cast(table[INTENT_COL], pa.int64()),
+        REGISTER_COL: pc.cast(table[REGISTER_COL], pa.int64()),
+        BOUNCE_COL: pc.cast(table[BOUNCE_COL], pa.int64()),
+        DURATION_COL: pc.cast(table[DURATION_COL], pa.int64()),
+        ENGAGEMENT_COL: pc.cast(table[ENGAGEMENT_COL], pa.int64()),
+    })
+    intent = table.filter(pc.field(INTENT_COL) > 0)
+    register = table.filter(pc.field(REGISTER_COL) > 0)
+
+    frames = []
+    for dimensions in _GROUPING_SETS:
+        keys = [BUCKET_COL] + dimensions
+        sessions = table.group_by(keys).aggregate(
+            [(USER_COL, 'count')]
+            + [(column, 'sum') for column in (INTENT_COL, REGISTER_COL, BOUNCE_COL, DURATION_COL, ENGAGEMENT_COL)]
+        ).to_pandas()
+        sessions.columns = keys + SESSION_MEASURES
+        for name, source in zip(USER_MEASURES, (intent, register)):
+            users = source.group_by(keys).aggregate([(USER_COL, 'count_distinct')]).to_pandas()
+            users.columns = keys + [name]
+            sessions = sessions.merge(users, on=keys, how='left')
+        for dimension in (COUNTRY_COL, DEVICE_COL):
+            if dimension not in dimensions:
+                sessions[dimension] = ALL
+        frames.append(sessions)
+
+    result = pd.concat(frames, ignore_index=True)
+    result[USER_MEASURES] = result[USER_MEASURES].fillna(0)
+    return pa.Table.from_pandas(result[ROLLUP_SCHEMA.names], schema=ROLLUP_SCHEMA, preserve_index=False)
+
+
+def sketch_partition(table: pa.Table, precision: int = DEFAULT_PRECISION) -> pa.Table:
+    """
+    Build the distinct-user sketches of one day.
+
+    Args:
+        table: Sessions with TIMESTAMP_COL, USER_COL, COUNTRY_COL, DEVICE_COL and the flags
+        precision: Sketch precision (2^precision registers per sketch)
+
+    Returns:
+        Arrow table with BUCKET_COL, COUNTRY_COL, DEVICE_COL, MEASURE_COL and
+        REGISTERS_COL, one row per Pais x Dispositivo cell and SKETCH_MEASURES entry
+    """
+    day = pc.cast(pc.floor_temporal(table[TIMESTAMP_COL], unit='day'), pa.timestamp('s'))
+    cells = pd.MultiIndex.from_arrays([
+        day.to_numpy(),
+        pc.cast(table[COUNTRY_COL], pa.string()).to_numpy(zero_copy_only=False),
+        pc.cast(table[DEVICE_COL], pa.string()).to_numpy(zero_copy_only=False),
+    ])
+    codes, keys = cells.factorize()
+    users = table[USER_COL].to_numpy()
+    rows = {
+        'usuarios': np.ones(len(users), dtype=bool),
+        'usuarios_intencion': pc.fill_null(table[INTENT_COL], False).to_numpy(zero_copy_only=False),
+        'usuarios_registro': pc.fill_null(table[REGISTER_COL], False).to_numpy(zero_copy_only=False),
+    }
+    sketches = np.concatenate([
+        build_sketches(codes[rows[name]], users[rows[name]], len(keys), precision)
+        for name in SKETCH_MEASURES
+    ])
+    size = sketches.shape[1]
+    return pa.table({
+        BUCKET_COL: pa.array(np.tile(keys.get_level_values(0).to_numpy(), len(SKETCH_MEASURES)), pa.timestamp('s')),
+        COUNTRY_COL: pa.array(np.tile(keys.get_level_values(1).to_numpy(), len(SKETCH_MEASURES)), pa.string()),
+        DEVICE_COL: pa.array(np.tile(keys.get_level_values(2).to_numpy(), len(SKETCH_MEASURES)), pa.string()),
+        MEASURE_COL: pa.array(np.repeat(SKETCH_MEASURES, len(keys)), pa.string()),
+        REGISTERS_COL: pa.FixedSizeBinaryArray.from_buffers(
+            pa.binary(size), len(sketches), [None, pa.py_buffer(np.ascontiguousarray(sketches))]
+        ),
+    })
+
+
+# ============================================================
+# ROLLUP STORE
+# ============================================================
+
+class RollupStore:
+    """
+    Day and hour rollups of an event store directory, refreshed incrementally.
+
+    Each ingested day partition produces one file per grain
+    (<path>/<grain>/<YYYY-MM-DD>.parquet) and one sketch file
+    (<path>/sketches/<YYYY-MM-DD>.parquet). The manifest keeps the file
+    signature of every ingested partition and the latest ingested day
+    (watermark); days whose files did not change are never read again.
+
+    Ingestion runs from the CLI or, in the app, in a background thread started
+    by ready(); queries never wait for it.
+    """
+
+    def __init__(
+        self,
+        events_path: str,
+        path: str = None,
+        refresh_seconds: float = 60,
+        sketch_precision: int = DEFAULT_PRECISION
+    ):
+        self.events_path = Path(events_path)
+        # Inside the event store by default: '_'-prefixed paths are ignored by dataset discovery
+        self.path = Path(path) if path else self.events_path / '_rollups'
+        self.refresh_seconds = refresh_seconds
+        self.sketch_precision = sketch_precision
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._frames = {}
+        self._last_refresh = None
+        self._current = False
+        self._last_check = None
+        self._refresher = None
+
+    # === MANIFEST ===
+
+    def manifest(self) -> dict:
+        """Return the manifest ({'watermark': day, 'partitions': {day: signature}})."""
+        path = self.path / _MANIFEST
+        if path.exists():
+            return json.loads(path.read_text())
+        return {'watermark': None, 'partitions': {}}
+
+    def _write_manifest(self, manifest: dict):
+        path = self.path / _MANIFEST
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True))
+        os.replace(tmp, path)
+
+    @property
+    def watermark(self) -> Optional[date]:
+        """Latest ingested day, or None if nothing was ingested."""
+        value = self.manifest()['watermark']
+        return date.fromisoformat(value) if value else None
+
+    # === INGESTION ===
+
+    def _source_partitions(self) -> Dict[str, Path]:
+        """Return {ISO day: directory} of the event store day partitions."""
+        partitions = {}
+        if self.events_path.is_dir():
+            for directory in self.events_path.glob(f'{DATE_COL}=*'):
+                if directory.is_dir():
+                    partitions[directory.name.split('=', 1)[1]] = directory
+        return partitions
+
+    def refresh(self, force: bool = False) -> List[str]:
+        """
+        Ingest new or changed day partitions and drop the rollups of removed ones.
+
+        Calls within refresh_seconds of the previous one return immediately
+        unless force is True.
+
+        Returns:
+            ISO days (re)ingested
+        """
+        with self._refresh_lock:
+            now = time.monotonic()
+            if not force and self._last_refresh is not None and now - self._last_refresh < self.refresh_seconds:
+                return []
+            self._last_refresh = now
+
+            manifest = self.manifest()
+            ingested = manifest['partitions']
+            sources = self._source_partitions()
+            changed = []
+            # Rollups of another layout or sketches of another precision cannot be merged
+            if manifest.get('format') != self._layout():
+                ingested.clear()
+                manifest['format'] = self._layout()
+
+            for day, directory in sorted(sources.items()):
+                signature = _partition_signature(directory)
+                if ingested.get(day) == signature and (self.path / SKETCHES / f'{day}.parquet').exists():
+                    continue
+                self._ingest(day, directory)
+                ingested[day] = signature
+                changed.append(day)
+
+            removed = [day for day in ingested if day not in sources]
+            for day in removed:
+                for directory in GRAINS + (SKETCHES,):
+                    (self.path / directory / f'{day}.parquet').unlink(missing_ok=True)
+                del ingested[day]
+
+            if changed or removed:
+                manifest['watermark'] = max(ingested) if ingested else None
+                manifest['updated'] = datetime.now().isoformat(timespec='seconds')
+                self._write_manifest(manifest)
+            with self._lock:
+                if changed or removed:
+                    self._frames.clear()
+                self._current = bool(ingested)
+                self._last_check = time.monotonic()
+            return changed
+
+    def _ingest(self, day: str, directory: Path):
+        """Roll up one day partition into one file per grain and its sketch file."""
+        table = ds.dataset(directory, format='parquet').to_table(columns=_COLUMNS)
+        outputs = {grain: rollup_partition(table, grain) for grain in GRAINS}
+        outputs[SKETCHES] = sketch_partition(table, self.sketch_precision)
+        for name, output in outputs.items():
+            target = self.path / name / f'{day}.parquet'
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_suffix('.tmp')
+            pq.write_table(output, tmp)
+            os.replace(tmp, target)
+
+    def rebuild(self) -> List[str]:
+        """Drop every rollup file and ingest all partitions again."""
+        with self._refresh_lock:
+            for directory in GRAINS + (SKETCHES,):
+                for file in (self.path / directory).glob('*.parquet'):
+                    file.unlink()
+            (self.path / _MANIFEST).unlink(missing_ok=True)
+            with self._lock:
+                self._frames.clear()
+                self._current = False
+        return self.refresh(force=True)
+
+    def _layout(self) -> dict:
+        """Format of the rollup files written by this store (version and sketch precision)."""
+        return {'version': _FORMAT_VERSION, 'sketch_precision': self.sketch_precision}
+
+    def is_current(self) -> bool:
+        """True if every event store partition is ingested as it is now (and nothing else is)."""
+        manifest = self.manifest()
+        sources = self._source_partitions()
+        return (
+            bool(sources)
+            and manifest.get('format') == self._layout()
+            and manifest['partitions'] == {day: _partition_signature(directory) for day, directory in sources.items()}
+        )
+
+    def _refresh_in_background(self):
+        try:
+            self.refresh(force=True)
+        finally:
+            with self._lock:
+                self._refresher = None
+
+    def ready(self) -> bool:
+        """
+        Return True if the rollups can answer for the current event store data.
+
+        When partitions were added or changed (checked at most every
+        refresh_seconds), a background refresh is started and False is
+        returned until it finishes; callers answer from the source meanwhile.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._last_check is not None and now - self._last_check < self.refresh_seconds:
+                return self._current
+            self._last_check = now
+        current = self.is_current()
+        with self._lock:
+            self._current = current
+            if not current and self._refresher is None and self.events_path.is_dir():
+                self._refresher = threading.Thread(
+                    target=self._refresh_in_background, name="rollups-refresh", daemon=True
+                )
+                self._refresher.start()
+            return current
+
+    # === QUERIES ===
+
+    def _frame(self, grain: str) -> pd.DataFrame:
+        """All rollup rows of a grain (loaded once per refresh)."""
+        with self._lock:
+            frame = self._frames.get(grain)
+            if frame is None:
+                directory = self.path / grain
+                files = sorted(directory.glob('*.parquet')) if directory.is_dir() else []
+                table = pa.concat_tables([pq.read_table(f) for f in files]) if files else ROLLUP_SCHEMA.empty_table()
+                frame = compact_frame(table.to_pandas().sort_values(BUCKET_COL, kind='stable', ignore_index=True))
+                self._frames[grain] = frame
+            return frame
+
+    def query(
+        self,
+        grain: str = 'day',
+        date_range: tuple = None,
+        countries: List[str] = None,
+        devices: List[str] = None
+    ) -> pd.DataFrame:
+        """
+        Answer a time series from the rollups.
+
+        An unfiltered dimension reads its ALL rows, so distinct users stay exact;
+        for a filtered dimension the per-value rows are added up, which counts a
+        user once per selected value they appear in.
+
+        Args:
+            grain: 'day' or 'hour'
+            date_range: Tuple of (start_date, end_date), both inclusive
+            countries: Countries to include (None/empty: all)
+            devices: Devices to include (None/empty: all)
+
+        Returns:
+            DataFrame with BUCKET_COL followed by the session and user measures
+        """
+        if grain not in GRAINS:
+            raise ValueError(f"Unknown grain {grain!r}, expected one of {GRAINS}")
+        df = self._frame(grain)
+
+        mask = (
+            (df[COUNTRY_COL].isin(countries) if countries else df[COUNTRY_COL] == ALL)
+            & (df[DEVICE_COL].isin(devices) if devices else df[DEVICE_COL] == ALL)
+        ).to_numpy()
+        if date_range and len(date_range) == 2:
+            start = pd.Timestamp(date_range[0]).normalize()
+            end = pd.Timestamp(date_range[1]).normalize() + pd.Timedelta(days=1)
+            buckets = df[BUCKET_COL]
+            mask = mask & ((buckets >= start) & (buckets < end)).to_numpy()
+
+        measures = SESSION_MEASURES + USER_MEASURES
+        return df.loc[mask].groupby(BUCKET_COL, as_index=False, sort=True)[measures].sum()
+
+    def _sketches(self) -> tuple:
+        """All sketch rows as (keys DataFrame, uint8 registers matrix), loaded once per refresh."""
+        with self._lock:
+            sketches = self._frames.get(SKETCHES)
+            if sketches is None:
+                directory = self.path / SKETCHES
+                files = sorted(directory.glob('*.parquet')) if directory.is_dir() else []
+                size = 1 << self.sketch_precision
+                table = pa.concat_tables([pq.read_table(f) for f in files]).combine_chunks() if files else None
+                if table is not None and len(table):
+                    column = table[REGISTERS_COL].chunk(0)
+                    registers = np.frombuffer(column.buffers()[1], dtype=np.uint8)
+                    registers = registers[column.offset * size:(column.offset + len(column)) * size]
+                    registers = registers.reshape(len(column), size)
+                    keys = compact_frame(
+                        table.drop_columns([REGISTERS_COL]).to_pandas(), [COUNTRY_COL, DEVICE_COL, MEASURE_COL]
+                    )
+                else:
+                    registers = np.zeros((0, size), dtype=np.uint8)
+                    keys = pd.DataFrame(columns=[BUCKET_COL, COUNTRY_COL, DEVICE_COL, MEASURE_COL])
+                sketches = self._frames[SKETCHES] = (keys, registers)
+            return sketches
+
+    def distinct_users(
+        self,
+        date_range: tuple = None,
+        countries: List[str] = None,
+        devices: List[str] = None
+    ) -> Dict[str, float]:
+        """
+        Estimate distinct users over any filter combination by merging sketches.
+
+        Unlike query, a user seen on several days, countries or devices is
+        counted once. Every estimate has a relative standard error of
+        relative_error(sketch_precision) (about 1.6% at the default precision
+        12; within 3 standard errors in 99.7% of the queries).
+
+        Args:
+            date_range: Tuple of (start_date, end_date), both inclusive
+            countries: Countries to include (None/empty: all)
+            devices: Devices to include (None/empty: all)
+
+        Returns:
+            Dict {SKETCH_MEASURES entry: estimated distinct users}
+        """
+        keys, registers = self._sketches()
+        mask = np.ones(len(keys), dtype=bool)
+        if countries:
+            mask &= keys[COUNTRY_COL].isin(countries).to_numpy()
+        if devices:
+            mask &= keys[DEVICE_COL].isin(devices).to_numpy()
+        if date_range and len(date_range) == 2:
+            start = pd.Timestamp(date_range[0]).normalize()
+            end = pd.Timestamp(date_range[1]).normalize()
+            buckets = keys[BUCKET_COL]
+            mask &= ((buckets >= start) & (buckets <= end)).to_numpy()
+
+        measures = keys[MEASURE_COL].to_numpy()
+        return {name: estimate(registers[mask & (measures == name)]) for name in SKETCH_MEASURES}
+
+    @property
+    def sketch_error(self) -> float:
+        """Relative standard error of the distinct_users estimates."""
+        return relative_error(self.sketch_precision)
+
+
+# ============================================================
+# PROCESS-WIDE STORE
+# ============================================================
+
+_rollups = None
+_rollups_lock = threading.Lock()
+
+
+def get_rollup_store() -> RollupStore:
+    """Return the process-wide rollup store of the configured event store."""
+    global _rollups
+    if _rollups is None:
+        with _rollups_lock:
+            if _rollups is None:
+                _rollups = RollupStore(
+                    DATA_CONFIG["events_path"],
+                    path=DATA_CONFIG["rollups_path"],
+                    refresh_seconds=DATA_CONFIG["rollup_refresh_seconds"],
+                    sketch_precision=DATA_CONFIG["sketch_precision"]
+                )
+    return _rollups
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest new event store partitions into the rollups.")
+    parser.add_argument("--events", default=DATA_CONFIG["events_path"], help="Event store directory")
+    parser.add_argument("--out", default=DATA_CONFIG["rollups_path"], help="Rollups directory")
+    parser.add_argument("--rebuild", action='store_true', help="Drop the rollups and ingest everything")
+    args = parser.parse_args()
+
+    store = RollupStore(args.events, path=args.out, sketch_precision=DATA_CONFIG["sketch_precision"])
+    started = time.perf_counter()
+    days = store.rebuild() if args.rebuild else store.refresh(force=True)
+    print(
+        f"Ingested {len(days)} partitions in {time.perf_counter() - started:.1f}s "
+        f"into {store.path} (watermark: {store.watermark})"
+    )
+
+
+if __name__ == "__main__":
+    main()
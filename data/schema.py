@@ -0,0 +1,158 @@
+"""
+Event store schema and dimension vocabularies.
+Single source of truth for column names shared by the store, the getters and the generators.
+"""
+
+import pyarrow as pa
+
+
+# ============================================================
+# COLUMN NAMES
+# ============================================================
+
+# Partition key (one directory per day: fecha=YYYY-MM-DD)
+DATE_COL = 'fecha'
+
+# Session start timestamp
+TIMESTAMP_COL = 'inicio'
+
+# User identifier
+USER_COL = 'user_id'
+
+# Dimension columns (same names used by the dashboard DataFrames)
+COUNTRY_COL = 'Pais'
+DEVICE_COL = 'Dispositivo'
+USER_TYPE_COL = 'Tipo Usuario'
+SEGMENT_COL = 'Segmento Consumo'
+SOURCE_COL = 'Fuente / Medio'
+CONCEPT_COL = 'Concepto'
+CATEGORY_COL = 'Categoría Wattson'
+
+# Session flags
+INTENT_COL = 'intencion'
+REGISTER_COL = 'registro'
+BOUNCE_COL = 'rebote'
+
+# Session measures (seconds)
+DURATION_COL = 'duracion'
+ENGAGEMENT_COL = 'interaccion'
+
+
+# ============================================================
+# ARROW SCHEMA
+# ============================================================
+
+# Schema of the Parquet files (the partition key is not stored inside the files)
+EVENTS_SCHEMA = pa.schema([
+    (TIMESTAMP_COL, pa.timestamp('s')),
+    (USER_COL, pa.int64()),
+    (COUNTRY_COL, pa.dictionary(pa.int8(), pa.string())),
+    (DEVICE_COL, pa.dictionary(pa.int8(), pa.string())),
+    (USER_TYPE_COL, pa.dictionary(pa.int8(), pa.string())),
+    (SEGMENT_COL, pa.dictionary(pa.int8(), pa.string())),
+    (SOURCE_COL, pa.dictionary(pa.int16(), pa.string())),
+    (CONCEPT_COL, pa.dictionary(pa.int16(), pa.string())),
+    (CATEGORY_COL, pa.dictionary(pa.int16(), pa.string())),
+    (INTENT_COL, pa.bool_()),
+    (REGISTER_COL, pa.bool_()),
+    (BOUNCE_COL, pa.bool_()),
+    (DURATION_COL, pa.int32()),
+    (ENGAGEMENT_COL, pa.int32()),
+])
+
+# Hive partitioning of the dataset directory
+PARTITION_SCHEMA = pa.schema([(DATE_COL, pa.date32())])
+
+
+# ============================================================
+# DATAFRAME DTYPES
+# ============================================================
+
+# Dimension columns held as pandas categoricals in memory (see memory.py);
+# integer columns are narrowed to the smallest signed type holding their values
+CATEGORICAL_COLUMNS = [
+    COUNTRY_COL, DEVICE_COL, USER_TYPE_COL, SEGMENT_COL, SOURCE_COL, CONCEPT_COL, CATEGORY_COL
+]
+
+
+# ============================================================
+# HIT LOG SCHEMA
+# ============================================================
+
+# Hit timestamp (hit logs are sessionized into the event store, see sessionize.py)
+HIT_TIME_COL = 'instante'
+
+# Schema of the raw hit log files, partitioned by day like the event store.
+# Dimensions of a session are those of its first hit; INTENT_COL / REGISTER_COL
+# flag the hits of those events and ENGAGEMENT_COL holds the engaged seconds of a hit.
+HITS_SCHEMA = pa.schema(
+    [(HIT_TIME_COL, pa.timestamp('s'))]
+    + [EVENTS_SCHEMA.field(name) for name in (
+        USER_COL, COUNTRY_COL, DEVICE_COL, USER_TYPE_COL, SEGMENT_COL, SOURCE_COL, CONCEPT_COL, CATEGORY_COL,
+        INTENT_COL, REGISTER_COL, ENGAGEMENT_COL
+    )]
+)
+
+
+# ============================================================
+# DIMENSION VOCABULARIES
+# ============================================================
+
+COUNTRY_ISO = {
+    'Argentina': 'ARG',
+    'México': 'MEX',
+    'España': 'ESP',
+    'Colombia': 'COL',
+    'Chile': 'CHL',
+    'Perú': 'PER',
+}
+
+COUNTRIES = list(COUNTRY_ISO.keys())
+
+DEVICES = ['Mobile', 'Desktop', 'Tablet', 'Smart TV']
+
+USER_TYPES = ['Recurrente', 'Nuevo']
+
+SEGMENTS = ['0-5 Light', '6-10 Medium', '11-20 Heavy', '21+ Super Heavy']
+
+SOURCES = [
+    '(direct) / (none)',
+    'google / organic',
+    'google / cpc',
+    'bing / organic',
+    'bing / cpc',
+    'yahoo / organic',
+    'duckduckgo / organic',
+    'facebook.com / referral',
+    'instagram.com / referral',
+    'twitter.com / referral',
+    'linkedin.com / referral',
+    'tiktok.com / referral',
+    'youtube.com / referral',
+    'news.google.com / referral',
+    'flipboard.com / referral',
+    'pinterest.com / referral',
+    'reddit.com / referral',
+    'whatsapp / referral',
+    'telegram / referral',
+    'email / newsletter',
+    'email / marketing',
+    'email / transactional',
+    'push / notification',
+    'app / internal',
+    'ampproject.org / referral'
+]
+
+CONCEPTS = [
+    'Inflación', 'Dólar', 'Elecciones', 'COVID-19', 'Jubilaciones',
+    'Tarifas', 'Combustibles', 'Alquileres', 'Empleo', 'Impuestos',
+    'Educación Pública', 'Salud Pública', 'Seguridad', 'Transporte', 'Clima',
+    'Fútbol', 'Tenis', 'Cine', 'Música', 'Series'
+]
+
+CATEGORIES = [
+    'Economía', 'Salud', 'Educación', 'Cultura', 'Deportes',
+    'Política', 'Ciencia', 'Tecnología', 'Entretenimiento', 'Sociedad',
+    'Internacional', 'Nacional', 'Opinión', 'Lifestyle', 'Autos',
+    'Turismo', 'Gastronomía', 'Moda', 'Celebridades', 'Gaming'
+]
@@ -0,0 +1,300 @@
+"""
+Streaming sessionization of raw hit logs into the event store.
+
+Hits are read in bounded record batches and stitched into sessions per user:
+a hit starts a new session when it comes more than the inactivity timeout
+after the previous hit of the user. Only the sessions that can still grow
+(last hit within twice the timeout of the newest hit seen, see Sessionizer)
+are kept between batches, so memory is bounded by the batch size plus the
+recently active users, whatever the volume of the day.
+
+Every session gets its duration (last hit - first hit), engagement (sum of
+the engaged seconds of its hits) and bounce flag (single hit), and is written
+with the event store schema, so the day rollups aggregate them for the KPIs.
+Sessions are split at midnight (one day partition is sessionized at a time).
+
+Usage:
+    python -m data.sessionize --hits data/store/hits --out data/store/events
+    python -m data.sessionize --day 2026-01-31     # one day partition only
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+from typing import Iterator, List
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from config.settings import DATA_CONFIG
+from .schema import (
+    EVENTS_SCHEMA,
+    HITS_SCHEMA,
+    HIT_TIME_COL,
+    DATE_COL,
+    TIMESTAMP_COL,
+    USER_COL,
+    INTENT_COL,
+    REGISTER_COL,
+    BOUNCE_COL,
+    DURATION_COL,
+    ENGAGEMENT_COL
+)
+
+
+# Internal columns of the open sessions: last hit time and number of hits
+_END = '_fin'
+_HITS = '_hits'
+
+# Columns of a session taken from its first hit
+_FIRST_HIT_COLS = [
+    name for name in HITS_SCHEMA.names
+    if name not in (HIT_TIME_COL, USER_COL, INTENT_COL, REGISTER_COL, ENGAGEMENT_COL)
+]
+
+
+def _fragments(hits: pa.Table) -> pa.Table:
+    """Turn hits into one-hit session fragments (start = end = hit time, int64 seconds)."""
+    times = pc.cast(pc.cast(hits[HIT_TIME_COL], pa.timestamp('s')), pa.int64())
+    return pa.table({
+        USER_COL: hits[USER_COL],
+        TIMESTAMP_COL: times,
+        _END: times,
+        _HITS: pa.array(np.ones(len(hits), dtype=np.int64)),
+        INTENT_COL: pc.fill_null(hits[INTENT_COL], False),
+        REGISTER_COL: pc.fill_null(hits[REGISTER_COL], False),
+        ENGAGEMENT_COL: pc.cast(pc.fill_null(hits[ENGAGEMENT_COL], 0), pa.int64()),
+        **{name: hits[name] for name in _FIRST_HIT_COLS},
+    })
+
+
+def _session_starts(users: np.ndarray, starts: np.ndarray, ends: np.ndarray, timeout: float) -> np.ndarray:
+    """
+    Positions where a session starts, for fragments sorted by (user, start).
+
+    A fragment continues the session of the previous fragments of the same
+    user unless it starts more than timeout after their latest end.
+    """
+    new_user = np.ones(len(users), dtype=bool)
+    new_user[1:] = users[1:] != users[:-1]
+    # Latest end so far per user: offset every user's ends above the previous user's
+    group = np.cumsum(new_user) - 1
+    span = int(ends.max() - ends.min()) + 1
+    latest = np.maximum.accumulate(group * span + (ends - ends.min())) - group * span + ends.min()
+    new_session = new_user.copy()
+    new_session[1:] |= starts[1:] - latest[:-1] > timeout
+    return np.flatnonzero(new_session)
+
+
+class Sessionizer:
+    """
+    Incremental sessionizer of time-ordered hit batches.
+
+    Batches may be unordered internally, but a batch must not contain hits
+    older than the timeout before the newest hit of the previous batches
+    (hit logs are appended in time order). Such a late hit still continues a
+    session that ended up to one timeout before it, so sessions stay open
+    while their last hit is within twice the timeout of the newest hit.
+    """
+
+    def __init__(self, timeout_seconds: float = 1800):
+        self.timeout = timeout_seconds
+        self._open = None
+        self._watermark = None
+
+    @property
+    def open_sessions(self) -> int:
+        """Sessions kept in memory because they can still grow."""
+        return 0 if self._open is None else len(self._open)
+
+    def push(self, hits) -> pa.Table:
+        """
+        Add a batch of hits.
+
+        Args:
+            hits: pyarrow RecordBatch or Table with the HITS_SCHEMA columns
+
+        Returns:
+            Sessions closed by this batch, with EVENTS_SCHEMA
+        """
+        if isinstance(hits, pa.RecordBatch):
+            hits = pa.Table.from_batches([hits])
+        if not len(hits):
+            return EVENTS_SCHEMA.empty_table()
+        fragments = _fragments(hits)
+        latest = pc.max(fragments[_END]).as_py()
+        self._watermark = latest if self._watermark is None else max(self._watermark, latest)
+
+        sessions = self._stitch(fragments)
+        still_open = pc.greater_equal(sessions[_END], self._watermark - 2 * self.timeout)
+        self._open = sessions.filter(still_open)
+        return self._finalize(sessions.filter(pc.invert(still_open)))
+
+    def flush(self) -> pa.Table:
+        """Close and return every open session (end of the hit log)."""
+        sessions = self._open
+        self._open = None
+        self._watermark = None
+        return self._finalize(sessions) if sessions is not None else EVENTS_SCHEMA.empty_table()
+
+    def _stitch(self, fragments: pa.Table) -> pa.Table:
+        """Merge the open sessions and new fragments into sessions."""
+        if self._open is not None and len(self._open):
+            fragments = pa.concat_tables([self._open, fragments])
+        fragments = fragments.unify_dictionaries().combine_chunks()
+
+        users = fragments[USER_COL].to_numpy()
+        starts = fragments[TIMESTAMP_COL].to_numpy()
+        order = np.lexsort((starts, users))
+        users, starts = users[order], starts[order]
+        ends = fragments[_END].to_numpy()[order]
+        first = _session_starts(users, starts, ends, self.timeout)
+
+        def flags(name):
+            values = fragments[name].to_numpy(zero_copy_only=False)[order]
+            return np.logical_or.reduceat(values, first)
+
+        def sums(name):
+            return np.add.reduceat(fragments[name].to_numpy()[order], first)
+
+        return pa.table({
+            USER_COL: users[first],
+            TIMESTAMP_COL: starts[first],
+            _END: np.maximum.reduceat(ends, first),
+            _HITS: sums(_HITS),
+            INTENT_COL: flags(INTENT_COL),
+            REGISTER_COL: flags(REGISTER_COL),
+            ENGAGEMENT_COL: sums(ENGAGEMENT_COL),
+            **{name: fragments[name].take(order[first]) for name in _FIRST_HIT_COLS},
+        })
+
+    @staticmethod
+    def _finalize(sessions: pa.Table) -> pa.Table:
+        """Derive duration and bounce and cast closed sessions to EVENTS_SCHEMA."""
+        starts = sessions[TIMESTAMP_COL]
+        columns = {
+            TIMESTAMP_COL: pc.cast(starts, pa.timestamp('s')),
+            BOUNCE_COL: pc.equal(sessions[_HITS], 1),
+            DURATION_COL: pc.subtract(sessions[_END], starts),
+            **{name: sessions[name] for name in sessions.column_names if name not in (TIMESTAMP_COL, _END, _HITS)},
+        }
+        return pa.table({
+            field.name: pc.cast(columns[field.name], field.type) for field in EVENTS_SCHEMA
+        }, schema=EVENTS_SCHEMA)
+
+
+def sessionize_batches(batches, timeout_seconds: float = 1800) -> Iterator[pa.Table]:
+    """
+    Sessionize a stream of hit batches.
+
+    Args:
+        batches: Iterable of time-ordered hit RecordBatches (see Sessionizer)
+        timeout_seconds: Inactivity timeout
+
+    Yields:
+        Tables of closed sessions with EVENTS_SCHEMA
+    """
+    sessionizer = Sessionizer(timeout_seconds)
+    for batch in batches:
+        sessions = sessionizer.push(batch)
+        if len(sessions):
+            yield sessions
+    sessions = sessionizer.flush()
+    if len(sessions):
+        yield sessions
+
+
+def sessionize_partition(
+    hits_dir: Path,
+    events_path: Path,
+    timeout_seconds: float = 1800,
+    batch_size: int = 1_000_000
+) -> int:
+    """
+    Sessionize one day partition of the hit log into the event store.
+
+    The sessions are streamed to <events_path>/fecha=<day>/sessions.parquet,
+    which replaces the previous output atomically.
+
+    Args:
+        hits_dir: Hit log partition directory (fecha=YYYY-MM-DD)
+        events_path: Event store directory
+        timeout_seconds: Inactivity timeout
+        batch_size: Hits per record batch
+
+    Returns:
+        Number of sessions written
+    """
+    files = sorted(
+        file for file in Path(hits_dir).iterdir()
+        if file.is_file() and not file.name.startswith(('.', '_'))
+    )
+    target = Path(events_path) / Path(hits_dir).name / 'sessions.parquet'
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix('.tmp')
+
+    # Files are read in name order: the hit log appends files in time order
+    batches = ds.dataset(files, format='parquet').to_batches(
+        columns=HITS_SCHEMA.names, batch_size=batch_size
+    )
+    written = 0
+    with pq.ParquetWriter(tmp, EVENTS_SCHEMA, compression='zstd') as writer:
+        for sessions in sessionize_batches(batches, timeout_seconds):
+            writer.write_table(sessions)
+            written += len(sessions)
+    os.replace(tmp, target)
+    return written
+
+
+def sessionize_store(
+    hits_path: str,
+    events_path: str,
+    days: List[str] = None,
+    timeout_seconds: float = 1800,
+    batch_size: int = 1_000_000
+) -> dict:
+    """
+    Sessionize the day partitions of a hit log directory.
+
+    Args:
+        hits_path: Hit log directory (fecha=YYYY-MM-DD/*.parquet)
+        events_path: Event store directory
+        days: ISO days to process (None: every partition)
+        timeout_seconds: Inactivity timeout
+        batch_size: Hits per record batch
+
+    Returns:
+        dict {ISO day: sessions written}
+    """
+    written = {}
+    for directory in sorted(Path(hits_path).glob(f'{DATE_COL}=*')):
+        day = directory.name.split('=', 1)[1]
+        if directory.is_dir() and (days is None or day in days):
+            written[day] = sessionize_partition(directory, Path(events_path), timeout_seconds, batch_size)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sessionize raw hit logs into the event store.")
+    parser.add_argument("--hits", default=DATA_CONFIG["hits_path"], help="Hit log directory")
+    parser.add_argument("--out", default=DATA_CONFIG["events_path"], help="Event store directory")
+    parser.add_argument("--day", action='append', help="ISO day to process (repeatable, default: all)")
+    parser.add_argument(
+        "--timeout", type=float, default=DATA_CONFIG["session_timeout_seconds"], help="Inactivity timeout (seconds)"
+    )
+    parser.add_argument("--batch-size", type=int, default=DATA_CONFIG["batch_size"], help="Hits per batch")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    written = sessionize_store(args.hits, args.out, args.day, args.timeout, args.batch_size)
+    for day, sessions in written.items():
+        print(f"{day}: {sessions:,} sessions")
+    print(f"{sum(written.values()):,} sessions in {time.perf_counter() - started:.1f}s into {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+HyperLogLog sketches of distinct users.
+
+A sketch is an array of 2^p uint8 registers. Sketches of different days,
+countries or devices are merged with an element-wise max, so a distinct count
+over any combination of cells never counts a user twice. The estimate has a
+relative standard error of about 1.04 / sqrt(2^p) (see relative_error).
+"""
+
+import numpy as np
+
+from .hashing import splitmix64
+
+
+# Registers per sketch = 2^precision; precision 12 -> 4096 bytes, ~1.6% error
+DEFAULT_PRECISION = 12
+
+
+def relative_error(precision: int = DEFAULT_PRECISION) -> float:
+    """Relative standard error of a distinct count estimated with this precision."""
+    return 1.04 / np.sqrt(1 << precision)
+
+
+def _leading_zeros(values: np.ndarray) -> np.ndarray:
+    """Number of leading zero bits of each uint64 (64 for zero)."""
+    values = values.copy()
+    zeros = np.zeros(len(values), dtype=np.uint8)
+    for shift in (32, 16, 8, 4, 2, 1):
+        empty = values < (np.uint64(1) << np.uint64(64 - shift))
+        zeros[empty] += shift
+        values[empty] <<= np.uint64(shift)
+    zeros[values == 0] += 1
+    return zeros
+
+
+def register_updates(users, precision: int = DEFAULT_PRECISION) -> tuple:
+    """
+    Hash users into (register index, rank) pairs.
+
+    Args:
+        users: Integer user ids
+        precision: Sketch precision p
+
+    Returns:
+        Tuple (int64 register indices, uint8 ranks)
+    """
+    hashes = splitmix64(users)
+    index = (hashes >> np.uint64(64 - precision)).astype(np.int64)
+    rank = _leading_zeros(hashes << np.uint64(precision)) + 1
+    return index, np.minimum(rank, 64 - precision + 1).astype(np.uint8)
+
+
+def build_sketches(cells: np.ndarray, users, n_cells: int, precision: int = DEFAULT_PRECISION) -> np.ndarray:
+    """
+    Build one sketch per cell.
+
+    Args:
+        cells: Cell number (0 .. n_cells - 1) of each row
+        users: User id of each row
+        n_cells: Number of cells
+        precision: Sketch precision p
+
+    Returns:
+        uint8 array of shape (n_cells, 2^precision)
+    """
+    size = 1 << precision
+    registers = np.zeros(n_cells * size, dtype=np.uint8)
+    index, rank = register_updates(users, precision)
+    np.maximum.at(registers, np.asarray(cells, dtype=np.int64) * size + index, rank)
+    return registers.reshape(n_cells, size)
+
+
+def estimate(registers: np.ndarray) -> float:
+    """
+    Estimate the number of distinct users of a sketch (or of the union of a
+    stack of sketches along the first axis).
+
+    Uses linear counting for small cardinalities, the HyperLogLog estimate otherwise.
+    """
+    if registers.ndim > 1:
+        registers = registers.max(axis=0) if len(registers) else np.zeros(registers.shape[1], np.uint8)
+    size = len(registers)
+    alpha = 0.7213 / (1 + 1.079 / size)
+    raw = alpha * size * size / np.sum(np.ldexp(1.0, -registers.astype(np.int32)))
+    empty = int(np.count_nonzero(registers == 0))
+    if raw <= 2.5 * size and empty:
+        return size * np.log(size / empty)
+    return float(raw)
@@ -0,0 +1,120 @@
+"""
+Data source interface used by the dashboard getters.
+
+A source answers grouped aggregations of the session table (see Measure);
+the Parquet event store and the SQLite database are the implementations.
+The configured source (DATA_CONFIG["source"]) is shared by every session.
+"""
+
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+from config.settings import DATA_CONFIG
+
+
+# Measure spec: (column, aggregation, flag column or None)
+# Aggregations: 'sum', 'count', 'mean', 'nunique'.
+# When a flag column is given, only rows where the flag is True are aggregated.
+Measure = Tuple[str, str, Optional[str]]
+
+
+class DataSource(ABC):
+    """Backend of the data getters."""
+
+    name = 'source'
+
+    @property
+    @abstractmethod
+    def available(self) -> bool:
+        """True if the source has data to query (otherwise the getters use mock data)."""
+
+    @abstractmethod
+    def aggregate(
+        self,
+        group_by: List[str],
+        measures: Dict[str, Measure],
+        countries: List[str] = None,
+        devices: List[str] = None,
+        date_range: tuple = None
+    ) -> pd.DataFrame:
+        """
+        Aggregate sessions by the given dimensions.
+
+        Args:
+            group_by: Dimension columns to group by (empty list: grand total)
+            measures: Dict mapping output column names to measure specs
+            countries: Countries to include
+            devices: Devices to include
+            date_range: Tuple of (start_date, end_date), both inclusive
+
+        Returns:
+            DataFrame with the group_by columns followed by one integer column
+            per measure ('mean' measures are floats); groups without matching
+            rows count as 0
+        """
+
+    @abstractmethod
+    def batches(
+        self,
+        columns: List[str],
+        countries: List[str] = None,
+        devices: List[str] = None,
+        date_range: tuple = None
+    ) -> Iterator[pa.RecordBatch]:
+        """
+        Iterate the matching sessions, row by row (for computations that are
+        not grouped aggregations, e.g. per-user sequences).
+
+        Args:
+            columns: Columns to read
+            countries: Countries to include
+            devices: Devices to include
+            date_range: Tuple of (start_date, end_date), both inclusive
+
+        Yields:
+            pyarrow.RecordBatch with the EVENTS_SCHEMA types of the columns
+            (dictionary columns may be plain strings)
+        """
+
+    def signature(self) -> Optional[str]:
+        """Fingerprint of the source data; changes when the data changes (None: unknown)."""
+        return None
+
+    def stats(self) -> dict:
+        """Usage counters of the source (e.g. connection pool); empty if none."""
+        return {}
+
+
+# ============================================================
+# PROCESS-WIDE SOURCE
+# ============================================================
+
+_source = None
+_source_lock = threading.Lock()
+
+
+def get_data_source() -> DataSource:
+    """
+    Return the process-wide source selected by DATA_CONFIG["source"].
+
+    'parquet': the event store (default); 'sqlite': the database at
+    DATA_CONFIG["sqlite_path"].
+    """
+    global _source
+    if _source is None:
+        with _source_lock:
+            if _source is None:
+                kind = DATA_CONFIG["source"]
+                if kind == 'sqlite':
+                    from .sql_source import SQLiteSource
+                    _source = SQLiteSource(DATA_CONFIG["sqlite_path"], pool_size=DATA_CONFIG["pool_size"])
+                elif kind == 'parquet':
+                    from .event_store import get_event_store
+                    _source = get_event_store()
+                else:
+                    raise ValueError(f"Unknown data source {kind!r}, expected 'parquet' or 'sqlite'")
+    return _source
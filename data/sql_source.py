@@ -0,0 +1,389 @@
+"""
+SQLite-backed data source.
+
+Connections come from a process-wide pool shared by every Streamlit session.
+Each getter's aggregation compiles to a single parameterized statement (the
+filter selections are bound as JSON arrays), so the statement text is stable
+and SQLite reuses the prepared statement from the connection's cache.
+
+Usage (build the database from the Parquet event store):
+    python -m data.sql_source --events data/store/events --out data/store/sessions.db
+"""
+
+import argparse
+import functools
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from config.settings import DATA_CONFIG
+from .schema import EVENTS_SCHEMA, PARTITION_SCHEMA, DATE_COL, COUNTRY_COL, DEVICE_COL
+from .source import DataSource, Measure
+
+
+TABLE = 'sessions'
+
+# Prepared statements kept per connection
+STATEMENT_CACHE_SIZE = 256
+
+# Rows fetched per batch by SQLiteSource.batches
+FETCH_SIZE = 200_000
+
+_AGGREGATIONS = {
+    'sum': 'SUM({})',
+    'count': 'COUNT({})',
+    'mean': 'AVG({})',
+    'nunique': 'COUNT(DISTINCT {})',
+}
+
+
+def _quote(name: str) -> str:
+    """Quote an identifier (column names contain spaces, slashes and accents)."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+# ============================================================
+# CONNECTION POOL
+# ============================================================
+
+class ConnectionPool:
+    """
+    Bounded pool of read-only SQLite connections.
+
+    Connections are opened on demand up to size; when every connection is in
+    use, callers wait for one to be returned. Usage counters are kept for
+    monitoring (see stats()).
+    """
+
+    def __init__(self, path: str, size: int = 4, timeout: float = 30):
+        self.path = Path(path)
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.queries = 0
+        self.query_seconds = 0.0
+
+    def _open(self) -> sqlite3.Connection:
+        return sqlite3.connect(
+            f"file:{self.path}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self.opened < self.size:
+                self.opened += 1
+                opening = True
+            else:
+                opening = False
+        if opening:
+            try:
+                return self._open()
+            except Exception:
+                with self._lock:
+                    self.opened -= 1
+                raise
+
+        started = time.perf_counter()
+        try:
+            connection = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No SQLite connection available after {self.timeout}s") from None
+        with self._lock:
+            self.waits += 1
+            self.wait_seconds += time.perf_counter() - started
+        return connection
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of the block."""
+        connection = self._acquire()
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+        try:
+            yield connection
+        finally:
+            with self._lock:
+                self.in_use -= 1
+            self._idle.put(connection)
+
+    def record_query(self, seconds: float):
+        with self._lock:
+            self.queries += 1
+            self.query_seconds += seconds
+
+    def close(self):
+        """Close the idle connections."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+            with self._lock:
+                self.opened -= 1
+
+    def stats(self) -> dict:
+        """Return connection usage counters."""
+        with self._lock:
+            return {
+                'pool_size': self.size,
+                'connections_open': self.opened,
+                'connections_in_use': self.in_use,
+                'peak_in_use': self.peak_in_use,
+                'checkouts': self.checkouts,
+                'waits': self.waits,
+                'wait_ms': round(self.wait_seconds * 1000, 3),
+                'queries': self.queries,
+                'query_ms': round(self.query_seconds * 1000, 3),
+            }
+
+
+# ============================================================
+# QUERY COMPILATION
+# ============================================================
+
+# Dashboard filters, bound by _filter_params
+_FILTER = (
+    f"(:countries IS NULL OR {_quote(COUNTRY_COL)} IN (SELECT value FROM json_each(:countries)))"
+    f" AND (:devices IS NULL OR {_quote(DEVICE_COL)} IN (SELECT value FROM json_each(:devices)))"
+    f" AND (:start IS NULL OR {_quote(DATE_COL)} BETWEEN :start AND :end)"
+)
+
+
+def _filter_params(countries: List[str] = None, devices: List[str] = None, date_range: tuple = None) -> dict:
+    """Bind the dashboard filters to the parameters of _FILTER."""
+    params = {
+        'countries': json.dumps(list(countries)) if countries else None,
+        'devices': json.dumps(list(devices)) if devices else None,
+        'start': None,
+        'end': None,
+    }
+    if date_range and len(date_range) == 2:
+        params['start'], params['end'] = (pd.Timestamp(d).date().isoformat() for d in date_range)
+    return params
+
+
+@functools.lru_cache(maxsize=128)
+def compile_query(group_by: tuple, measures: tuple) -> str:
+    """
+    Compile an aggregation to one parameterized statement.
+
+    Parameters: :countries and :devices (JSON arrays or NULL), :start and
+    :end (ISO dates or NULL).
+
+    Args:
+        group_by: Dimension columns
+        measures: Tuple of (output name, Measure) pairs
+
+    Returns:
+        SQL text (stable for a given getter, so it is prepared once per connection)
+    """
+    select = [_quote(col) for col in group_by]
+    for name, (column, agg, flag) in measures:
+        value = f"CASE WHEN {_quote(flag)} THEN {_quote(column)} END" if flag else _quote(column)
+        select.append(f"{_AGGREGATIONS[agg].format(value)} AS {_quote(name)}")
+
+    sql = f"SELECT {', '.join(select)} FROM {TABLE} WHERE {_FILTER}"
+    if group_by:
+        sql += f" GROUP BY {', '.join(_quote(col) for col in group_by)}"
+    return sql
+
+
+# ============================================================
+# SOURCE
+# ============================================================
+
+class SQLiteSource(DataSource):
+    """
+    Session table in a SQLite database file (see export_event_store).
+
+    Every query borrows a connection from the process-wide pool instead of
+    opening one per rerun.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, path: str, pool_size: int = 4):
+        self.path = Path(path)
+        self.pool = ConnectionPool(self.path, size=pool_size)
+
+    @property
+    def available(self) -> bool:
+        return self.path.is_file()
+
+    def aggregate(
+        self,
+        group_by: List[str],
+        measures: Dict[str, Measure],
+        countries: List[str] = None,
+        devices: List[str] = None,
+        date_range: tuple = None
+    ) -> pd.DataFrame:
+        group_by = list(group_by)
+        sql = compile_query(tuple(group_by), tuple(measures.items()))
+        params = _filter_params(countries, devices, date_range)
+
+        with self.pool.connection() as connection:
+            started = time.perf_counter()
+            rows = connection.execute(sql, params).fetchall()
+            self.pool.record_query(time.perf_counter() - started)
+
+        result = pd.DataFrame(rows, columns=group_by + list(measures))
+        for name, (_, agg, _) in measures.items():
+            if agg == 'mean':
+                result[name] = result[name].astype('float64')
+            else:
+                result[name] = result[name].fillna(0).astype('int64')
+        return result
+
+    def batches(
+        self,
+        columns: List[str],
+        countries: List[str] = None,
+        devices: List[str] = None,
+        date_range: tuple = None
+    ) -> Iterator[pa.RecordBatch]:
+        sql = f"SELECT {', '.join(_quote(col) for col in columns)} FROM {TABLE} WHERE {_FILTER}"
+        schema = pa.schema([PARTITION_SCHEMA.field(DATE_COL)] + list(EVENTS_SCHEMA))
+        types = [schema.field(col).type for col in columns]
+
+        with self.pool.connection() as connection:
+            started = time.perf_counter()
+            cursor = connection.execute(sql, _filter_params(countries, devices, date_range))
+            while True:
+                rows = cursor.fetchmany(FETCH_SIZE)
+                if not rows:
+                    break
+                arrays = [_from_sql(values, arrow_type) for values, arrow_type in zip(zip(*rows), types)]
+                yield pa.RecordBatch.from_arrays(arrays, names=list(columns))
+            self.pool.record_query(time.perf_counter() - started)
+
+    def signature(self) -> Optional[str]:
+        if not self.available:
+            return None
+        stat = self.path.stat()
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    def stats(self) -> dict:
+        return self.pool.stats()
+
+
+# ============================================================
+# EXPORT FROM THE EVENT STORE
+# ============================================================
+
+def _from_sql(values: tuple, arrow_type: pa.DataType) -> pa.Array:
+    """Convert a column of SQLite values back to its Arrow type (see export_event_store)."""
+    if pa.types.is_dictionary(arrow_type):
+        return pa.array(values, pa.string())
+    if pa.types.is_date(arrow_type):
+        return pc.cast(pa.array(values, pa.string()), pa.timestamp('s')).cast(arrow_type)
+    if pa.types.is_timestamp(arrow_type):
+        return pa.array(values, pa.int64()).cast(arrow_type)
+    if pa.types.is_boolean(arrow_type):
+        return pa.array(values, pa.int8()).cast(arrow_type)
+    return pa.array(values, arrow_type)
+
+
+def _sql_type(arrow_type: pa.DataType) -> str:
+    if pa.types.is_dictionary(arrow_type) or pa.types.is_string(arrow_type) or pa.types.is_date(arrow_type):
+        return 'TEXT'
+    return 'INTEGER'
+
+
+def export_event_store(events_path: str, db_path: str, batch_size: int = 500_000, verbose: bool = False) -> dict:
+    """
+    Copy the Parquet event store into a new SQLite database file.
+
+    Dates are stored as ISO text, timestamps as epoch seconds and flags as
+    0/1. The file is written next to the target and moved into place at the end.
+
+    Args:
+        events_path: Event store directory
+        db_path: Database file to (re)create
+        batch_size: Rows inserted per batch
+        verbose: Print progress
+
+    Returns:
+        dict with rows and seconds
+    """
+    from .event_store import EventStore
+
+    started = time.perf_counter()
+    store = EventStore(events_path, batch_size=batch_size)
+    if not store.available:
+        raise FileNotFoundError(f"No event store data in {events_path}")
+
+    fields = [pa.field(DATE_COL, pa.date32())] + list(EVENTS_SCHEMA)
+    target = Path(db_path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix('.tmp')
+    tmp.unlink(missing_ok=True)
+
+    connection = sqlite3.connect(tmp)
+    columns = ', '.join(f"{_quote(field.name)} {_sql_type(field.type)}" for field in fields)
+    connection.execute(f"CREATE TABLE {TABLE} ({columns})")
+    insert = f"INSERT INTO {TABLE} VALUES ({', '.join('?' * len(fields))})"
+
+    rows = 0
+    for batch in store.scan([field.name for field in fields]):
+        values = []
+        for field in fields:
+            column = batch.column(field.name)
+            if pa.types.is_dictionary(column.type) or pa.types.is_date(column.type):
+                column = pc.cast(column, pa.string())
+            elif pa.types.is_timestamp(column.type):
+                column = pc.cast(column, pa.int64())
+            elif pa.types.is_boolean(column.type):
+                column = pc.cast(column, pa.int8())
+            values.append(column.to_pylist())
+        connection.executemany(insert, zip(*values))
+        rows += batch.num_rows
+        if verbose:
+            print(f"{rows:,} rows")
+
+    connection.execute(f"CREATE INDEX idx_{TABLE}_{DATE_COL} ON {TABLE} ({_quote(DATE_COL)})")
+    connection.commit()
+    connection.close()
+    os.replace(tmp, target)
+    return {'rows': rows, 'seconds': time.perf_counter() - started}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the SQLite data source from the Parquet event store.")
+    parser.add_argument("--events", default=DATA_CONFIG["events_path"], help="Event store directory")
+    parser.add_argument("--out", default=DATA_CONFIG["sqlite_path"], help="Database file")
+    parser.add_argument("--batch-size", type=int, default=500_000)
+    args = parser.parse_args()
+
+    summary = export_event_store(args.events, args.out, batch_size=args.batch_size, verbose=True)
+    print(f"Wrote {summary['rows']:,} rows to {args.out} in {summary['seconds']:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
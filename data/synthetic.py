@@ -0,0 +1,326 @@
+"""
+Seeded, vectorized synthetic session generator for load testing.
+
+Writes a hive-partitioned Parquet dataset (one directory per day, one file per
+chunk) with the event store schema, so every page and chart can be benchmarked
+against production-like volumes.
+
+Usage:
+    python -m data.synthetic --sessions 1000000 --days 31 --out data/store/events
+"""
+
+import argparse
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .hashing import hash_to_unit
+from .schema import (
+    EVENTS_SCHEMA,
+    DATE_COL,
+    TIMESTAMP_COL,
+    USER_COL,
+    COUNTRY_COL,
+    DEVICE_COL,
+    USER_TYPE_COL,
+    SEGMENT_COL,
+    SOURCE_COL,
+    CONCEPT_COL,
+    CATEGORY_COL,
+    INTENT_COL,
+    REGISTER_COL,
+    BOUNCE_COL,
+    DURATION_COL,
+    ENGAGEMENT_COL,
+    COUNTRIES,
+    DEVICES,
+    USER_TYPES,
+    SEGMENTS,
+    SOURCES,
+    CONCEPTS,
+    CATEGORIES
+)
+
+
+# ============================================================
+# DISTRIBUTIONS
+# ============================================================
+
+# Share of users per country (same order as COUNTRIES)
+COUNTRY_WEIGHTS = [0.42, 0.24, 0.14, 0.10, 0.06, 0.04]
+
+# Share of users per primary device (same order as DEVICES)
+DEVICE_WEIGHTS = [0.68, 0.26, 0.04, 0.02]
+
+# Probability that a session happens on a device other than the user's primary one
+DEVICE_SWITCH_RATE = 0.15
+
+# Traffic share per source / medium: direct and organic search dominate, long tail after
+SOURCE_WEIGHTS = 1.0 / np.arange(1, len(SOURCES) + 1) ** 1.1
+
+# Interest per Wattson concept / category: Zipf-like, news topics first
+CONCEPT_WEIGHTS = 1.0 / np.arange(1, len(CONCEPTS) + 1) ** 0.8
+CATEGORY_WEIGHTS = 1.0 / np.arange(1, len(CATEGORIES) + 1) ** 0.7
+
+# Traffic by day of week (Monday first) and hour of day
+WEEKDAY_FACTORS = [1.10, 1.08, 1.05, 1.03, 0.98, 0.86, 0.90]
+HOUR_WEIGHTS = [
+    0.8, 0.5, 0.3, 0.2, 0.2, 0.4, 1.2, 2.6, 3.8, 4.2, 4.0, 3.8,
+    3.9, 4.0, 3.6, 3.4, 3.3, 3.5, 3.9, 4.4, 4.6, 4.1, 2.9, 1.6
+]
+
+# Average sessions per user over the whole period
+SESSIONS_PER_USER = 4.0
+
+# Skew of the user activity: higher values concentrate sessions on fewer users
+ACTIVITY_SKEW = 2.5
+
+# Probability of registration intention per device (same order as DEVICES)
+INTENT_RATE_BY_DEVICE = [0.09, 0.14, 0.07, 0.03]
+
+# Intention multiplier for newsletter/marketing traffic
+EMAIL_INTENT_LIFT = 2.0
+
+# Probability of finishing the registration once the intention is shown
+REGISTER_RATE = 0.17
+
+# Bounce probability of sessions without intention
+BOUNCE_RATE = 0.45
+
+# Session duration (log-normal, seconds) and share of engaged time
+DURATION_LOG_MEAN = 6.2
+DURATION_LOG_SIGMA = 1.0
+BOUNCE_MAX_SECONDS = 30
+
+
+def _normalize(weights) -> np.ndarray:
+    weights = np.asarray(weights, dtype=np.float64)
+    return weights / weights.sum()
+
+
+def _pick(rng: np.random.Generator, weights, size: int) -> np.ndarray:
+    """Draw category codes with the given weights (vectorized inverse CDF)."""
+    cdf = np.cumsum(_normalize(weights))
+    return np.minimum(np.searchsorted(cdf, rng.random(size), side='right'), len(cdf) - 1)
+
+
+def _pick_by_unit(units: np.ndarray, weights) -> np.ndarray:
+    """Map pseudo-uniform floats to category codes with the given weights."""
+    cdf = np.cumsum(_normalize(weights))
+    return np.minimum(np.searchsorted(cdf, units, side='right'), len(cdf) - 1)
+
+
+def _dictionary(codes: np.ndarray, vocabulary: list, field: pa.Field) -> pa.DictionaryArray:
+    index_type = field.type.index_type.to_pandas_dtype()
+    return pa.DictionaryArray.from_arrays(codes.astype(index_type), pa.array(vocabulary, pa.string()))
+
+
+# ============================================================
+# GENERATION
+# ============================================================
+
+def daily_volumes(n_sessions: int, start_date: date, days: int, seed: int = 42) -> np.ndarray:
+    """
+    Split the total number of sessions across days.
+
+    Applies weekday seasonality, a mild growth trend and noise.
+
+    Args:
+        n_sessions: Total number of sessions
+        start_date: First day
+        days: Number of days
+        seed: Random seed
+
+    Returns:
+        Integer array with the number of sessions per day (sums to n_sessions)
+    """
+    rng = np.random.default_rng([seed, 0])
+    weekdays = (np.arange(days) + start_date.weekday()) % 7
+    trend = np.linspace(1.0, 1.25, days)
+    noise = rng.lognormal(0.0, 0.08, days)
+    weights = np.asarray(WEEKDAY_FACTORS)[weekdays] * trend * noise
+    return rng.multinomial(n_sessions, _normalize(weights))
+
+
+def generate_sessions(
+    day: date,
+    n_sessions: int,
+    n_users: int,
+    seed: int = 42,
+    chunk_index: int = 0
+) -> pa.Table:
+    """
+    Generate the sessions of one chunk of a day.
+
+    User attributes (country, primary device, segment) are derived from a hash
+    of the user id, so they are consistent across days and chunks. Each chunk
+    has its own random stream, so any chunk can be regenerated on its own.
+
+    Args:
+        day: Day of the sessions
+        n_sessions: Number of sessions in the chunk
+        n_users: Size of the user population
+        seed: Random seed
+        chunk_index: Index of the chunk within the day
+
+    Returns:
+        Arrow table with EVENTS_SCHEMA
+    """
+    rng = np.random.default_rng([seed, day.toordinal(), chunk_index])
+    fields = {field.name: field for field in EVENTS_SCHEMA}
+
+    # Users: a few heavy readers (low ids) account for most sessions
+    activity = rng.random(n_sessions) ** ACTIVITY_SKEW
+    users = (activity * n_users).astype(np.int64)
+    country = _pick_by_unit(hash_to_unit(users, salt=1), COUNTRY_WEIGHTS)
+    device = _pick_by_unit(hash_to_unit(users, salt=2), DEVICE_WEIGHTS)
+    switch = rng.random(n_sessions) < DEVICE_SWITCH_RATE
+    device[switch] = _pick(rng, DEVICE_WEIGHTS, int(switch.sum()))
+
+    # Segment from the user's activity quantile: heavy readers are low ids
+    rank = users / max(n_users, 1)
+    segment = np.searchsorted([0.02, 0.08, 0.25], rank, side='right')
+    segment = len(SEGMENTS) - 1 - segment
+
+    # New users are more likely among light readers
+    new_user = rng.random(n_sessions) < 0.05 + 0.5 * rank
+
+    # Timestamps following the hourly traffic profile
+    hours = _pick(rng, HOUR_WEIGHTS, n_sessions)
+    seconds = hours * 3600 + rng.integers(0, 3600, n_sessions)
+    day_start = np.datetime64(day, 's')
+    timestamps = day_start + seconds.astype('timedelta64[s]')
+
+    source = _pick(rng, SOURCE_WEIGHTS, n_sessions)
+    concept = _pick(rng, CONCEPT_WEIGHTS, n_sessions)
+    category = _pick(rng, CATEGORY_WEIGHTS, n_sessions)
+
+    # Funnel: intention depends on device and source; registration requires intention
+    intent_rate = np.asarray(INTENT_RATE_BY_DEVICE)[device]
+    is_email = np.isin(source, [SOURCES.index('email / newsletter'), SOURCES.index('email / marketing')])
+    intent_rate = np.where(is_email, intent_rate * EMAIL_INTENT_LIFT, intent_rate)
+    intent = rng.random(n_sessions) < intent_rate
+    register = intent & (rng.random(n_sessions) < REGISTER_RATE)
+    bounce = ~intent & (rng.random(n_sessions) < BOUNCE_RATE)
+
+    duration = rng.lognormal(DURATION_LOG_MEAN, DURATION_LOG_SIGMA, n_sessions)
+    duration = np.where(bounce, rng.integers(0, BOUNCE_MAX_SECONDS, n_sessions), duration)
+    engagement = duration * rng.beta(2.0, 5.0, n_sessions)
+
+    return pa.Table.from_arrays(
+        [
+            pa.array(timestamps, pa.timestamp('s')),
+            pa.array(users, pa.int64()),
+            _dictionary(country, COUNTRIES, fields[COUNTRY_COL]),
+            _dictionary(device, DEVICES, fields[DEVICE_COL]),
+            _dictionary(new_user.astype(np.int8), USER_TYPES, fields[USER_TYPE_COL]),
+            _dictionary(segment, SEGMENTS, fields[SEGMENT_COL]),
+            _dictionary(source, SOURCES, fields[SOURCE_COL]),
+            _dictionary(concept, CONCEPTS, fields[CONCEPT_COL]),
+            _dictionary(category, CATEGORIES, fields[CATEGORY_COL]),
+            pa.array(intent),
+            pa.array(register),
+            pa.array(bounce),
+            pa.array(duration.astype(np.int32)),
+            pa.array(engagement.astype(np.int32)),
+        ],
+        schema=EVENTS_SCHEMA
+    )
+
+
+def write_dataset(
+    path: str,
+    n_sessions: int,
+    start_date: date = date(2026, 1, 1),
+    days: int = 31,
+    seed: int = 42,
+    chunk_size: int = 1_000_000,
+    n_users: int = None,
+    compression: str = 'zstd',
+    verbose: bool = False
+) -> dict:
+    """
+    Generate a synthetic session dataset as chunked, day-partitioned Parquet.
+
+    Memory use is bounded by chunk_size, whatever the total volume.
+
+    Args:
+        path: Output directory (fecha=YYYY-MM-DD/part-NNNNN.parquet)
+        n_sessions: Total number of sessions
+        start_date: First day
+        days: Number of days
+        seed: Random seed (same seed, same data)
+        chunk_size: Maximum sessions per file
+        n_users: Size of the user population (default: n_sessions / SESSIONS_PER_USER)
+        compression: Parquet compression codec
+        verbose: If True, prints progress per day
+
+    Returns:
+        dict with sessions, users, files, bytes and seconds
+    """
+    output = Path(path)
+    if n_users is None:
+        n_users = max(int(n_sessions / SESSIONS_PER_USER), 1)
+
+    started = time.perf_counter()
+    files = 0
+    total_bytes = 0
+
+    for offset, volume in enumerate(daily_volumes(n_sessions, start_date, days, seed)):
+        day = start_date + timedelta(days=offset)
+        partition = output / f"{DATE_COL}={day.isoformat()}"
+        partition.mkdir(parents=True, exist_ok=True)
+
+        for chunk_index, chunk_start in enumerate(range(0, int(volume), chunk_size)):
+            size = min(chunk_size, int(volume) - chunk_start)
+            table = generate_sessions(day, size, n_users, seed, chunk_index)
+            file_path = partition / f"part-{chunk_index:05d}.parquet"
+            pq.write_table(table, file_path, compression=compression)
+            files += 1
+            total_bytes += file_path.stat().st_size
+
+        if verbose:
+            print(f"{day.isoformat()}: {int(volume):,} sessions")
+
+    return {
+        'sessions': int(n_sessions),
+        'users': n_users,
+        'files': files,
+        'bytes': total_bytes,
+        'seconds': time.perf_counter() - started,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic session dataset.")
+    parser.add_argument("--sessions", type=int, default=1_000_000, help="Total number of sessions")
+    parser.add_argument("--start", type=date.fromisoformat, default=date(2026, 1, 1), help="First day (YYYY-MM-DD)")
+    parser.add_argument("--days", type=int, default=31, help="Number of days")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--chunk-size", type=int, default=1_000_000, help="Maximum sessions per file")
+    parser.add_argument("--users", type=int, default=None, help="Size of the user population")
+    parser.add_argument("--out", default="data/store/events", help="Output directory")
+    args = parser.parse_args()
+
+    summary = write_dataset(
+        args.out,
+        n_sessions=args.sessions,
+        start_date=args.start,
+        days=args.days,
+        seed=args.seed,
+        chunk_size=args.chunk_size,
+        n_users=args.users,
+        verbose=True
+    )
+    print(
+        f"{summary['sessions']:,} sessions, {summary['users']:,} users, {summary['files']} files, "
+        f"{summary['bytes'] / 1024 ** 2:,.1f} MB in {summary['seconds']:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
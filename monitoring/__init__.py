@@ -0,0 +1,7 @@
+"""
+Dashboard monitoring module.
+Contains timing and profiling helpers for page reruns.
+"""
+
+from .timing import start_run, section, finish_run, get_current_run, get_last_run, log_run
+from .instrumentation import instrumented, record_call, summarize_calls
@@ -0,0 +1,82 @@
+"""
+Opt-in instrumentation of the dashboard hot path.
+Decorated functions record their wall time in the current run when profiling is on.
+"""
+
+import functools
+import time
+from typing import Callable
+
+import pandas as pd
+
+from .timing import get_current_run
+
+
+def record_call(kind: str, name: str, seconds: float):
+    """
+    Add a timed call to the current run (no-op unless the run is profiled).
+    
+    Args:
+        kind: Call category ('data', 'chart', 'render')
+        name: Function name
+        seconds: Wall time
+    """
+    run = get_current_run()
+    if run is not None and run['profile']:
+        section = run['_section'][0] if run['_section'] else None
+        run['calls'].append({'kind': kind, 'name': name, 'seconds': seconds, 'section': section})
+
+
+def instrumented(kind: str, name: str = None) -> Callable:
+    """
+    Time every call of a function into the current run.
+    
+    When profiling is off the only overhead is a context variable lookup.
+    
+    Args:
+        kind: Call category ('data', 'chart', 'render')
+        name: Name to report (default: function name)
+        
+    Returns:
+        Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            run = get_current_run()
+            if run is None or not run['profile']:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record_call(kind, label, time.perf_counter() - started)
+
+        return wrapper
+
+    return decorator
+
+
+def summarize_calls(run: dict) -> pd.DataFrame:
+    """
+    Aggregate the recorded calls of a run.
+    
+    Args:
+        run: Run record
+        
+    Returns:
+        DataFrame with kind, name, calls, total_ms, max_ms (slowest first)
+    """
+    columns = ['kind', 'name', 'calls', 'total_ms', 'max_ms']
+    if not run or not run.get('calls'):
+        return pd.DataFrame(columns=columns)
+    df = pd.DataFrame(run['calls'])
+    df['ms'] = df['seconds'] * 1000
+    summary = df.groupby(['kind', 'name'], as_index=False).agg(
+        calls=('ms', 'size'),
+        total_ms=('ms', 'sum'),
+        max_ms=('ms', 'max')
+    )
+    return summary.sort_values('total_ms', ascending=False, ignore_index=True)[columns]
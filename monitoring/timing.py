@@ -0,0 +1,145 @@
+"""
+Per-rerun timing recorder.
+A page calls start_run() at the top, section() before each block and finish_run() at the end.
+"""
+
+import json
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+
+# Run being recorded in the current script thread
+_current_run: ContextVar[Optional[dict]] = ContextVar('dashboard_current_run', default=None)
+
+# Logger for the structured JSON lines (configured on first use)
+LOGGER_NAME = 'dashboard.timing'
+_logger = None
+
+# Last finished run of the process (read by the benchmark runner)
+_last_run = None
+_last_run_lock = threading.Lock()
+
+
+def start_run(page: str, profile: bool = False, tags: dict = None, json_log: bool = False) -> dict:
+    """
+    Start recording a page rerun.
+    
+    Args:
+        page: Page name
+        profile: If True, instrumented functions record their calls (see instrumentation.py)
+        tags: Extra fields for the JSON log line (e.g. session id)
+        json_log: If True and profiled, the finished run is logged as a JSON line
+        
+    Returns:
+        Run record (dict with page, started, sections, calls)
+    """
+    run = {
+        'page': page,
+        'started': time.time(),
+        'profile': profile,
+        'json_log': json_log,
+        'tags': tags or {},
+        '_start': time.perf_counter(),
+        '_section': None,
+        'sections': {},
+        'calls': [],
+    }
+    _current_run.set(run)
+    return run
+
+
+def _close_section(run: dict, now: float):
+    """Add the elapsed time of the open section to its total."""
+    if run['_section'] is not None:
+        name, started = run['_section']
+        run['sections'][name] = run['sections'].get(name, 0.0) + (now - started)
+        run['_section'] = None
+
+
+def section(name: str):
+    """
+    Start timing a page section; it lasts until the next section() or finish_run().
+    
+    Args:
+        name: Section name
+    """
+    run = _current_run.get()
+    if run is None:
+        return
+    now = time.perf_counter()
+    _close_section(run, now)
+    run['_section'] = (name, now)
+
+
+def finish_run() -> Optional[dict]:
+    """
+    Stop recording the current rerun.
+    
+    Returns:
+        Run record with total and per-section seconds, or None if no run was started
+    """
+    global _last_run
+    run = _current_run.get()
+    if run is None:
+        return None
+    now = time.perf_counter()
+    _close_section(run, now)
+    run['total'] = now - run.pop('_start')
+    run.pop('_section')
+    _current_run.set(None)
+    with _last_run_lock:
+        _last_run = run
+    if run['profile'] and run['json_log']:
+        log_run(run)
+    return run
+
+
+def _get_logger() -> logging.Logger:
+    """Return the timing logger, adding a plain stderr handler if none is configured."""
+    global _logger
+    if _logger is None:
+        logger = logging.getLogger(LOGGER_NAME)
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            logger.addHandler(handler)
+            logger.propagate = False
+        logger.setLevel(logging.INFO)
+        _logger = logger
+    return _logger
+
+
+def log_run(run: dict):
+    """
+    Emit a finished run as one structured JSON log line.
+    
+    Args:
+        run: Run record returned by finish_run
+    """
+    record = {
+        'event': 'rerun',
+        'page': run['page'],
+        'started': run['started'],
+        'total_ms': round(run['total'] * 1000, 3),
+        'sections_ms': {name: round(seconds * 1000, 3) for name, seconds in run['sections'].items()},
+        'calls': [
+            {'kind': call['kind'], 'name': call['name'], 'ms': round(call['seconds'] * 1000, 3)}
+            for call in run['calls']
+        ],
+        **run['tags'],
+    }
+    _get_logger().info(json.dumps(record, ensure_ascii=False))
+
+
+def get_current_run() -> Optional[dict]:
+    """Return the run being recorded in this thread, if any."""
+    return _current_run.get()
+
+
+def get_last_run() -> Optional[dict]:
+    """Return the last finished run of the process."""
+    with _last_run_lock:
+        return _last_run
@@ -1,15 +1,14 @@
 """
 Main Page - Behavior & Registration Conversion Dashboard
 Modularized version for scalability and reusability.
+
+Each section is declared with the filters it depends on and rendered as an
+isolated fragment (see config/components/sections), so a filter used by a
+single section only reruns that section. Sections also declare their data
+sources, which are loaded concurrently (see data/loader.py).
 """
 
 import streamlit as st
-import sys
-from pathlib import Path
-
-# Add root directory to path for imports
-ROOT_DIR = Path(__file__).parent.parent
-sys.path.insert(0, str(ROOT_DIR))
 
 # === CUSTOM MODULE IMPORTS ===
 from config import (
@@ -21,8 +20,15 @@ from config import (
     render_section_title,
     render_info_box,
     render_chart_container,
-    render_sidebar_filters
+    render_table_container,
+    render_period_filter,
+    render_country_filter,
+    render_device_filter,
+    render_sections,
+    start_page_run,
+    render_timing_panel
 )
+from data.filters import FilterPlan
 from data.mock_data import (
     get_funnel_data,
     get_evolution_data,
@@ -35,19 +41,14 @@ from data.mock_data import (
     get_wattson_category_data,
     get_kpi_data
 )
-from charts import (
-    create_funnel_chart,
-    create_map,
-    get_map_config,
-    create_bar_chart,
-    create_stacked_bar_chart,
-    create_line_chart,
-    create_heatmap_table,
-    style_dataframe_heatmap,
-    render_kpi_row
-)
+# Chart factories are resolved on first use by each section (see charts/__init__.py)
+import charts
+from monitoring import section, finish_run
+
+start_page_run("main_page")
 
 # === LOAD GLOBAL CSS ===
+section("header")
 st.markdown(get_all_css(), unsafe_allow_html=True)
 
 # === HEADER ===
@@ -62,193 +63,273 @@ render_header(
 ALL_DEVICES = ['Mobile', 'Desktop', 'Tablet', 'Smart TV']
 ALL_COUNTRIES = ["Argentina", "México", "España", "Colombia"]
 
-# === SIDEBAR FILTERS ===
-filters = render_sidebar_filters(
-    devices=ALL_DEVICES,
-    countries=ALL_COUNTRIES,
-    show_top_n=False,
-    show_sort_by=False
-)
 
-# Extract filter values
-selected_countries = filters.get('pais', ALL_COUNTRIES)
-selected_devices = filters.get('dispositivo', ALL_DEVICES)
-selected_period = filters.get('periodo', [])
+def compile_filters(filters: dict) -> FilterPlan:
+    """
+    Compile the filter values received by a section.
 
+    Selecting every device is a no-op; the country options do not cover
+    every country in the data, so they always filter.
+    """
+    return FilterPlan.from_filters(filters, options={'dispositivo': ALL_DEVICES})
 
-# Convert period to tuple if it has values
-date_range = tuple(selected_period) if len(selected_period) == 2 else None
 
-# === LOAD DATA WITH FILTERS ===
-funnel_data = get_funnel_data(countries=selected_countries)
-devices_df = get_device_data(devices=selected_devices)
-kpi_data = get_kpi_data(countries=selected_countries)
-country_data = get_country_data(countries=selected_countries)
-evolution_df = get_evolution_data(date_range=date_range)
+# ============================================================
+# SECTIONS
+# ============================================================
 
-# === MAIN KPIs ===
-render_kpi_row(kpi_data)
+def kpi_sources(filters: dict) -> dict:
+    """Data sources of the KPI section."""
+    plan = compile_filters(filters)
+    return {'kpis': (get_kpi_data, {'countries': plan.countries})}
 
-render_section_divider()
 
-# === SECTION: FUNNEL AND MAP ===
-left_col, right_col = st.columns([1, 1])
+def render_kpis(filters: dict, data):
+    """Main KPIs."""
+    charts.render_kpi_row(data['kpis'])
+    render_section_divider()
 
-with left_col:
-    render_section_title("Funnel de Registro")
-    
-    fig_funnel = create_funnel_chart(
-        etapas=funnel_data['Etapa'],
-        valores=funnel_data['Cantidad'],
-        title="Embudo de Conversión - Infobae",
-        subtitle="Escala logarítmica aplicada para visibilidad",
-        height=CHART_CONFIG["funnel_height"]
-    )
-    
-    render_chart_container(fig_funnel)
-    render_info_box(
-        "Se recomienda implementar la medición de campos del formulario para "
-        "identificar puntos de fricción y definir niveles de interés gradual "
-        "según el progreso del usuario."
-    )
 
-with right_col:
-    render_section_title("Usuarios por País")
-    
-    # Show message if no countries selected
-    if country_data.empty:
-        st.warning("Selecciona al menos un país para ver el mapa.")
-    else:
-        fig_mapa = create_map(
-            df=country_data,
-            locations_col='ISO',
-            color_col='Registros',
-            hover_name_col='Pais',
-            hover_data_cols=['Intención', 'Registros'],
-            title='Registros e Intención por País',
-            height=CHART_CONFIG["map_height"]
+def funnel_map_sources(filters: dict) -> dict:
+    """Data sources of the funnel and map section."""
+    plan = compile_filters(filters)
+    return {
+        'funnel': (get_funnel_data, {
+            'countries': plan.countries, 'devices': plan.devices, 'date_range': plan.date_range
+        }),
+        'country': (get_country_data, {'countries': plan.countries}),
+    }
+
+
+def render_funnel_and_map(filters: dict, data):
+    """Registration funnel and users by country."""
+    funnel_data = data['funnel']
+    country_data = data['country']
+
+    left_col, right_col = st.columns([1, 1])
+
+    with left_col:
+        render_section_title("Funnel de Registro")
+
+        fig_funnel = charts.create_funnel_chart(
+            etapas=funnel_data['Etapa'],
+            valores=funnel_data['Cantidad'],
+            title="Embudo de Conversión - Infobae",
+            subtitle="Escala logarítmica aplicada para visibilidad",
+            height=CHART_CONFIG["funnel_height"]
         )
-        
-        render_chart_container(fig_mapa, config=get_map_config())
 
-# === SECTION: USER CLASSIFICATION ===
-render_section_divider()
-render_section_title("Clasificación de Usuarios")
+        render_chart_container(fig_funnel)
+        render_info_box(
+            "Se recomienda implementar la medición de campos del formulario para "
+            "identificar puntos de fricción y definir niveles de interés gradual "
+            "según el progreso del usuario."
+        )
 
-col_device, col_session, col_segment = st.columns([1, 1, 1])
+    with right_col:
+        render_section_title("Usuarios por País")
 
-with col_device:
-    if devices_df.empty:
-        st.warning("Selecciona al menos un dispositivo.")
-    else:
-        fig_device = create_bar_chart(
-            df=devices_df,
-            dimension_x_axis='Dispositivo',
+        # Show message if no countries selected
+        if country_data.empty:
+            st.warning("Selecciona al menos un país para ver el mapa.")
+        else:
+            fig_mapa = charts.create_map(
+                df=country_data,
+                locations_col='ISO',
+                color_col='Registros',
+                hover_name_col='Pais',
+                hover_data_cols=['Intención', 'Registros'],
+                title='Registros e Intención por País',
+                height=CHART_CONFIG["map_height"],
+                geometry='served'
+            )
+
+            render_chart_container(fig_mapa, config=charts.get_map_config())
+
+
+def classification_sources(filters: dict) -> dict:
+    """Data sources of the classification section."""
+    plan = compile_filters(filters)
+    return {
+        'devices': (get_device_data, {'devices': plan.devices}),
+        'session_history': (get_session_history_data, {}),
+        'segment': (get_segment_data, {}),
+    }
+
+
+def render_classification(filters: dict, data):
+    """User classification by device, session history and consumption segment."""
+    devices_df = data['devices']
+
+    render_section_divider()
+    render_section_title("Clasificación de Usuarios")
+
+    col_device, col_session, col_segment = st.columns([1, 1, 1])
+
+    with col_device:
+        if devices_df.empty:
+            st.warning("Selecciona al menos un dispositivo.")
+        else:
+            fig_device = charts.create_bar_chart(
+                df=devices_df,
+                dimension_x_axis='Dispositivo',
+                dimension_col='Registrado',
+                breakdown_col='Con Intención',
+                title='Según Dispositivo y Estado',
+                height=CHART_CONFIG["bar_height"]
+            )
+            render_chart_container(fig_device)
+
+    with col_session:
+        session_df = data['session_history']
+        fig_session = charts.create_bar_chart(
+            df=session_df,
+            dimension_x_axis='Tipo Usuario',
             dimension_col='Registrado',
             breakdown_col='Con Intención',
-            title='Según Dispositivo y Estado',
+            title='Según historial de sesiones',
             height=CHART_CONFIG["bar_height"]
         )
-        render_chart_container(fig_device)
-
-with col_session:
-    session_df = get_session_history_data()
-    fig_session = create_bar_chart(
-        df=session_df,
-        dimension_x_axis='Tipo Usuario',
-        dimension_col='Registrado',
-        breakdown_col='Con Intención',
-        title='Según historial de sesiones',
-        height=CHART_CONFIG["bar_height"]
-    )
-    render_chart_container(fig_session)
-
-with col_segment:
-    segment_df = get_segment_data()
-    fig_segment = create_heatmap_table(
-        df=segment_df,
-        index_col='Segmento Consumo',
-        title='Según segmento consumo',
-        height=CHART_CONFIG["heatmap_height"],
-        show_colorbar=False
-    )
-    render_chart_container(fig_segment)
+        render_chart_container(fig_session)
 
-# === SECTION: SOURCE/MEDIUM TABLE ===
-render_section_title("Detalle por Fuente / Medio")
+    with col_segment:
+        segment_df = data['segment']
+        fig_segment = charts.create_heatmap_table(
+            df=segment_df,
+            index_col='Segmento Consumo',
+            title='Según segmento consumo',
+            height=CHART_CONFIG["heatmap_height"],
+            show_colorbar=False
+        )
+        render_chart_container(fig_segment)
+
+
+def source_medium_sources(filters: dict) -> dict:
+    """Data sources of the source / medium section."""
+    return {'source_medium': (get_source_medium_data, {})}
+
+
+def render_source_medium(filters: dict, data):
+    """Source / medium detail table."""
+    render_section_title("Detalle por Fuente / Medio")
+
+    source_df = data['source_medium']
+    table, column_config = charts.heatmap_table(source_df)
+    if column_config is not None:
+        rows = f"{len(table):,}".replace(',', '.')
+        st.caption(f"Tabla de {rows} filas: los valores se muestran como barras en lugar de colores por celda.")
+
+    render_table_container(table, column_config=column_config)
+
+
+def evolution_sources(filters: dict) -> dict:
+    """Data sources of the evolution section."""
+    plan = compile_filters(filters)
+    return {'evolution': (get_evolution_data, {'date_range': plan.date_range})}
+
+
+def render_evolution(filters: dict, data):
+    """Temporal evolution of users and sessions."""
+    evolution_df = data['evolution']
+
+    render_section_title("Evolución de Usuarios: Intención vs Registro")
+
+    if evolution_df.empty:
+        st.warning("No hay datos para el periodo seleccionado.")
+    else:
+        fig_evolution_users = charts.create_line_chart(
+            df=evolution_df,
+            x_col='Fecha',
+            y_cols=['Intención de Registro', 'Registro'],
+            colors=[COLORS["primary"], COLORS["secondary"]],
+            title='📈 Evolución de Usuarios: Intención vs Registro',
+            y_title='Usuarios',
+            date_format='%d/%m',
+            dtick='D2'
+        )
+        render_chart_container(fig_evolution_users)
 
-source_df = get_source_medium_data()
-styled_df = style_dataframe_heatmap(source_df)
+    render_section_title("Evolución de Sesiones: Intención vs Registro")
+
+    if not evolution_df.empty:
+        fig_evolution_sessions = charts.create_line_chart(
+            df=evolution_df,
+            x_col='Fecha',
+            y_cols=['Intención de Registro', 'Registro'],
+            colors=[COLORS["primary"], COLORS["secondary"]],
+            title='📈 Evolución de Sesiones: Intención vs Registro',
+            y_title='Sesiones',
+            date_format='%d/%m',
+            dtick='D2'
+        )
+        render_chart_container(fig_evolution_sessions)
 
-st.dataframe(styled_df, use_container_width=True, hide_index=True)
 
-# === SECTION: TEMPORAL EVOLUTION ===
-render_section_title("Evolución de Usuarios: Intención vs Registro")
+def wattson_sources(filters: dict) -> dict:
+    """Data sources of the Wattson section."""
+    return {
+        'concepts': (get_concepts_data, {}),
+        'categories': (get_wattson_category_data, {}),
+    }
 
-if evolution_df.empty:
-    st.warning("No hay datos para el periodo seleccionado.")
-else:
-    fig_evolution_users = create_line_chart(
-        df=evolution_df,
-        x_col='Fecha',
-        y_cols=['Intención de Registro', 'Registro'],
-        colors=[COLORS["primary"], COLORS["secondary"]],
-        title='📈 Evolución de Usuarios: Intención vs Registro',
+
+def render_wattson(filters: dict, data):
+    """User affinity by Wattson concept and category."""
+    render_section_title("Afinidad de Usuarios - Modelo Wattson")
+
+    # Concepts (highest total first; the long tail is grouped into "Otros")
+    concepts_df = data['concepts']
+    fig_concepts = charts.create_stacked_bar_chart(
+        df=concepts_df,
+        x_col='Concepto',
+        y_cols=['Usuarios con Intención', 'Usuarios Registrados'],
+        colors=[COLORS["secondary"], COLORS["primary"]],
+        title='Conceptos - Usuarios con Intención vs Registrados',
+        x_title='Concepto',
         y_title='Usuarios',
-        date_format='%d/%m',
-        dtick='D2'
+        rotate_labels=True,
+        barmode='stack',
+        ranking={'k': CHART_CONFIG["ranking_top_k"], 'tail': 'Otros'}
     )
-    render_chart_container(fig_evolution_users)
-
-render_section_title("Evolución de Sesiones: Intención vs Registro")
-
-if not evolution_df.empty:
-    fig_evolution_sessions = create_line_chart(
-        df=evolution_df,
-        x_col='Fecha',
-        y_cols=['Intención de Registro', 'Registro'],
-        colors=[COLORS["primary"], COLORS["secondary"]],
-        title='📈 Evolución de Sesiones: Intención vs Registro',
-        y_title='Sesiones',
-        date_format='%d/%m',
-        dtick='D2'
+    render_chart_container(fig_concepts)
+
+    # Wattson Categories
+    categories_df = data['categories']
+    fig_categories = charts.create_stacked_bar_chart(
+        df=categories_df,
+        x_col='Categoría Wattson',
+        y_cols=['Usuarios con Intención', 'Usuarios Registrados'],
+        colors=[COLORS["secondary"], COLORS["primary"]],
+        title='Usuarios por Categoría Wattson',
+        x_title='Categoría',
+        y_title='Usuarios',
+        barmode='stack',
+        ranking={'k': CHART_CONFIG["ranking_top_k"], 'tail': 'Otros'}
     )
-    render_chart_container(fig_evolution_sessions)
-
-# === SECTION: WATTSON AFFINITY ===
-render_section_title("Afinidad de Usuarios - Modelo Wattson")
-
-# Concepts
-concepts_df = get_concepts_data()
-concepts_df["totals"] = concepts_df["Usuarios con Intención"] + concepts_df["Usuarios Registrados"]
-concepts_df = concepts_df.sort_values(by='totals', ascending=False)
-concepts_df.drop(columns=['totals'], inplace=True)
-fig_concepts = create_stacked_bar_chart(
-    df=concepts_df,
-    x_col='Concepto',
-    y_cols=['Usuarios con Intención', 'Usuarios Registrados'],
-    colors=[COLORS["secondary"], COLORS["primary"]],
-    title='Conceptos - Usuarios con Intención vs Registrados',
-    x_title='Concepto',
-    y_title='Usuarios',
-    rotate_labels=True,
-    barmode='stack'
-)
-render_chart_container(fig_concepts)
-
-# Wattson Categories
-categories_df = get_wattson_category_data()
-categories_df["totals"] = categories_df["Usuarios con Intención"] + categories_df["Usuarios Registrados"]
-categories_df = categories_df.sort_values(by='totals', ascending=False)
-categories_df.drop(columns=['totals'], inplace=True)
-fig_categories = create_stacked_bar_chart(
-    df=categories_df,
-    x_col='Categoría Wattson',
-    y_cols=['Usuarios con Intención', 'Usuarios Registrados'],
-    colors=[COLORS["secondary"], COLORS["primary"]],
-    title='Usuarios por Categoría Wattson',
-    x_title='Categoría',
-    y_title='Usuarios',
-    barmode='stack'
+    render_chart_container(fig_categories)
+
+
+# Filter keys: 'periodo', 'pais', 'dispositivo' (same as render_sidebar_filters)
+SECTIONS = [
+    {"name": "kpis", "depends_on": ['pais'], "render": render_kpis, "sources": kpi_sources},
+    {"name": "funnel_map", "depends_on": ['pais', 'dispositivo', 'periodo'], "render": render_funnel_and_map, "sources": funnel_map_sources},
+    {"name": "classification", "depends_on": ['dispositivo'], "render": render_classification, "sources": classification_sources},
+    {"name": "source_medium", "depends_on": [], "render": render_source_medium, "sources": source_medium_sources},
+    {"name": "evolution", "depends_on": ['periodo'], "render": render_evolution, "sources": evolution_sources},
+    {"name": "wattson", "depends_on": [], "render": render_wattson, "sources": wattson_sources},
+]
+
+# === SIDEBAR FILTERS + SECTIONS ===
+section("filters")
+st.sidebar.header("Filtros")
+render_sections(
+    SECTIONS,
+    filter_renderers={
+        'periodo': render_period_filter,
+        'pais': lambda container: render_country_filter(ALL_COUNTRIES, container),
+        'dispositivo': lambda container: render_device_filter(ALL_DEVICES, container),
+    }
 )
-render_chart_container(fig_categories)
+
+# === TIMING PANEL (opt-in: ?profile=1 or DASHBOARD_PROFILE=1) ===
+render_timing_panel(finish_run())
@@ -1,6 +1,9 @@
 """
 Streamlit App - Entry Point
 Configuración de navegación y páginas.
+
+Run with `streamlit run steamlit_app.py`: Streamlit puts this directory on
+sys.path, so the pages import config, data and charts directly.
 """
 
 import streamlit as st
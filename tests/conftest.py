@@ -0,0 +1,21 @@
+"""
+Shared fixtures: small synthetic event stores written to a temporary directory.
+"""
+
+from datetime import date
+
+import pytest
+
+from data.synthetic import write_dataset
+
+
+START_DATE = date(2026, 1, 1)
+DAYS = 3
+
+
+@pytest.fixture
+def events_path(tmp_path):
+    """Event store with DAYS day partitions of synthetic sessions."""
+    path = tmp_path / 'events'
+    write_dataset(str(path), n_sessions=3000, start_date=START_DATE, days=DAYS, seed=7)
+    return path
@@ -0,0 +1,40 @@
+"""
+Tests of the colormap LUT registry (charts/heatmaps/colormaps.py).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from charts.heatmaps.colormaps import ColormapRegistry, gradient_css
+from charts.heatmaps.css import COLORMAP_STOPS
+
+
+@pytest.mark.parametrize('name', sorted(COLORMAP_STOPS))
+def test_gradient_css_matches_background_gradient(name):
+    colors = pytest.importorskip('matplotlib.colors')
+    values = pd.Series(np.random.default_rng(0).integers(0, 1_000_000, 2000).astype(float))
+    cmap = colors.LinearSegmentedColormap.from_list(name, COLORMAP_STOPS[name])
+
+    styler = values.to_frame('v').style.background_gradient(cmap=cmap)
+    styler._compute()
+    expected = [''.join(f"{prop}: {value};" for prop, value in styler.ctx[(i, 0)]) for i in range(len(values))]
+
+    assert list(gradient_css(values, name)) == expected
+
+
+def test_missing_values_are_unstyled():
+    css = gradient_css(pd.Series([1.0, np.nan, 3.0]), 'azul')
+    assert css[1] == ''
+    assert css[0] and css[2]
+
+
+def test_registry_round_trips_through_npz(tmp_path):
+    registry = ColormapRegistry.from_stops(COLORMAP_STOPS)
+    path = tmp_path / 'luts.npz'
+    registry.save(path)
+
+    loaded = ColormapRegistry.load(path)
+    assert loaded.names == registry.names
+    for name in registry.names:
+        np.testing.assert_array_equal(loaded.lut(name), registry.lut(name))
@@ -0,0 +1,117 @@
+"""
+Tests of the OLAP cube (data/cube.py): slices against the source and rebuilds.
+"""
+
+import shutil
+from datetime import date
+
+import pytest
+
+from data.cube import CubeStore, default_cube_path
+from data.event_store import EventStore
+from data.schema import COUNTRY_COL, DATE_COL, SEGMENT_COL, USER_COL, INTENT_COL
+from data.synthetic import write_dataset
+
+
+MEASURES = {
+    'sesiones': (USER_COL, 'count', None),
+    'usuarios': (USER_COL, 'nunique', None),
+    'usuarios_intencion': (USER_COL, 'nunique', INTENT_COL),
+}
+
+
+@pytest.fixture
+def store(events_path):
+    return EventStore(str(events_path), refresh_seconds=0)
+
+
+@pytest.fixture
+def cube(store, tmp_path):
+    cube = CubeStore(store, str(tmp_path / 'cube'), refresh_seconds=0)
+    cube.build()
+    return cube
+
+
+def _countries(store: EventStore) -> list:
+    df = store.aggregate([COUNTRY_COL], MEASURES)
+    return df.sort_values('sesiones', ascending=False)[COUNTRY_COL].tolist()
+
+
+@pytest.mark.parametrize('filters', [
+    {},
+    {'countries': 'first'},
+    {'devices': ['Mobile']},
+    {'date_range': (date(2026, 1, 2), date(2026, 1, 2))},
+])
+def test_totals_match_the_source(store, cube, filters):
+    if filters.get('countries') == 'first':
+        filters = {'countries': _countries(store)[:1]}
+    expected = store.aggregate([], MEASURES, **filters).iloc[0]
+    cells = cube.slice(None, list(MEASURES), **filters).iloc[0]
+    for name in MEASURES:
+        assert cells[name] == expected[name], name
+
+
+def test_breakdown_matches_the_source(store, cube):
+    expected = store.aggregate([SEGMENT_COL], MEASURES).set_index(SEGMENT_COL).sort_index()
+    df = cube.slice(SEGMENT_COL, list(MEASURES)).set_index(SEGMENT_COL).sort_index()
+    assert df.index.tolist() == expected.index.tolist()
+    for name in MEASURES:
+        assert df[name].tolist() == expected[name].tolist(), name
+
+
+def test_breakdown_by_the_filtered_dimension_is_exact(store, cube):
+    countries = _countries(store)[:2]
+    expected = store.aggregate([COUNTRY_COL], MEASURES, countries=countries).set_index(COUNTRY_COL).sort_index()
+    df = cube.slice(COUNTRY_COL, list(MEASURES), countries=countries).set_index(COUNTRY_COL).sort_index()
+    assert df['usuarios'].tolist() == expected['usuarios'].tolist()
+
+
+def test_multi_country_totals_add_up_the_countries(store, cube):
+    # Documented limitation: users of several selected countries are counted once per country
+    countries = _countries(store)[:2]
+    total = cube.slice(None, ['usuarios'], countries=countries).iloc[0]['usuarios']
+    single = sum(cube.slice(None, ['usuarios'], countries=[c]).iloc[0]['usuarios'] for c in countries)
+    assert total == single
+    assert total >= store.aggregate([], MEASURES, countries=countries).iloc[0]['usuarios']
+
+
+def test_unknown_dimension_is_rejected(cube):
+    with pytest.raises(ValueError):
+        cube.slice('Navegador')
+
+
+@pytest.fixture
+def cached_store(events_path):
+    # Listing kept for the whole test: the cube must notice the change through signature()
+    return EventStore(str(events_path), refresh_seconds=3600)
+
+
+def test_added_partition_makes_the_cube_stale(cached_store, events_path, tmp_path):
+    store = cached_store
+    cube = CubeStore(store, str(tmp_path / 'cube'), refresh_seconds=0)
+    cube.build()
+    assert cube.is_current()
+    write_dataset(str(events_path), n_sessions=500, start_date=date(2026, 1, 4), days=1, seed=7)
+    assert not cube.is_current()
+
+    assert cube.ready() is False
+    cube._builder.join()
+    assert cube.ready() is True
+    sessions = cube.slice(None, ['sesiones']).iloc[0]['sesiones']
+    assert sessions == store.aggregate([], MEASURES).iloc[0]['sesiones'] == 3500
+
+
+def test_removed_partition_makes_the_cube_stale(cached_store, events_path, tmp_path):
+    store = cached_store
+    cube = CubeStore(store, str(tmp_path / 'cube'), refresh_seconds=0)
+    cube.build()
+    shutil.rmtree(events_path / f'{DATE_COL}=2026-01-02')
+    assert cube.ready() is False
+    cube._builder.join()
+    assert cube.ready() is True
+    assert cube.slice(None, ['sesiones']).iloc[0]['sesiones'] == store.aggregate([], MEASURES).iloc[0]['sesiones']
+
+
+def test_default_path_is_derived_from_the_source(store, events_path):
+    assert default_cube_path(store) == events_path / '_cube'
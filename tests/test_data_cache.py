@@ -0,0 +1,157 @@
+"""
+Tests of the TTL/LRU cache (cache/ttl.py) and the data getter memoization (data/cache.py).
+"""
+
+import threading
+import time
+from datetime import date
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from cache import TTLCache, ttl
+from config.settings import CACHE_CONFIG
+from data.cache import cached_getter, canonicalize
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable monotonic clock of the cache module."""
+    now = [1000.0]
+    monkeypatch.setattr(ttl, 'time', SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+@pytest.fixture
+def cache_enabled(monkeypatch):
+    """Memoize getters whatever DASHBOARD_CACHE says."""
+    monkeypatch.setitem(CACHE_CONFIG, 'enabled', True)
+
+
+# ============================================================
+# TTL / LRU
+# ============================================================
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = TTLCache(ttl_seconds=10)
+    cache.set('a', 1, nbytes=1)
+
+    clock[0] += 9.9
+    assert cache.get('a') == 1
+
+    clock[0] += 0.1
+    assert cache.get('a') is None
+    assert cache.stats()['expirations'] == 1
+    assert cache.current_bytes == 0
+
+
+def test_least_recently_used_entry_is_evicted_by_count():
+    cache = TTLCache(max_entries=2)
+    cache.set('a', 1, nbytes=1)
+    cache.set('b', 2, nbytes=1)
+    cache.get('a')
+    cache.set('c', 3, nbytes=1)
+
+    assert [key for key, _, _ in cache.items()] == ['a', 'c']
+    assert cache.stats()['evictions'] == 1
+
+
+def test_entries_are_evicted_to_honor_max_bytes():
+    cache = TTLCache(max_bytes=100)
+    cache.set('a', 1, nbytes=60)
+    cache.set('b', 2, nbytes=30)
+    cache.set('c', 3, nbytes=30)
+
+    assert [key for key, _, _ in cache.items()] == ['b', 'c']
+    assert cache.current_bytes == 60
+
+
+def test_values_larger_than_max_bytes_are_not_stored():
+    cache = TTLCache(max_bytes=100)
+    cache.set('a', 1, nbytes=10)
+    cache.set('big', 2, nbytes=101)
+
+    assert cache.get('big') is None
+    assert cache.get('a') == 1
+    assert cache.current_bytes == 10
+
+
+def test_replacing_a_key_updates_its_size():
+    cache = TTLCache()
+    cache.set('a', 1, nbytes=10)
+    cache.set('a', 2, nbytes=25)
+
+    assert cache.get('a') == 2
+    assert cache.current_bytes == 25
+    assert cache.stats()['entries'] == 1
+
+
+# ============================================================
+# KEY LOCKS
+# ============================================================
+
+def test_key_locks_are_dropped_when_released():
+    cache = TTLCache()
+    with cache.key_lock('a'):
+        assert 'a' in cache._key_locks
+    assert cache._key_locks == {}
+
+    with pytest.raises(RuntimeError):
+        with cache.key_lock('b'):
+            raise RuntimeError
+    assert cache._key_locks == {}
+
+
+def test_concurrent_misses_compute_once(cache_enabled):
+    cache = TTLCache()
+    calls = []
+
+    @cached_getter(cache=cache)
+    def getter(countries=None):
+        calls.append(countries)
+        time.sleep(0.05)
+        return pd.DataFrame({'valor': [1, 2]})
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(getter(['Chile', 'Argentina'])))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(results) == 8
+    assert cache._key_locks == {}
+
+
+# ============================================================
+# GETTER MEMOIZATION
+# ============================================================
+
+def test_canonicalize_normalizes_filters():
+    assert canonicalize([]) is None
+    assert canonicalize(['b', 'a'], unordered=True) == ('a', 'b')
+    assert canonicalize(['b', 'a']) == ('b', 'a')
+    assert canonicalize((date(2026, 1, 1), date(2026, 1, 31))) == ('2026-01-01', '2026-01-31')
+
+
+def test_cached_getter_keys_by_canonical_filters_and_copies_results(cache_enabled):
+    cache = TTLCache()
+    calls = []
+
+    @cached_getter(cache=cache)
+    def getter(countries=None, top_n=5):
+        calls.append((countries, top_n))
+        return pd.DataFrame({'valor': [1, 2]})
+
+    first = getter(['Chile', 'Argentina'])
+    first['valor'] = 0
+    second = getter(countries=['Argentina', 'Chile'], top_n=5)
+    getter(['Chile'], top_n=3)
+
+    assert calls == [(['Chile', 'Argentina'], 5), (['Chile'], 3)]
+    assert second['valor'].tolist() == [1, 2]
@@ -0,0 +1,55 @@
+"""
+Tests of the Parquet event store (data/event_store.py).
+"""
+
+import shutil
+from datetime import date
+
+from data.event_store import EventStore
+from data.schema import DATE_COL, USER_COL
+from data.synthetic import write_dataset
+
+
+SESSIONS = {'sesiones': (USER_COL, 'count', None)}
+
+
+def _sessions_per_day(store: EventStore) -> dict:
+    df = store.aggregate([DATE_COL], SESSIONS)
+    return {str(day): count for day, count in zip(df[DATE_COL], df['sesiones'])}
+
+
+def test_new_partition_is_picked_up(events_path):
+    store = EventStore(str(events_path), refresh_seconds=0)
+    before = _sessions_per_day(store)
+    assert len(before) == 3
+
+    write_dataset(str(events_path), n_sessions=500, start_date=date(2026, 1, 4), days=1, seed=7)
+    after = _sessions_per_day(store)
+    assert len(after) == 4
+    assert after['2026-01-04'] == 500
+    assert {day: after[day] for day in before} == before
+
+
+def test_removed_partition_is_dropped(events_path):
+    store = EventStore(str(events_path), refresh_seconds=0)
+    assert len(_sessions_per_day(store)) == 3
+
+    shutil.rmtree(events_path / f'{DATE_COL}=2026-01-02')
+    assert sorted(_sessions_per_day(store)) == ['2026-01-01', '2026-01-03']
+
+
+def test_listing_is_reused_within_refresh_seconds(events_path):
+    store = EventStore(str(events_path), refresh_seconds=3600)
+    assert len(_sessions_per_day(store)) == 3
+
+    write_dataset(str(events_path), n_sessions=500, start_date=date(2026, 1, 4), days=1, seed=7)
+    assert len(_sessions_per_day(store)) == 3
+
+    store.refresh()
+    assert len(_sessions_per_day(store)) == 4
+
+
+def test_missing_directory_is_unavailable(tmp_path):
+    store = EventStore(str(tmp_path / 'missing'), refresh_seconds=0)
+    assert not store.available
+    assert store.dataset is None
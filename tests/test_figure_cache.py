@@ -0,0 +1,45 @@
+"""
+Tests of the chart figure cache (charts/cache.py).
+"""
+
+import json
+
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from cache import TTLCache
+from charts.cache import cached_figure
+
+
+def _factory(cache: TTLCache, calls: list):
+    @cached_figure(cache=cache)
+    def create(df: pd.DataFrame, title: str = '') -> go.Figure:
+        calls.append(title)
+        return go.Figure(go.Bar(x=df['x'], y=df['y']), layout={'title': title})
+    return create
+
+
+def test_hit_returns_an_independent_figure():
+    calls = []
+    create = _factory(TTLCache(), calls)
+    df = pd.DataFrame({'x': ['a', 'b'], 'y': [1, 2]})
+
+    first = create(df, title='Usuarios')
+    second = create(df, title='Usuarios')
+    assert calls == ['Usuarios']
+    assert isinstance(second, go.Figure) and second is not first
+    assert json.loads(pio.to_json(second)) == json.loads(pio.to_json(first))
+
+    # Callers may modify what they get without touching the cached figure
+    second.update_layout(title='Otro')
+    assert create(df, title='Usuarios').layout.title.text == 'Usuarios'
+
+
+def test_key_follows_the_content_of_the_data():
+    calls = []
+    create = _factory(TTLCache(), calls)
+    create(pd.DataFrame({'x': ['a', 'b'], 'y': [1, 2]}))
+    create(pd.DataFrame({'x': ['a', 'b'], 'y': [1, 2]}))
+    create(pd.DataFrame({'x': ['a', 'b'], 'y': [1, 3]}))
+    assert len(calls) == 2
@@ -0,0 +1,162 @@
+"""
+Tests of the compiled filter plan and the sorted date index (data/filters.py).
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from data.filters import FilterPlan, index_by_date, is_date_indexed, slice_date_range
+
+
+COUNTRIES = ['Argentina', 'Chile', 'Mexico']
+DEVICES = ['Desktop', 'Mobile']
+
+
+@pytest.fixture
+def table() -> pd.DataFrame:
+    """Rows every 5 hours over January 2026, cycling countries and devices."""
+    n = 150
+    return pd.DataFrame({
+        'Fecha': pd.date_range('2026-01-01', periods=n, freq='5h'),
+        'Pais': [COUNTRIES[i % 3] for i in range(n)],
+        'Dispositivo': [DEVICES[i % 2] for i in range(n)],
+        'Usuarios': np.arange(n),
+    })
+
+
+def _expected(df, countries=None, devices=None, date_range=None) -> pd.DataFrame:
+    """Reference filter written predicate by predicate."""
+    if countries:
+        df = df[df['Pais'].isin(countries)]
+    if devices:
+        df = df[df['Dispositivo'].isin(devices)]
+    if date_range:
+        days = df['Fecha'].dt.date
+        df = df[(days >= date_range[0]) & (days <= date_range[1])]
+    return df
+
+
+@pytest.mark.parametrize('countries, devices, date_range', [
+    (['Chile'], None, None),
+    (None, ['Mobile'], None),
+    (None, None, (date(2026, 1, 5), date(2026, 1, 10))),
+    (['Argentina', 'Mexico'], ['Desktop'], (date(2026, 1, 2), date(2026, 1, 2))),
+])
+def test_apply_matches_the_predicates_one_by_one(table, countries, devices, date_range):
+    plan = FilterPlan(countries, devices, date_range)
+
+    result = plan.apply(table)
+
+    pd.testing.assert_frame_equal(result, _expected(table, countries, devices, date_range))
+
+
+def test_end_day_is_inclusive_for_timestamps(table):
+    result = FilterPlan(date_range=(date(2026, 1, 1), date(2026, 1, 1))).apply(table)
+
+    assert result['Fecha'].max() == pd.Timestamp('2026-01-01 20:00')
+    assert len(result) == 5
+
+
+def test_noop_plan_returns_the_same_table(table):
+    plan = FilterPlan.from_filters(
+        {'pais': COUNTRIES, 'dispositivo': [], 'periodo': (date(2026, 1, 1),)},
+        options={'pais': COUNTRIES}
+    )
+
+    assert plan.is_noop
+    assert plan.apply(table, 'tabla') is table
+    assert plan.stats[0]['predicates'] == []
+
+
+def test_from_filters_keeps_partial_selections():
+    plan = FilterPlan.from_filters(
+        {'pais': ['Chile'], 'dispositivo': DEVICES, 'periodo': ('2026-01-01', '2026-01-31')},
+        options={'pais': COUNTRIES, 'dispositivo': DEVICES}
+    )
+
+    assert plan.countries == ['Chile']
+    assert plan.devices is None
+    assert plan.date_range == (date(2026, 1, 1), date(2026, 1, 31))
+
+
+def test_predicates_on_missing_or_fully_selected_columns_are_skipped(table):
+    table = table.drop(columns='Dispositivo').astype({'Pais': 'category'})
+    plan = FilterPlan(countries=COUNTRIES, devices=['Mobile'])
+
+    assert plan.mask(table) is None
+    assert plan.apply(table) is table
+
+
+def test_report_records_selectivity(table):
+    plan = FilterPlan(countries=['Chile'])
+    plan.apply(table, 'usuarios')
+
+    report = plan.report()
+
+    assert report.loc[0, 'table'] == 'usuarios'
+    assert report.loc[0, 'rows_scanned'] == 150
+    assert report.loc[0, 'rows_kept'] == 50
+    assert report.loc[0, 'selectivity'] == pytest.approx(1 / 3)
+    assert report.loc[0, 'predicates'] == ['country']
+
+
+def test_to_expression_filters_like_apply(table):
+    table = table.assign(Fecha=table['Fecha'].dt.date)
+    plan = FilterPlan(['Chile', 'Mexico'], ['Mobile'], (date(2026, 1, 3), date(2026, 1, 12)))
+
+    filtered = pa.Table.from_pandas(table, preserve_index=False).filter(plan.to_expression())
+
+    assert filtered.column('Usuarios').to_pylist() == plan.apply(table)['Usuarios'].tolist()
+    assert FilterPlan().to_expression() is None
+
+
+# ============================================================
+# SORTED DATE INDEX
+# ============================================================
+
+def test_index_by_date_sorts_and_keeps_the_column():
+    df = pd.DataFrame({'Fecha': ['2026-01-03', '2026-01-01', '2026-01-02'], 'Usuarios': [3, 1, 2]})
+
+    indexed = index_by_date(df)
+
+    assert is_date_indexed(indexed)
+    assert indexed['Usuarios'].tolist() == [1, 2, 3]
+    assert pd.api.types.is_datetime64_any_dtype(indexed['Fecha'].dtype)
+    assert (indexed.index == indexed['Fecha']).all()
+    assert not is_date_indexed(df)
+
+
+def test_unsorted_copies_are_not_date_indexed(table):
+    indexed = index_by_date(table)
+
+    assert is_date_indexed(indexed[indexed['Pais'] == 'Chile'])
+    assert not is_date_indexed(indexed.sort_values('Usuarios', ascending=False))
+
+
+@pytest.mark.parametrize('start, end, rows', [
+    (date(2026, 1, 1), date(2026, 1, 1), 5),
+    (date(2026, 1, 5), date(2026, 1, 10), 28),
+    (date(2025, 12, 1), date(2025, 12, 31), 0),
+    (date(2025, 12, 1), date(2026, 2, 28), 150),
+])
+def test_slice_date_range_is_inclusive(table, start, end, rows):
+    sliced = slice_date_range(index_by_date(table), start, end)
+
+    expected = _expected(table, date_range=(start, end))
+    assert len(sliced) == rows
+    assert sliced['Usuarios'].tolist() == expected['Usuarios'].tolist()
+
+
+def test_apply_slices_date_indexed_tables(table):
+    plan = FilterPlan(['Chile'], ['Mobile'], (date(2026, 1, 5), date(2026, 1, 20)))
+
+    sliced = plan.apply(index_by_date(table))
+    masked = plan.apply(table)
+
+    assert sliced['Usuarios'].tolist() == masked['Usuarios'].tolist()
+    assert plan.stats[0]['predicates'] == ['date_slice', 'country', 'device']
+    assert plan.stats[1]['predicates'] == ['country', 'device', 'date']
@@ -0,0 +1,84 @@
+"""
+Tests of the funnel step resolution (data/funnel.py).
+"""
+
+from datetime import datetime, timedelta
+
+import pyarrow as pa
+import pytest
+
+from data.funnel import compute_funnel, steps_from_config
+from data.schema import TIMESTAMP_COL, USER_COL, INTENT_COL, REGISTER_COL
+from data.source import DataSource
+
+
+START = datetime(2026, 1, 10, 8, 0, 0)
+WINDOW = 3600
+
+
+class _TableSource(DataSource):
+    """Source streaming a small in-memory session table in batches of two rows."""
+
+    def __init__(self, rows: list):
+        self.table = pa.table({
+            USER_COL: pa.array([user for user, _, _, _ in rows], pa.int64()),
+            TIMESTAMP_COL: pa.array([START + timedelta(seconds=s) for _, s, _, _ in rows], pa.timestamp('s')),
+            INTENT_COL: [intent for _, _, intent, _ in rows],
+            REGISTER_COL: [register for _, _, _, register in rows],
+        })
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    def aggregate(self, group_by, measures, countries=None, devices=None, date_range=None):
+        raise NotImplementedError
+
+    def batches(self, columns, countries=None, devices=None, date_range=None):
+        return iter(self.table.select(columns).to_batches(max_chunksize=2))
+
+
+# (user, seconds after START, intention, registration)
+SESSIONS = [
+    (1, 0, False, False), (1, 100, True, False), (1, 200, False, True),    # every step, in order
+    (2, 100, True, False), (2, 50, False, True),                           # registered before the intention
+    (3, 0, True, False), (3, WINDOW + 1, False, True),                     # registered after the window
+    (4, 0, False, True),                                                   # never had intention
+    (5, 10, True, True),                                                   # both in the same session
+]
+
+
+def _steps(window):
+    return [('Usuarios', None, None), ('Intención', INTENT_COL, None), ('Registro', REGISTER_COL, window)]
+
+
+def test_steps_follow_order_and_window():
+    assert compute_funnel(_TableSource(SESSIONS), _steps(WINDOW)) == [5, 4, 2]
+
+
+def test_without_window_any_later_session_counts():
+    assert compute_funnel(_TableSource(SESSIONS), _steps(None)) == [5, 4, 3]
+
+
+def test_window_is_inclusive():
+    sessions = [(1, 0, True, False), (1, WINDOW, False, True)]
+    assert compute_funnel(_TableSource(sessions), _steps(WINDOW)) == [1, 1, 1]
+
+
+def test_flagged_entry_step_starts_at_the_first_flagged_session():
+    # Entry at the first intention (t=100), so the registration at t=50 does not count
+    steps = [('Intención', INTENT_COL, None), ('Registro', REGISTER_COL, None)]
+    assert compute_funnel(_TableSource([(1, 100, True, False), (1, 50, False, True)]), steps) == [1, 0]
+
+
+def test_later_step_without_flag_is_rejected():
+    with pytest.raises(ValueError):
+        compute_funnel(_TableSource(SESSIONS), [('Usuarios', None, None), ('Todos', None, None)])
+
+
+def test_steps_from_config_converts_hours():
+    steps = steps_from_config([
+        {'name': 'Usuarios', 'flag': None, 'window_hours': None},
+        {'name': 'Registro', 'flag': REGISTER_COL, 'window_hours': 2},
+    ])
+    assert steps == [('Usuarios', None, None), ('Registro', REGISTER_COL, 7200)]
@@ -0,0 +1,121 @@
+"""
+Tests of the incremental rollups (data/rollups.py): watermarks, refreshes and queries.
+"""
+
+import shutil
+from datetime import date
+
+import pytest
+
+from data.event_store import EventStore
+from data.rollups import GRAINS, SKETCHES, RollupStore
+from data.schema import COUNTRY_COL, DATE_COL, USER_COL
+from data.synthetic import write_dataset
+
+
+SESSIONS = {'sesiones': (USER_COL, 'count', None)}
+
+
+@pytest.fixture
+def rollups(events_path, tmp_path):
+    return RollupStore(str(events_path), str(tmp_path / 'rollups'), refresh_seconds=0)
+
+
+def _files(rollups: RollupStore, day: str) -> list:
+    return [(rollups.path / name / f'{day}.parquet').exists() for name in GRAINS + (SKETCHES,)]
+
+
+def test_refresh_ingests_every_partition_once(rollups):
+    assert rollups.watermark is None
+    assert not rollups.is_current()
+
+    assert rollups.refresh() == ['2026-01-01', '2026-01-02', '2026-01-03']
+    assert rollups.watermark == date(2026, 1, 3)
+    assert rollups.is_current()
+    assert all(_files(rollups, '2026-01-02'))
+
+    assert rollups.refresh(force=True) == []
+
+
+def test_refresh_is_throttled(events_path, tmp_path):
+    rollups = RollupStore(str(events_path), str(tmp_path / 'rollups'), refresh_seconds=3600)
+    rollups.refresh()
+    write_dataset(str(events_path), n_sessions=500, start_date=date(2026, 1, 4), days=1, seed=7)
+
+    assert rollups.refresh() == []
+    assert rollups.refresh(force=True) == ['2026-01-04']
+
+
+def test_new_and_changed_partitions_are_ingested(rollups, events_path):
+    rollups.refresh()
+    write_dataset(str(events_path), n_sessions=500, start_date=date(2026, 1, 4), days=1, seed=7)
+    assert not rollups.is_current()
+
+    assert rollups.refresh() == ['2026-01-04']
+    assert rollups.watermark == date(2026, 1, 4)
+
+    write_dataset(str(events_path), n_sessions=200, start_date=date(2026, 1, 2), days=1, seed=11)
+    assert rollups.refresh() == ['2026-01-02']
+    assert rollups.is_current()
+
+
+def test_removed_partition_moves_the_watermark_back(rollups, events_path):
+    rollups.refresh()
+    shutil.rmtree(events_path / f'{DATE_COL}=2026-01-03')
+    assert not rollups.is_current()
+
+    assert rollups.refresh() == []
+    assert rollups.watermark == date(2026, 1, 2)
+    assert not any(_files(rollups, '2026-01-03'))
+    assert rollups.is_current()
+    assert rollups.query()['periodo'].dt.date.tolist() == [date(2026, 1, 1), date(2026, 1, 2)]
+
+
+def test_other_sketch_precision_reingests_everything(rollups, events_path):
+    rollups.refresh()
+    other = RollupStore(str(events_path), str(rollups.path), refresh_seconds=0, sketch_precision=10)
+
+    assert not other.is_current()
+    assert len(other.refresh()) == 3
+    assert other.is_current()
+
+
+def test_ready_refreshes_in_the_background(rollups):
+    assert rollups.ready() is False
+    refresher = rollups._refresher
+    if refresher is not None:
+        refresher.join(timeout=60)
+
+    assert rollups.ready() is True
+    assert rollups.watermark == date(2026, 1, 3)
+
+
+def test_daily_sessions_match_the_source(rollups, events_path):
+    rollups.refresh()
+    store = EventStore(str(events_path), refresh_seconds=0)
+    country = store.aggregate([COUNTRY_COL], SESSIONS)[COUNTRY_COL].iloc[0]
+
+    for countries in (None, [country]):
+        expected = store.aggregate([DATE_COL], SESSIONS, countries=countries).sort_values(DATE_COL)
+        df = rollups.query('day', countries=countries)
+        assert df['sesiones'].tolist() == expected['sesiones'].tolist()
+
+
+def test_hourly_buckets_add_up_to_the_day(rollups):
+    rollups.refresh()
+    day = (date(2026, 1, 2), date(2026, 1, 2))
+
+    hours = rollups.query('hour', date_range=day)
+
+    assert len(hours) <= 24
+    assert hours['sesiones'].sum() == rollups.query('day', date_range=day)['sesiones'].sum()
+
+
+def test_distinct_users_are_within_the_sketch_error(rollups, events_path):
+    rollups.refresh()
+    store = EventStore(str(events_path), refresh_seconds=0)
+    exact = store.aggregate([], {'usuarios': (USER_COL, 'nunique', None)})['usuarios'].iloc[0]
+
+    estimate = rollups.distinct_users()['usuarios']
+
+    assert abs(estimate - exact) / exact < 4 * rollups.sketch_error
@@ -0,0 +1,128 @@
+"""
+Tests of the incremental sessionizer across hit batches (data/sessionize.py).
+"""
+
+from datetime import datetime, timedelta
+
+import pyarrow as pa
+
+from data.schema import (
+    HITS_SCHEMA,
+    HIT_TIME_COL,
+    TIMESTAMP_COL,
+    USER_COL,
+    COUNTRY_COL,
+    DEVICE_COL,
+    USER_TYPE_COL,
+    SEGMENT_COL,
+    SOURCE_COL,
+    CONCEPT_COL,
+    CATEGORY_COL,
+    INTENT_COL,
+    REGISTER_COL,
+    BOUNCE_COL,
+    DURATION_COL,
+    ENGAGEMENT_COL,
+    CONCEPTS,
+    CATEGORIES
+)
+from data.sessionize import Sessionizer
+
+
+TIMEOUT = 1800
+START = datetime(2026, 1, 15, 10, 0, 0)
+
+
+def _hits(offsets: list, engaged: list) -> pa.Table:
+    """Hits of one user at START + offsets (seconds), with HITS_SCHEMA."""
+    n = len(offsets)
+    return pa.table({
+        HIT_TIME_COL: [START + timedelta(seconds=offset) for offset in offsets],
+        USER_COL: [7] * n,
+        COUNTRY_COL: ['Argentina'] * n,
+        DEVICE_COL: ['Mobile'] * n,
+        USER_TYPE_COL: ['Nuevo'] * n,
+        SEGMENT_COL: ['0-5 Light'] * n,
+        SOURCE_COL: ['google / organic'] * n,
+        CONCEPT_COL: [CONCEPTS[0]] * n,
+        CATEGORY_COL: [CATEGORIES[0]] * n,
+        INTENT_COL: [False] * n,
+        REGISTER_COL: [False] * n,
+        ENGAGEMENT_COL: engaged,
+    }).cast(HITS_SCHEMA)
+
+
+def test_session_continues_across_batches_at_exactly_the_timeout():
+    sessionizer = Sessionizer(TIMEOUT)
+
+    closed = sessionizer.push(_hits([0, 100], [10, 20]))
+    assert len(closed) == 0
+    assert sessionizer.open_sessions == 1
+
+    # Exactly the timeout after the previous hit: same session
+    closed = sessionizer.push(_hits([100 + TIMEOUT], [30]))
+    assert len(closed) == 0
+    assert sessionizer.open_sessions == 1
+
+    sessions = sessionizer.flush().to_pylist()
+    assert sessionizer.open_sessions == 0
+    assert len(sessions) == 1
+    assert sessions[0][TIMESTAMP_COL] == START
+    assert sessions[0][DURATION_COL] == 100 + TIMEOUT
+    assert sessions[0][ENGAGEMENT_COL] == 60
+    assert sessions[0][BOUNCE_COL] is False
+
+
+def test_session_splits_one_second_past_the_timeout():
+    sessionizer = Sessionizer(TIMEOUT)
+
+    closed = sessionizer.push(_hits([0, 100], [10, 20]))
+    assert len(closed) == 0
+
+    # One second past the timeout: a new session, but the first one stays open
+    # because a later batch may still bring hits from the timeout before
+    closed = sessionizer.push(_hits([100 + TIMEOUT + 1], [30]))
+    assert len(closed) == 0
+    assert sessionizer.open_sessions == 2
+
+    sessions = sorted(sessionizer.flush().to_pylist(), key=lambda session: session[TIMESTAMP_COL])
+    assert len(sessions) == 2
+    assert sessions[0][TIMESTAMP_COL] == START
+    assert sessions[0][DURATION_COL] == 100
+    assert sessions[0][ENGAGEMENT_COL] == 30
+    assert sessions[0][BOUNCE_COL] is False
+    assert sessions[1][TIMESTAMP_COL] == START + timedelta(seconds=100 + TIMEOUT + 1)
+    assert sessions[1][DURATION_COL] == 0
+    assert sessions[1][ENGAGEMENT_COL] == 30
+    assert sessions[1][BOUNCE_COL] is True
+
+
+def test_sessions_close_twice_the_timeout_before_the_newest_hit():
+    sessionizer = Sessionizer(TIMEOUT)
+
+    sessionizer.push(_hits([0], [10]))
+    closed = sessionizer.push(_hits([2 * TIMEOUT], [20]))
+    assert len(closed) == 0
+
+    closed = sessionizer.push(_hits([2 * TIMEOUT + 1], [30])).to_pylist()
+    assert len(closed) == 1
+    assert closed[0][TIMESTAMP_COL] == START
+    assert sessionizer.open_sessions == 1
+
+
+def test_late_hit_within_the_contract_joins_sessions_across_batches():
+    sessionizer = Sessionizer(TIMEOUT)
+
+    sessionizer.push(_hits([0], [10]))
+    closed = sessionizer.push(_hits([TIMEOUT + 1], [20]))
+    assert len(closed) == 0
+
+    # Exactly the timeout before the newest hit (allowed): bridges both sessions
+    closed = sessionizer.push(_hits([1], [30]))
+    assert len(closed) == 0
+
+    sessions = sessionizer.flush().to_pylist()
+    assert len(sessions) == 1
+    assert sessions[0][TIMESTAMP_COL] == START
+    assert sessions[0][DURATION_COL] == TIMEOUT + 1
+    assert sessions[0][ENGAGEMENT_COL] == 60